@@ -1,46 +1,119 @@
-from flask import Flask, render_template, request, jsonify, send_file
-import sqlite3
-import json
-import csv
-import io
-from datetime import datetime
+from flask import Flask, render_template, request, jsonify, g, Response, stream_with_context
+import gzip
+import os
+import queue
+import time
+from datetime import date, datetime, timedelta
+from archive import Archiver, ARCHIVE_AFTER_DAYS
+from batch import apply_filter, apply_ops, parse_ops
+from counters import data_version, ensure_counters, read_counters, version_tag
+from db import ConnectionPool, db_time, ensure_indexes, reset_db_time
+from events import ChangeFeed, KEEPALIVE, ensure_changes
+from export import csv_chunks, gzip_chunks
+from ingest import bulk_insert, ndjson_rows, TooManyRows
+from metrics import Metrics, counting
+from matching import (ensure_matches, open_matches, report_found, report_lost, MatchEngine,
+                      MATCH_TOP_K, MAX_TOP_K)
+from migrations import migrate
+from repository import (close_item, delete_item, ensure_schema, items_by_id, items_page,
+                        list_all, list_page, ITEM_SORTS, JSON_KEYS, MIXED_KEYS, ROWS)
+from rollups import (ensure_rollups, hotspots, resolve_times, weekly_recovery,
+                     ANALYTICS_WEEKS, HOTSPOT_LIMIT, MAX_ANALYTICS_WEEKS, MAX_HOTSPOT_LIMIT)
+from search import ensure_search, search_items, SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE
+from sqltrace import statement_stats
+from writer import WriteQueue, WriterBusy
 
 app = Flask(__name__)
-DB_NAME = "college_data.db"
+app.json.sort_keys = False  # row dicts already come out in a fixed field order
+app.json.compact = True     # no pretty-printing, even under debug=True
+DB_NAME = os.environ.get("SBMP_DB", "college_data.db")
+pool = ConnectionPool(DB_NAME)
+engine = MatchEngine()
+metrics = Metrics()
+writer = WriteQueue(pool)
+archiver = Archiver(pool, int(os.environ.get("SBMP_ARCHIVE_DAYS", ARCHIVE_AFTER_DAYS)))
+stats_cache = (None, None)  # (data version, /api/stats payload)
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+GZIP_MIN_BYTES = 1024   # smaller bodies barely shrink and still cost a compress
+GZIP_LEVEL = 6
+COMPRESSIBLE = {'application/json', 'text/html', 'text/plain', 'text/csv'}
+LIST_FORMATS = ['objects', 'columns']
+
+def get_db():
+    """Borrow a pooled connection for the current request"""
+    if 'db' not in g:
+        g.db = pool.acquire()
+    return g.db
+
+@app.before_request
+def start_request_timer():
+    g.started = time.perf_counter()
+    reset_db_time()
+    metrics.started()
+    g.in_flight = True
+
+@app.after_request
+def record_request_metrics(resp):
+    """Per-route latency, DB time, status and response size"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    method = request.method
+    metrics.observe(route, method, resp.status_code, time.perf_counter() - g.started, db_time())
+    if resp.is_streamed:
+        # Size is only known once the body has been sent
+        resp.response = counting(resp.response, lambda n: metrics.observe_size(route, method, n))
+    else:
+        metrics.observe_size(route, method, resp.content_length or 0)
+    return resp
+
+@app.after_request
+def compress_response(resp):
+    """gzip text bodies of GZIP_MIN_BYTES or more for clients that accept it
+
+    Registered after the metrics hook so that one runs later and records
+    the compressed size. Streams (export, events) are left alone.
+    """
+    if (resp.mimetype not in COMPRESSIBLE or resp.is_streamed or resp.direct_passthrough
+            or 'Content-Encoding' in resp.headers):
+        return resp
+    resp.vary.add('Accept-Encoding')
+    if (resp.content_length or 0) < GZIP_MIN_BYTES or not request.accept_encodings['gzip']:
+        return resp
+    resp.set_data(gzip.compress(resp.get_data(), GZIP_LEVEL, mtime=0))
+    resp.headers['Content-Encoding'] = 'gzip'
+    # Same data, different bytes: the tag stays valid but only weakly
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        resp.set_etag(etag, weak=True)
+    return resp
+
+@app.teardown_request
+def end_request(exc):
+    # Streamed responses tear down twice (stream_with_context); count once
+    if g.pop('in_flight', False):
+        metrics.finished()
+
+@app.teardown_appcontext
+def release_db(exc):
+    """Hand the request's connection back to the pool, even on errors"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        pool.release(conn)
 
 def init_db():
     """Initialize SQLite database with proper schema"""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS lost_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_name TEXT NOT NULL,
-                roll_no TEXT NOT NULL,
-                item_name TEXT NOT NULL,
-                room_no TEXT,
-                category TEXT DEFAULT 'Other',
-                date TEXT,
-                status TEXT DEFAULT 'Pending'
-            )
-        """)
-        
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS found_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                finder_name TEXT,
-                item_name TEXT NOT NULL,
-                room_no TEXT,
-                category TEXT DEFAULT 'Other',
-                date TEXT,
-                status TEXT DEFAULT 'Available'
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with pool.connection() as conn:
+            ensure_schema(conn)
+            migrate(conn)
+            ensure_indexes(conn)
+            ensure_search(conn)
+            ensure_matches(conn)
+            ensure_counters(conn)
+            ensure_changes(conn)
+            ensure_rollups(conn)
         return True
     except Exception as e:
         print(f"Database init error: {e}")
@@ -51,61 +124,144 @@ def index():
     """Main page"""
     return render_template('index.html')
 
+def stats_payload(conn):
+    """(version, /api/stats payload), rebuilt only when the data changed"""
+    global stats_cache
+    counters = read_counters(conn)
+    version = version_tag(counters)
+    cached_version, payload = stats_cache
+    if cached_version != version:
+        matches = open_matches(conn)
+        payload = {
+            'success': True,
+            'lost_count': counters['lost_open'],
+            'found_count': counters['found_open'],
+            'match_count': len(matches),
+            'matches': matches
+        }
+        stats_cache = (version, payload)
+    return version, payload
+
+def describe_items(conn, kind, ids):
+    """Current rows for the change feed, keyed by id"""
+    return items_by_id(conn, kind, ids, as_json=True)
+
+feed = ChangeFeed(pool, describe_items, lambda conn: stats_payload(conn)[1])
+
 @app.route('/api/stats')
 def get_stats():
-    """Get dashboard statistics"""
+    """Get dashboard statistics (cached per data version, ETag/304)"""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        
-        lost_count = conn.execute("SELECT COUNT(*) FROM lost_items WHERE status='Pending'").fetchone()[0]
-        found_count = conn.execute("SELECT COUNT(*) FROM found_items WHERE status='Available'").fetchone()[0]
-        
-        matches = conn.execute("""
-            SELECT l.student_name, l.item_name, l.room_no
-            FROM lost_items l 
-            JOIN found_items f ON l.room_no = f.room_no
-            WHERE l.status='Pending' AND f.status='Available' AND l.room_no != ''
-        """).fetchall()
+        conn = get_db()
+        version = data_version(conn)
         
-        conn.close()
+        if request.if_none_match.contains_weak(version):
+            resp = app.response_class(status=304)
+        else:
+            version, payload = stats_payload(conn)
+            resp = jsonify(payload)
         
-        return jsonify({
-            'success': True,
-            'lost_count': lost_count,
-            'found_count': found_count,
-            'match_count': len(matches),
-            'matches': [{'name': m[0], 'item': m[1], 'room': m[2]} for m in matches]
-        })
+        resp.set_etag(version)
+        resp.headers['Cache-Control'] = 'no-cache'
+        return resp
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/events')
+def event_stream():
+    """Server-Sent Events: item, stats and matches deltas as they happen"""
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = int(since) if since else None
+    except ValueError:
+        since = None
+    subscription = feed.subscribe(since)
+    
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    yield subscription.get(timeout=KEEPALIVE)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            feed.unsubscribe(subscription)
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def page_limit(args):
+    """?limit clamped to MAX_PAGE_SIZE; ValueError when not a positive int"""
+    limit = int(args.get('limit', PAGE_SIZE))
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, MAX_PAGE_SIZE)
+
+def list_format(args):
+    """?format (objects|columns); ValueError when it is neither"""
+    fmt = args.get('format', 'objects')
+    if fmt not in LIST_FORMATS:
+        raise ValueError('unknown format')
+    return fmt
+
+def list_body(keys, items, fmt, **extra):
+    """Response body for a page of items in the requested format.
+
+    objects: {"items": [{key: value, ...}, ...]}. columns: the keys once as
+    "columns" and each item as an array in that order under "rows"; items
+    must then already be row tuples (as_json=ROWS).
+    """
+    if fmt == 'columns':
+        return {'success': True, 'columns': keys, 'rows': items, **extra}
+    return {'success': True, 'items': items, **extra}
+
+def list_response(kind):
+    """Keyset-paginated listing, newest first.
+
+    Query args: limit, after (cursor id from the previous page), status,
+    category, room, date_from, date_to (YYYY-MM-DD, inclusive), archive=1
+    (include archived items), format (objects|columns). Raises ValueError
+    on malformed limit/after/format.
+    """
+    conn = get_db()
+    archive = request.args.get('archive') == '1'
+    fmt = list_format(request.args)
+    shape = ROWS if fmt == 'columns' else True
+    # Unpaginated list only on explicit request (?all=1); a bare array
+    # unless columns were asked for
+    if request.args.get('all') == '1':
+        items = list_all(conn, kind, as_json=shape, archive=archive)
+        return jsonify(list_body(JSON_KEYS[kind], items, fmt) if fmt == 'columns' else items)
+    after = request.args.get('after')
+    items, next_cursor = list_page(conn, kind, request.args, page_limit(request.args),
+                                   int(after) if after else None, as_json=shape, archive=archive)
+    return jsonify(list_body(JSON_KEYS[kind], items, fmt, next_cursor=next_cursor))
+
 @app.route('/api/lost', methods=['GET', 'POST'])
 def lost_items():
     """Handle lost items"""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        
         if request.method == 'POST':
             data = request.json
             if not data.get('name') or not data.get('item'):
                 return jsonify({'success': False, 'error': 'Missing required fields'}), 400
             
-            conn.execute("""
-                INSERT INTO lost_items (student_name, roll_no, item_name, room_no, category, date)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (data['name'], data.get('roll', ''), data['item'], data.get('room', ''), 
-                  data.get('category', 'Other'), datetime.now().strftime('%Y-%m-%d')))
-            conn.commit()
-            conn.close()
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            def insert(conn):
+                report_lost(conn, engine, data['name'], data.get('roll', ''), data['item'],
+                            data.get('room', ''), data.get('category', 'Other'), today)
+            
+            writer.submit(insert)
             return jsonify({'success': True})
         
         else:
-            cursor = conn.execute("SELECT * FROM lost_items ORDER BY id DESC")
-            items = [{'id': r[0], 'name': r[1], 'roll': r[2], 'item': r[3], 
-                      'room': r[4], 'category': r[5], 'date': r[6], 'status': r[7]} 
-                     for r in cursor.fetchall()]
-            conn.close()
-            return jsonify(items)
+            return list_response('lost')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
+    except WriterBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -113,29 +269,155 @@ def lost_items():
 def found_items():
     """Handle found items"""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        
         if request.method == 'POST':
             data = request.json
             if not data.get('item'):
                 return jsonify({'success': False, 'error': 'Item name is required'}), 400
             
-            conn.execute("""
-                INSERT INTO found_items (finder_name, item_name, room_no, category, date)
-                VALUES (?, ?, ?, ?, ?)
-            """, (data.get('finder', ''), data['item'], data.get('room', ''),
-                  data.get('category', 'Other'), datetime.now().strftime('%Y-%m-%d')))
-            conn.commit()
-            conn.close()
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            def insert(conn):
+                report_found(conn, engine, data.get('finder', ''), data['item'], data.get('room', ''),
+                             data.get('category', 'Other'), today)
+            
+            writer.submit(insert)
             return jsonify({'success': True})
         
         else:
-            cursor = conn.execute("SELECT * FROM found_items ORDER BY id DESC")
-            items = [{'id': r[0], 'finder': r[1], 'item': r[2], 'room': r[3],
-                      'category': r[4], 'date': r[5], 'status': r[6]} 
-                     for r in cursor.fetchall()]
-            conn.close()
-            return jsonify(items)
+            return list_response('found')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
+    except WriterBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/items')
+def list_items():
+    """Lost and found items in one server-filtered, paginated list
+
+    Query args: type (all|lost|found), sort (newest|oldest), limit, cursor,
+    status, category, room, date_from, date_to, archive=1 (include archived
+    items), format (objects|columns). With q the list is the ranked
+    full-text search instead (type and status still apply, archived items
+    are not searched) and the cursor is a result offset.
+    """
+    try:
+        args = request.args
+        kind = args.get('type', 'all')
+        if kind not in ['all', 'lost', 'found']:
+            return jsonify({'success': False, 'error': 'Invalid item type'}), 400
+        sort = args.get('sort', 'newest')
+        if sort not in ITEM_SORTS:
+            return jsonify({'success': False, 'error': 'Invalid sort order'}), 400
+        limit = page_limit(args)
+        cursor = args.get('cursor', '')
+        fmt = list_format(args)
+        
+        if args.get('q', '').strip():
+            offset = int(cursor or 0)
+            if offset < 0:
+                raise ValueError('offset out of range')
+            items = search_items(get_db(), args['q'], kind, args.get('status', ''),
+                                 limit=limit + 1, offset=offset, as_json=True)
+            has_more = len(items) > limit
+            items = items[:limit]
+            keys = MIXED_KEYS + ('score',)
+            if fmt == 'columns':
+                # A search page is small; its dicts are simply flattened
+                items = [[item.get(key) for key in keys] for item in items]
+            return jsonify(list_body(keys, items, fmt, next_cursor=str(offset + limit) if has_more else None))
+        items, next_cursor = items_page(get_db(), kind, sort, args, limit, cursor,
+                                        as_json=ROWS if fmt == 'columns' else True,
+                                        archive=args.get('archive') == '1')
+        return jsonify(list_body(MIXED_KEYS, items, fmt, next_cursor=next_cursor))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+NDJSON_TYPES = ['application/x-ndjson', 'application/jsonl', 'application/x-jsonlines']
+
+@app.route('/api/<any(lost, found):kind>/bulk', methods=['POST'])
+def bulk_items(kind):
+    """Bulk-load reports from a JSON array or an NDJSON stream
+
+    Each row is validated like a single POST and may carry its own date.
+    Rows are inserted in batched transactions; the response reports the
+    outcome of every row.
+    """
+    try:
+        if request.mimetype in NDJSON_TYPES:
+            rows = ndjson_rows(request.stream)
+        else:
+            rows = request.get_json(silent=True)
+            if not isinstance(rows, list):
+                return jsonify({'success': False, 'error': 'Expected a JSON array or NDJSON body'}), 400
+        
+        conn = get_db()
+        engine.sync(conn)
+        results, inserted = bulk_insert(conn, kind, rows, datetime.now().strftime('%Y-%m-%d'), engine)
+        return jsonify({
+            'success': True,
+            'inserted': inserted,
+            'failed': len(results) - inserted,
+            'results': results
+        })
+    except TooManyRows as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/search')
+def search_api():
+    """Ranked full-text search over lost and found items"""
+    try:
+        args = request.args
+        kind = args.get('type', 'all')
+        if kind not in ['all', 'lost', 'found']:
+            return jsonify({'success': False, 'error': 'Invalid item type'}), 400
+        
+        limit = int(args.get('limit', SEARCH_PAGE_SIZE))
+        offset = int(args.get('offset', 0))
+        if limit < 1 or offset < 0:
+            raise ValueError('limit/offset out of range')
+        limit = min(limit, MAX_SEARCH_PAGE_SIZE)
+        
+        items = search_items(get_db(), args.get('q', ''), kind, args.get('status', ''),
+                             limit=limit + 1, offset=offset, as_json=True)
+        has_more = len(items) > limit
+        return jsonify({
+            'success': True,
+            'items': items[:limit],
+            'next_offset': offset + limit if has_more else None
+        })
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/matches/<int:lost_id>')
+def lost_matches(lost_id):
+    """Top fuzzy-matched found items for one lost item"""
+    try:
+        k = int(request.args.get('k', MATCH_TOP_K))
+        if k < 1:
+            raise ValueError('k must be positive')
+        k = min(k, MAX_TOP_K)
+        
+        conn = get_db()
+        lost = items_by_id(conn, 'lost', [lost_id], as_json=True).get(lost_id)
+        if lost is None:
+            return jsonify({'success': False, 'error': 'Item not found'}), 404
+        
+        engine.sync(conn)
+        top = engine.candidates('lost', lost['item'], lost['category'], lost['room'], lost['date'], k)
+        found = items_by_id(conn, 'found', [found_id for _, found_id in top], as_json=True) if top else {}
+        candidates = [dict(found[i], score=score) for score, i in top if i in found]
+        
+        return jsonify({'success': True, 'lost': lost, 'candidates': candidates})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid k'}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -146,58 +428,180 @@ def manage_item(item_type, item_id):
         if item_type not in ['lost', 'found']:
             return jsonify({'success': False, 'error': 'Invalid item type'}), 400
         
-        conn = sqlite3.connect(DB_NAME)
-        table = f"{item_type}_items"
-        
         if request.method == 'DELETE':
-            conn.execute(f"DELETE FROM {table} WHERE id=?", (item_id,))
-            conn.commit()
-            conn.close()
+            writer.submit(lambda conn: delete_item(conn, item_type, item_id))
+            engine.forget(item_type, item_id)
             return jsonify({'success': True})
         
         elif request.method == 'PUT':
-            status = 'Resolved' if item_type == 'lost' else 'Claimed'
-            conn.execute(f"UPDATE {table} SET status=? WHERE id=?", (status, item_id))
-            conn.commit()
-            conn.close()
+            writer.submit(lambda conn: close_item(conn, item_type, item_id))
+            engine.forget(item_type, item_id)
             return jsonify({'success': True})
+    except WriterBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/items/batch', methods=['POST'])
+def batch_items():
+    """Resolve or delete many items in one transaction
+
+    Body is either {"ops": [{"type", "id", "action"}, ...]} or
+    {"filter": {"type", "status", "category", "room", "older_than_days",
+    "date_before"}, "action": "resolve"|"delete"}.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or ('ops' in data) == ('filter' in data):
+            return jsonify({'success': False, 'error': 'Expected either ops or filter'}), 400
+        ops = parse_ops(data['ops']) if 'ops' in data else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    conn = get_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if ops is not None:
+            affected, closed = apply_ops(conn, ops)
+        else:
+            affected, closed = apply_filter(conn, data['filter'], data.get('action'))
+        conn.commit()
+    except ValueError as e:
+        conn.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
+        conn.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+    for kind, item_id in closed:
+        engine.forget(kind, item_id)
+    return jsonify({
+        'success': True,
+        'affected': affected,
+        'total': sum(n for counts in affected.values() for n in counts.values())
+    })
+
 @app.route('/api/export')
 def export_csv():
-    """Export all data to CSV"""
+    """Stream data as CSV in fixed-size batches (optionally gzip-compressed)
+
+    Query args: table (all/lost/found), status, date_from, date_to, gzip=1,
+    archive=1 (include archived items).
+    """
+    args = request.args
+    table = args.get('table', 'all')
+    if table not in ['all', 'lost', 'found']:
+        return jsonify({'success': False, 'error': 'Invalid table'}), 400
+    tables = ['lost', 'found'] if table == 'all' else [table]
+    compress = args.get('gzip') == '1'
+    archive = args.get('archive') == '1'
+
+    def generate():
+        # Own pooled connection: lives exactly as long as the stream
+        with pool.connection() as conn:
+            chunks = csv_chunks(conn, tables, args.get('status', ''),
+                                args.get('date_from', ''), args.get('date_to', ''), archive=archive)
+            yield from gzip_chunks(chunks) if compress else chunks
+
+    name = f'sbmp_export_{datetime.now().strftime("%Y%m%d")}.csv'
+    if compress:
+        name += '.gz'
+    return Response(stream_with_context(generate()),
+                    mimetype='application/gzip' if compress else 'text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={name}'})
+
+@app.route('/api/analytics')
+def analytics_api():
+    """Weekly recovery rate, time to resolve and hotspot rooms
+
+    Query args: type (all|lost|found, default lost), date_from, date_to
+    (default: the last 12 weeks, at most MAX_ANALYTICS_WEEKS), category,
+    room, top (hotspot rooms).
+    Read from the rollup tables, so the cost follows the length of the
+    range rather than the size of the history. ETag/304 per data version.
+    """
     try:
-        conn = sqlite3.connect(DB_NAME)
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        writer.writerow(['=== LOST ITEMS ==='])
-        writer.writerow(['ID', 'Name', 'Roll', 'Item', 'Room', 'Category', 'Date', 'Status'])
-        
-        lost = conn.execute("SELECT * FROM lost_items").fetchall()
-        writer.writerows(lost)
-        
-        writer.writerow([])
-        writer.writerow(['=== FOUND ITEMS ==='])
-        writer.writerow(['ID', 'Finder', 'Item', 'Room', 'Category', 'Date', 'Status'])
-        
-        found = conn.execute("SELECT * FROM found_items").fetchall()
-        writer.writerows(found)
-        
-        conn.close()
+        args = request.args
+        kind = args.get('type', 'lost')
+        if kind not in ['all', 'lost', 'found']:
+            return jsonify({'success': False, 'error': 'Invalid item type'}), 400
+        try:
+            day_to = date.fromisoformat(args['date_to']) if args.get('date_to') else date.today()
+            day_from = (date.fromisoformat(args['date_from']) if args.get('date_from')
+                        else day_to - timedelta(weeks=ANALYTICS_WEEKS, days=-1))
+            top = int(args.get('top', HOTSPOT_LIMIT))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid analytics parameters'}), 400
+        if day_from > day_to or not 1 <= top <= MAX_HOTSPOT_LIMIT:
+            return jsonify({'success': False, 'error': 'Invalid analytics parameters'}), 400
+        if day_to - day_from >= timedelta(weeks=MAX_ANALYTICS_WEEKS):
+            return jsonify({'success': False,
+                            'error': f'Date range too long (max {MAX_ANALYTICS_WEEKS} weeks)'}), 400
         
-        output.seek(0)
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'sbmp_export_{datetime.now().strftime("%Y%m%d")}.csv'
-        )
+        conn = get_db()
+        # The default range moves with the calendar, so it is part of the tag
+        version = f"{data_version(conn)}-{day_from}-{day_to}"
+        if request.if_none_match.contains_weak(version):
+            resp = app.response_class(status=304)
+        else:
+            kinds = ['lost', 'found'] if kind == 'all' else [kind]
+            day_from, day_to = day_from.isoformat(), day_to.isoformat()
+            category, room = args.get('category', ''), args.get('room', '')
+            resp = jsonify({
+                'success': True,
+                'type': kind,
+                'date_from': day_from,
+                'date_to': day_to,
+                'weekly': weekly_recovery(conn, kinds, day_from, day_to, category, room),
+                'time_to_resolve': resolve_times(conn, kinds, day_from, day_to, category, room),
+                'hotspots': hotspots(conn, kinds, day_from, day_to, category, top)
+            })
+        resp.set_etag(version)
+        resp.headers['Cache-Control'] = 'no-cache'
+        return resp
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/archive', methods=['GET', 'POST'])
+def archive_api():
+    """Archive settings and totals; POST runs a pass now
+
+    POST body (optional): {"older_than_days": N}, defaulting to the
+    configured SBMP_ARCHIVE_DAYS.
+    """
+    try:
+        if request.method == 'POST':
+            days = (request.get_json(silent=True) or {}).get('older_than_days', archiver.days)
+            if not isinstance(days, int) or isinstance(days, bool) or days < 0:
+                return jsonify({'success': False, 'error': 'older_than_days must be a non-negative integer'}), 400
+            moved = archiver.run_once(days)
+            return jsonify({'success': True, 'moved': moved, 'archive': archiver.stats()})
+        return jsonify({'success': True, 'archive': archiver.stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/pool')
+def pool_stats():
+    """Connection pool and write queue counters"""
+    return jsonify({'success': True, 'pool': pool.stats(), 'writer': writer.stats()})
+
+@app.route('/api/sql')
+def sql_stats():
+    """Per-statement SQL counters (order=seconds|max|count, limit)"""
+    try:
+        order = request.args.get('order', 'seconds')
+        if order not in ['seconds', 'max', 'count']:
+            return jsonify({'success': False, 'error': 'Invalid order'}), 400
+        limit = int(request.args.get('limit', 20))
+        return jsonify({'success': True, 'statements': statement_stats(order, limit)})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid limit'}), 400
+
+@app.route('/metrics')
+def metrics_text():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(pool.stats(), writer), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(404)
 def not_found(e):
     return jsonify({'success': False, 'error': 'Not found'}), 404
@@ -209,6 +613,7 @@ def server_error(e):
 if __name__ == '__main__':
     if init_db():
         print("✅ Database initialized successfully")
+        archiver.start()
         print("🚀 Starting Flask server at http://127.0.0.1:5000")
         print("📝 Press CTRL+C to stop")
         app.run(debug=True, host='127.0.0.1', port=5000)
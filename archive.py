@@ -0,0 +1,182 @@
+# archive.py
+# SBMP College Lost and Found System
+# Hot/cold archival of closed items
+
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from counters import bump_version
+from repository import CLOSED_STATUS, KINDS
+
+# ==========================================
+# 🧊 ARCHIVE SETTINGS
+# ==========================================
+# Resolved/Claimed items older than ARCHIVE_AFTER_DAYS move from
+# lost_items/found_items to lost_archive/found_archive (migration 2), so
+# the tables every page reads only hold open and recent items. Rows move
+# in small transactions with a pause in between, so reports and resolves
+# from either client never wait long for the write lock. Counters,
+# rollups and the change log ignore the move (repository.ARCHIVED).
+ARCHIVE_AFTER_DAYS = 180    # closed this many days ago (or reported, if unknown)
+ARCHIVE_BATCH = 500         # rows moved per transaction
+ARCHIVE_PAUSE = 0.05        # seconds between batches, left to other writers
+ARCHIVE_INTERVAL = 3600     # seconds between background runs
+VACUUM_PAGES = 1000         # free pages handed back per incremental_vacuum step
+
+# Age of a closed item: when it was closed, else when it was reported
+AGE_SQL = "coalesce(resolved_at, created_at)"
+
+
+def _move_sql(kind: str) -> tuple:
+    cls = KINDS[kind]
+    columns = f"{cls.COLUMNS}, created_at, resolved_at"
+    where = f"id > ? AND id <= ? AND status = ? AND {AGE_SQL} < ?"
+    return (f"SELECT MAX(id), COUNT(*) FROM (SELECT id FROM {cls.TABLE} "
+            f"WHERE id > ? AND status = ? AND {AGE_SQL} < ? ORDER BY id LIMIT ?)",
+            f"INSERT INTO {cls.ARCHIVE} ({columns}, archived_at) "
+            f"SELECT {columns}, CAST(strftime('%s', 'now') AS INTEGER) FROM {cls.TABLE} WHERE {where}",
+            f"DELETE FROM {cls.TABLE} WHERE {where}")
+
+
+MOVE_SQL = {kind: _move_sql(kind) for kind in KINDS}
+
+
+def archive_batch(conn: sqlite3.Connection, kind: str, cutoff: int, after: int = 0,
+                  batch: int = ARCHIVE_BATCH) -> Tuple[int, Optional[int]]:
+    """Move the next ``batch`` eligible rows with id > after.
+
+    Returns (rows moved, last id looked at); the id is None when nothing
+    is left. The eligible range is found before the write lock is taken;
+    the move itself re-checks every row inside one short transaction.
+    """
+    find, copy, delete = MOVE_SQL[kind]
+    closed = CLOSED_STATUS[kind]
+    last, found = conn.execute(find, (after, closed, cutoff, batch)).fetchone()
+    if not found:
+        return 0, None
+    params = (after, last, closed, cutoff)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(copy, params)
+        moved = conn.execute(delete, params).rowcount
+        bump_version(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return moved, last
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int = VACUUM_PAGES) -> int:
+    """Hand free pages back to the OS in small steps; returns pages freed.
+
+    Only files created with auto_vacuum=INCREMENTAL (every database made
+    since db.PRAGMAS set it) can shrink this way; older ones reuse their
+    free pages for new rows instead.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return 0
+    freed = 0
+    while True:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not free:
+            return freed
+        conn.execute(f"PRAGMA incremental_vacuum({min(free, pages)})").fetchall()
+        freed += min(free, pages)
+
+
+class Archiver:
+    """Moves old closed items to the archive tables on a background thread.
+
+    ``start()`` runs a pass every ``interval`` seconds; ``run_once()`` runs
+    one immediately (the two never overlap). Each batch borrows its own
+    pooled connection, so the pool is never held for a whole pass.
+    """
+
+    def __init__(self, pool, days: int = ARCHIVE_AFTER_DAYS, interval: float = ARCHIVE_INTERVAL,
+                 batch: int = ARCHIVE_BATCH, pause: float = ARCHIVE_PAUSE):
+        self.pool = pool
+        self.days = days
+        self.interval = interval
+        self.batch = batch
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._runs = 0
+        self._moved = {kind: 0 for kind in KINDS}
+        self._vacuumed = 0
+        self._last_run: Optional[float] = None
+        self._last_seconds = 0.0
+        self._errors = 0
+
+    def start(self) -> None:
+        """Start the background thread (no-op when days <= 0 or already started)."""
+        if self.days > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sbmp-archiver", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                # Whatever went wrong, the next pass still runs
+                self._errors += 1
+                print(f"Archive error: {type(e).__name__}: {e}")
+            time.sleep(self.interval)
+
+    def run_once(self, days: Optional[int] = None) -> Dict[str, int]:
+        """One full pass; returns rows moved per kind."""
+        days = self.days if days is None else days
+        cutoff = int(time.time()) - days * 86400
+        with self._lock:
+            start = time.perf_counter()
+            moved = {}
+            for kind in KINDS:
+                moved[kind] = 0
+                after = 0
+                while True:
+                    with self.pool.connection() as conn:
+                        n, last = archive_batch(conn, kind, cutoff, after, self.batch)
+                    moved[kind] += n
+                    if last is None:
+                        break
+                    after = last
+                    time.sleep(self.pause)
+            if any(moved.values()):
+                with self.pool.connection() as conn:
+                    self._vacuumed += incremental_vacuum(conn)
+            self._runs += 1
+            for kind, n in moved.items():
+                self._moved[kind] += n
+            self._last_run = time.time()
+            self._last_seconds = time.perf_counter() - start
+        return moved
+
+    def stats(self) -> dict:
+        """Archive settings and running totals."""
+        return {
+            'after_days': self.days,
+            'running': self._lock.locked(),
+            'runs': self._runs,
+            'moved': dict(self._moved),
+            'vacuumed_pages': self._vacuumed,
+            'last_run': self._last_run,
+            'last_run_seconds': round(self._last_seconds, 3),
+            'errors': self._errors,
+        }
+
+
+if __name__ == "__main__":
+    # One archive pass: python3 archive.py [database] [days]
+    from db import ConnectionPool
+    target = sys.argv[1] if len(sys.argv) > 1 else "college_data.db"
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else ARCHIVE_AFTER_DAYS
+    archiver = Archiver(ConnectionPool(target, size=1), days, pause=0)
+    moved = archiver.run_once()
+    stats = archiver.stats()
+    print(f"🧊 Archived {moved['lost']} lost and {moved['found']} found items "
+          f"closed more than {days} days ago in {stats['last_run_seconds']}s")
+    print(f"   {stats['vacuumed_pages']} free pages returned to the OS")
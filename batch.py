@@ -0,0 +1,111 @@
+# batch.py
+# SBMP College Lost and Found System
+# Batch resolve/delete in a single transaction
+
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+from repository import iso_day, CLOSE_SET, CLOSED_STATUS, KINDS
+
+BATCH_MAX_OPS = 50000
+ACTIONS = ('resolve', 'delete')
+
+# type -> (table, status meaning "closed")
+ITEM_TABLES = {kind: (cls.TABLE, CLOSED_STATUS[kind]) for kind, cls in KINDS.items()}
+
+Op = Tuple[str, int, str]  # (type, id, action)
+
+
+def parse_ops(raw: object) -> List[Op]:
+    """Validate a list of {type, id, action} objects; raises ValueError."""
+    if not isinstance(raw, list):
+        raise ValueError('ops must be a list')
+    if len(raw) > BATCH_MAX_OPS:
+        raise ValueError(f'At most {BATCH_MAX_OPS} ops per request')
+    ops = []
+    for n, op in enumerate(raw):
+        if not isinstance(op, dict):
+            raise ValueError(f'op {n}: must be an object')
+        kind, item_id, action = op.get('type'), op.get('id'), op.get('action')
+        if kind not in ITEM_TABLES:
+            raise ValueError(f'op {n}: invalid item type')
+        if action not in ACTIONS:
+            raise ValueError(f'op {n}: action must be resolve or delete')
+        if not isinstance(item_id, int) or isinstance(item_id, bool):
+            raise ValueError(f'op {n}: id must be an integer')
+        ops.append((kind, item_id, action))
+    return ops
+
+
+def filter_clause(flt: object) -> Tuple[str, str, list]:
+    """Turn a filter object into (type, WHERE sql, params); raises ValueError.
+
+    Fields: type (required), status, category, room, date_before
+    (YYYY-MM-DD) and older_than_days. At least one field besides type is
+    required so a typo can never match a whole table.
+    """
+    if not isinstance(flt, dict):
+        raise ValueError('filter must be an object')
+    kind = flt.get('type')
+    if kind not in ITEM_TABLES:
+        raise ValueError('filter: invalid item type')
+
+    clauses, params = [], []
+    for key, column in (('status', 'status'), ('category', 'category'), ('room', 'room_no')):
+        if flt.get(key):
+            clauses.append(f"{column} = ?")
+            params.append(str(flt[key]))
+    if flt.get('date_before'):
+        clauses.append("date < ?")
+        params.append(iso_day(flt['date_before'], 'filter: date_before'))
+    if flt.get('older_than_days') is not None:
+        days = flt['older_than_days']
+        if not isinstance(days, int) or isinstance(days, bool):
+            raise ValueError('filter: older_than_days must be an integer')
+        if days < 0:
+            raise ValueError('filter: older_than_days must not be negative')
+        clauses.append("date < ?")
+        params.append((date.today() - timedelta(days=days)).isoformat())
+    if not clauses:
+        raise ValueError('filter: narrow by at least one field besides type')
+    return kind, ' AND '.join(clauses), params
+
+
+def apply_ops(conn: sqlite3.Connection, ops: Iterable[Op]) -> Tuple[Dict, List[Tuple[str, int]]]:
+    """Apply (type, id, action) ops inside the caller's transaction.
+
+    Returns (affected counts per type/action, closed (type, id) pairs).
+    Resolving an item that is already closed is not counted.
+    """
+    grouped: Dict[Tuple[str, str], List[int]] = {}
+    for kind, item_id, action in ops:
+        grouped.setdefault((kind, action), []).append(item_id)
+
+    affected = {kind: {action: 0 for action in ACTIONS} for kind in ITEM_TABLES}
+    closed = []
+    for (kind, action), ids in grouped.items():
+        table, status = ITEM_TABLES[kind]
+        if action == 'delete':
+            cur = conn.executemany(f"DELETE FROM {table} WHERE id=?", [(i,) for i in ids])
+        else:
+            cur = conn.executemany(f"UPDATE {table} SET {CLOSE_SET} WHERE id=? AND status != ?",
+                                   [(status, i, status) for i in ids])
+        affected[kind][action] += max(cur.rowcount, 0)
+        closed.extend((kind, i) for i in ids)
+    return affected, closed
+
+
+def apply_filter(conn: sqlite3.Connection, flt: object, action: str) -> Tuple[Dict, List[Tuple[str, int]]]:
+    """Resolve or delete every item matching a filter, in the caller's transaction."""
+    if action not in ACTIONS:
+        raise ValueError('action must be resolve or delete')
+    kind, where, params = filter_clause(flt)
+    table, status = ITEM_TABLES[kind]
+    if action == 'delete':
+        rows = conn.execute(f"DELETE FROM {table} WHERE {where} RETURNING id", params).fetchall()
+    else:
+        rows = conn.execute(f"UPDATE {table} SET {CLOSE_SET} WHERE {where} AND status != ? RETURNING id",
+                            [status] + params + [status]).fetchall()
+    affected = {k: {a: 0 for a in ACTIONS} for k in ITEM_TABLES}
+    affected[kind][action] = len(rows)
+    return affected, [(kind, r[0]) for r in rows]
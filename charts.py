@@ -0,0 +1,77 @@
+# charts.py
+# SBMP College Lost and Found System
+# Desktop analytics charts, with matplotlib loaded on first use
+
+import sqlite3
+import time
+from typing import List, Optional, Sequence, Tuple
+
+# ==========================================
+# ⏳ LAZY MATPLOTLIB
+# ==========================================
+# matplotlib is by far the heaviest import in the desktop client and only
+# the Analytics page needs it, so it is loaded the first time a chart is
+# built instead of at startup. pyplot is never imported: Figure objects
+# made directly are not tracked by its global figure manager, so nothing
+# is kept alive behind the app's back.
+_backend = None
+LOAD_SECONDS: Optional[float] = None  # how long the first load took
+
+
+def load_matplotlib():
+    """(Figure, FigureCanvasTkAgg), importing matplotlib on the first call."""
+    global _backend, LOAD_SECONDS
+    if _backend is None:
+        start = time.perf_counter()
+        from matplotlib import style
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        style.use('dark_background')
+        _backend = (Figure, FigureCanvasTkAgg)
+        LOAD_SECONDS = time.perf_counter() - start
+    return _backend
+
+
+# ==========================================
+# 🥧 CATEGORY CHART
+# ==========================================
+# From the trigger-kept rollup (rollups.py): rows per day and category
+# rather than one per report, and archived reports still count
+CATEGORY_SQL = "SELECT category, SUM(n) FROM item_rollup WHERE kind = 'lost' GROUP BY category"
+
+
+def category_counts(conn: sqlite3.Connection) -> List[Tuple[str, int]]:
+    """(category, lost reports) pairs for the pie chart."""
+    return conn.execute(CATEGORY_SQL).fetchall()
+
+
+class CategoryChart:
+    """Lost-items-by-category pie built once and redrawn in place.
+
+    The figure and its Tk widget live as long as the app; ``version`` is
+    the data version the current drawing was made from, so a repeat visit
+    with nothing changed just shows the widget again.
+    """
+
+    def __init__(self, master, bg: str, fg: str, colors: Sequence[str]):
+        Figure, FigureCanvasTkAgg = load_matplotlib()
+        self.fg = fg
+        self.colors = list(colors)
+        self.figure = Figure(figsize=(6, 5))
+        self.figure.patch.set_facecolor(bg)
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.version: Optional[str] = None
+
+    def draw(self, data: List[Tuple[str, int]], version: str) -> bool:
+        """Redraw for ``version``; False when that version is already shown."""
+        if version == self.version:
+            return False
+        cats = [x[0] for x in data]; cnts = [x[1] for x in data]
+        self.ax.clear()
+        self.ax.pie(cnts, labels=cats, autopct='%1.1f%%', colors=self.colors)
+        self.ax.set_title("Lost Items by Category", color=self.fg)
+        self.canvas.draw()
+        self.version = version
+        return True
@@ -0,0 +1,105 @@
+# counters.py
+# SBMP College Lost and Found System
+# Trigger-maintained dashboard counters and data version
+
+import random
+import sqlite3
+from typing import Dict
+from repository import ARCHIVED, KINDS
+
+# ==========================================
+# 🔢 COUNTERS TABLE
+# ==========================================
+# lost_open / found_open replace the COUNT(*) scans on every dashboard
+# view. data_version goes up on every write to either table, whichever
+# client made it, so readers can tell "nothing changed" with one lookup.
+# epoch is picked once per database so versions never collide across a
+# recreated file. Bookkeeping columns (created_at, resolved_at) are not
+# data changes: updates only count when they touch an item's FIELDS.
+# Moving closed items to the archive is not a delete either; archive.py
+# bumps the version once per batch instead.
+COUNTER_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+
+COUNTER_TRIGGERS = {
+    'counters_lost_ai': """
+        CREATE TRIGGER counters_lost_ai AFTER INSERT ON lost_items BEGIN
+            UPDATE counters SET value = value + (new.status = 'Pending') WHERE name = 'lost_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+    'counters_lost_au': f"""
+        CREATE TRIGGER counters_lost_au AFTER UPDATE OF {KINDS['lost'].FIELDS} ON lost_items BEGIN
+            UPDATE counters SET value = value + (new.status = 'Pending') - (old.status = 'Pending')
+            WHERE name = 'lost_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+    'counters_lost_ad': f"""
+        CREATE TRIGGER counters_lost_ad AFTER DELETE ON lost_items WHEN NOT {ARCHIVED['lost']} BEGIN
+            UPDATE counters SET value = value - (old.status = 'Pending') WHERE name = 'lost_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+    'counters_found_ai': """
+        CREATE TRIGGER counters_found_ai AFTER INSERT ON found_items BEGIN
+            UPDATE counters SET value = value + (new.status = 'Available') WHERE name = 'found_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+    'counters_found_au': f"""
+        CREATE TRIGGER counters_found_au AFTER UPDATE OF {KINDS['found'].FIELDS} ON found_items BEGIN
+            UPDATE counters SET value = value + (new.status = 'Available') - (old.status = 'Available')
+            WHERE name = 'found_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+    'counters_found_ad': f"""
+        CREATE TRIGGER counters_found_ad AFTER DELETE ON found_items WHEN NOT {ARCHIVED['found']} BEGIN
+            UPDATE counters SET value = value - (old.status = 'Available') WHERE name = 'found_open';
+            UPDATE counters SET value = value + 1 WHERE name = 'data_version';
+        END
+    """,
+}
+
+
+def ensure_counters(conn: sqlite3.Connection) -> None:
+    """Create the counters table and triggers, counting existing rows once."""
+    conn.execute(COUNTER_SCHEMA)
+    for name, sql in COUNTER_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    if conn.execute("SELECT 1 FROM counters WHERE name = 'epoch'").fetchone() is None:
+        conn.executemany("INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)", [
+            ('epoch', random.getrandbits(31)),
+            ('data_version', 0),
+            ('lost_open', conn.execute(
+                "SELECT COUNT(*) FROM lost_items WHERE status='Pending'").fetchone()[0]),
+            ('found_open', conn.execute(
+                "SELECT COUNT(*) FROM found_items WHERE status='Available'").fetchone()[0]),
+        ])
+    conn.commit()
+
+
+def read_counters(conn: sqlite3.Connection) -> Dict[str, int]:
+    """All counters in one small read."""
+    return dict(conn.execute("SELECT name, value FROM counters"))
+
+
+def version_tag(counters: Dict[str, int]) -> str:
+    """Opaque token that changes whenever lost/found data changes."""
+    return f"{counters['epoch']:x}-{counters['data_version']}"
+
+
+def data_version(conn: sqlite3.Connection) -> str:
+    """Current version_tag() straight from the database."""
+    return version_tag(read_counters(conn))
+
+
+def bump_version(conn: sqlite3.Connection) -> None:
+    """Mark a change the triggers cannot see (e.g. a bulk rematch)."""
+    conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'data_version'")
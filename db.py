@@ -0,0 +1,341 @@
+# db.py
+# SBMP College Lost and Found System
+# Shared SQLite connection management
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+import sqltrace
+
+# ==========================================
+# ⚙️ CONNECTION SETTINGS
+# ==========================================
+POOL_SIZE = 8
+POOL_TIMEOUT = 5.0          # seconds a request may wait for a free connection
+BUSY_TIMEOUT_MS = 5000      # how long SQLite retries on a locked database
+STATEMENT_CACHE = 256       # prepared statements kept per connection (sqlite3 default 128)
+
+# Applied once per connection when it is opened, never per request.
+PRAGMAS = (
+    # Only takes effect on a new, empty file (it must precede WAL mode);
+    # lets archive.py hand freed pages back with PRAGMA incremental_vacuum
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",            # readers no longer block the writer
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous=NORMAL",          # safe with WAL, one fsync per checkpoint
+    "PRAGMA cache_size=-16000",           # 16 MB page cache per connection
+    "PRAGMA mmap_size=134217728",         # 128 MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the wait limit."""
+
+
+# ==========================================
+# ⏱️ STATEMENT TIMING
+# ==========================================
+# Every connection from connect() adds the time spent inside SQLite
+# (execute, fetch, commit) to a per-thread clock, so a request can tell
+# its DB time apart from everything else without touching call sites.
+# Each statement is also reported to sqltrace once its cursor is drained,
+# closed or reused, with the rows it returned (or changed).
+# Iterating a cursor row by row is not timed: a Python-level __next__
+# would double the cost of every row read.
+_clock = threading.local()
+
+
+def reset_db_time() -> None:
+    """Start a fresh DB-time measurement for the current thread."""
+    _clock.seconds = 0.0
+
+
+def db_time() -> float:
+    """Seconds spent in SQLite on this thread since reset_db_time()."""
+    return getattr(_clock, 'seconds', 0.0)
+
+
+def add_db_time(seconds: float) -> None:
+    """Charge DB time to the current thread, e.g. work done on its behalf."""
+    _clock.seconds = getattr(_clock, 'seconds', 0.0) + seconds
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that times its statements and reports them to sqltrace."""
+
+    _stmt = None  # [sql, params, seconds, rows] of the statement in flight
+
+    def _run(self, method, sql, params):
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return method(self, sql, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            add_db_time(elapsed)
+            self._stmt = [sql, params, elapsed, 0]
+            if self.description is None:
+                self._finish()  # DML/DDL is complete once execute returns
+
+    def execute(self, sql, parameters=()):
+        return self._run(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+    def _read(self, start: float, rows: int, done: bool) -> None:
+        elapsed = time.perf_counter() - start
+        add_db_time(elapsed)
+        stmt = self._stmt
+        if stmt is not None:
+            stmt[2] += elapsed
+            stmt[3] += rows
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._read(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._read(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._read(start, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def _finish(self) -> None:
+        stmt = self._stmt
+        if stmt is None:
+            return
+        self._stmt = None
+        sql, params, seconds, rows = stmt
+        if self.description is None and self.rowcount > 0:
+            rows = self.rowcount
+        sqltrace.record(self.connection, sql, params, seconds, rows)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection handing out TimedCursors; commits are timed too."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute() bypasses cursor(), so route it explicitly
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            add_db_time(time.perf_counter() - start)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a connection with the standard pragmas applied."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE, factory=TimedConnection)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed back with
+    ``release()``; callers that find the pool exhausted wait up to
+    ``timeout`` seconds before ``PoolTimeout`` is raised.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: List[sqlite3.Connection] = []
+        self._uses: Dict[int, int] = {}
+        self._cond = threading.Condition()
+        self._opened = 0
+        self._connects = 0
+        self._in_use = 0
+        self._acquired = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a connection, opening a new one if the pool is not full."""
+        with self._cond:
+            if not self._idle and self._opened >= self.size:
+                start = time.perf_counter()
+                self._waits += 1
+                deadline = start + self.timeout
+                while not self._idle:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"No database connection free after {self.timeout}s")
+                    self._cond.wait(remaining)
+                waited = time.perf_counter() - start
+                self._wait_time += waited
+                self._max_wait = max(self._max_wait, waited)
+
+            if self._idle:
+                conn = self._idle.pop()
+                self._uses[id(conn)] = self._uses.get(id(conn), 0) + 1
+            else:
+                # Reserve the slot before connecting so the lock is not held during I/O
+                self._opened += 1
+                self._connects += 1
+                conn = None
+            self._in_use += 1
+            self._acquired += 1
+
+        if conn is None:
+            try:
+                conn = connect(self.path)
+            except Exception:
+                with self._cond:
+                    self._opened -= 1
+                    self._connects -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            # stats() reads _uses under the lock, so it only changes under it
+            with self._cond:
+                self._uses[id(conn)] = 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection, rolling back anything left uncommitted."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Broken connection: drop it and let the next caller open a fresh one
+            conn.close()
+            with self._cond:
+                self._uses.pop(id(conn), None)
+                self._opened -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._in_use -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows and always returns a connection."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool sizing counters."""
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._opened,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'acquired': self._acquired,
+                'connects': self._connects,
+                'reused': self._acquired - self._connects,
+                'max_uses_per_connection': max(self._uses.values(), default=0),
+                'waits': self._waits,
+                'wait_time_ms': round(self._wait_time * 1000, 3),
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+                'timeouts': self._timeouts,
+            }
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                conn = self._idle.pop()
+                self._uses.pop(id(conn), None)
+                conn.close()
+                self._opened -= 1
+
+
+# ==========================================
+# 📇 INDEX SET
+# ==========================================
+# Every secondary index the app relies on lives here; both init_db() and
+# setup_database() call ensure_indexes() so the web and desktop clients
+# always see the same set. plan_check.py verifies the queries use them.
+INDEXES = {
+    # Dashboard counts and room matching only ever look at open items
+    'idx_lost_open_room': "CREATE INDEX IF NOT EXISTS idx_lost_open_room ON lost_items(room_no) WHERE status='Pending'",
+    'idx_found_open_room': "CREATE INDEX IF NOT EXISTS idx_found_open_room ON found_items(room_no) WHERE status='Available'",
+    # Inventory filters; rowid is the implicit last key, so these also
+    # serve keyset pagination (filter = ? AND id < ? ORDER BY id DESC)
+    'idx_lost_status': "CREATE INDEX IF NOT EXISTS idx_lost_status ON lost_items(status)",
+    'idx_found_status': "CREATE INDEX IF NOT EXISTS idx_found_status ON found_items(status)",
+    'idx_lost_room': "CREATE INDEX IF NOT EXISTS idx_lost_room ON lost_items(room_no)",
+    'idx_found_room': "CREATE INDEX IF NOT EXISTS idx_found_room ON found_items(room_no)",
+    'idx_lost_category': "CREATE INDEX IF NOT EXISTS idx_lost_category ON lost_items(category)",
+    'idx_found_category': "CREATE INDEX IF NOT EXISTS idx_found_category ON found_items(category)",
+    'idx_lost_date': "CREATE INDEX IF NOT EXISTS idx_lost_date ON lost_items(date)",
+    'idx_found_date': "CREATE INDEX IF NOT EXISTS idx_found_date ON found_items(date)",
+    # /api/items walks (date, id) in either direction; with a status
+    # filter this keeps the keyset range inside one status
+    'idx_lost_status_date': "CREATE INDEX IF NOT EXISTS idx_lost_status_date ON lost_items(status, date)",
+    'idx_found_status_date': "CREATE INDEX IF NOT EXISTS idx_found_status_date ON found_items(status, date)",
+    # Epoch range filters (created_from/to, resolved_from/to); the columns
+    # come from migration 1, which runs before ensure_indexes()
+    'idx_lost_created': "CREATE INDEX IF NOT EXISTS idx_lost_created ON lost_items(created_at)",
+    'idx_found_created': "CREATE INDEX IF NOT EXISTS idx_found_created ON found_items(created_at)",
+    'idx_lost_resolved': "CREATE INDEX IF NOT EXISTS idx_lost_resolved ON lost_items(resolved_at)",
+    'idx_found_resolved': "CREATE INDEX IF NOT EXISTS idx_found_resolved ON found_items(resolved_at)",
+    # Archive reads with ?archive=1 walk id (the rowid) or date, like the
+    # hot tables; other filters are checked row by row within that walk
+    'idx_lost_archive_date': "CREATE INDEX IF NOT EXISTS idx_lost_archive_date ON lost_archive(date)",
+    'idx_found_archive_date': "CREATE INDEX IF NOT EXISTS idx_found_archive_date ON found_archive(date)",
+}
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create any missing index from INDEXES and refresh planner stats."""
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    analyzed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'").fetchone() is not None
+    for name, sql in INDEXES.items():
+        conn.execute(sql)
+        if analyzed and name not in existing:
+            # An index with no stats looks more selective than its analyzed
+            # siblings and can steal their plans (e.g. status=? ORDER BY id)
+            conn.execute(f"ANALYZE {name}")
+    conn.commit()
+    conn.execute("PRAGMA optimize")
@@ -0,0 +1,144 @@
+# dbworker.py
+# SBMP College Lost and Found System
+# Background database thread for the desktop client
+
+import queue
+import sqlite3
+import threading
+from typing import Callable, Optional
+from db import connect
+
+# ==========================================
+# ⚙️ WORKER SETTINGS
+# ==========================================
+# Tk must only be touched from its own thread, so the worker never calls
+# back directly: finished jobs go on a results queue that the Tk loop
+# drains with root.after while anything is outstanding.
+POLL_MS = 25        # how often Tk checks for finished jobs while any are pending
+CLOSE_TIMEOUT = 5.0 # seconds to wait for the running job when the window closes
+
+
+class Job:
+    """One unit of work and the callbacks waiting for its result."""
+
+    __slots__ = ('fn', 'done', 'failed', 'cancellable', 'generation')
+
+    def __init__(self, fn, done, failed, cancellable, generation):
+        self.fn = fn
+        self.done = done
+        self.failed = failed
+        self.cancellable = cancellable
+        self.generation = generation
+
+
+class DbWorker:
+    """One thread and one long-lived connection serving the Tk client.
+
+    ``submit(fn, done, failed)`` runs ``fn(conn)`` on the worker; then
+    ``done(result)`` or ``failed(exc)`` is called on the Tk thread.
+
+    Reads are cancellable: ``cancel_stale()`` (called when the user leaves
+    a page) skips queued reads, interrupts one that is running and drops
+    their callbacks. Writes are submitted with ``cancellable=False`` and
+    always run to completion.
+
+    ``on_busy(pending)`` is told on the Tk thread whenever the number of
+    outstanding jobs changes, for loading indicators; ``on_error(exc)``
+    gets failures of jobs that have no ``failed`` callback.
+    """
+
+    def __init__(self, root, path: str, on_busy: Optional[Callable[[int], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.root = root
+        self.path = path
+        self.on_busy = on_busy
+        self.on_error = on_error
+        self._jobs: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._running: Optional[Job] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending = 0           # only touched on the Tk thread
+        self._polling = None
+        self._thread = threading.Thread(target=self._run, name="sbmp-desktop-db", daemon=True)
+        self._thread.start()
+
+    # ---------- Tk thread ----------
+    def submit(self, fn: Callable[[sqlite3.Connection], object], done: Optional[Callable] = None,
+               failed: Optional[Callable] = None, cancellable: bool = True) -> Job:
+        """Queue fn(conn); its callbacks run later on the Tk thread."""
+        job = Job(fn, done, failed, cancellable, self._generation)
+        self._pending += 1
+        self._jobs.put(job)
+        self._changed()
+        if self._polling is None:
+            self._polling = self.root.after(POLL_MS, self._poll)
+        return job
+
+    def cancel_stale(self) -> None:
+        """Cancel every read submitted so far, interrupting a running one."""
+        with self._lock:
+            self._generation += 1
+            if self._running is not None and self._running.cancellable:
+                self._conn.interrupt()
+
+    def pending(self) -> int:
+        return self._pending
+
+    def _stale(self, job: Job) -> bool:
+        return job.cancellable and job.generation != self._generation
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                job, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if self._stale(job):
+                continue  # its page is gone; the widgets may be too
+            callback = job.done if ok else (job.failed or self.on_error)
+            if callback is not None:
+                callback(value)
+        self._changed()
+        self._polling = self.root.after(POLL_MS, self._poll) if self._pending else None
+
+    def _changed(self) -> None:
+        if self.on_busy is not None:
+            self.on_busy(self._pending)
+
+    def close(self) -> None:
+        """Stop after the running job; queued reads are dropped."""
+        self.cancel_stale()
+        if self._polling is not None:
+            self.root.after_cancel(self._polling)
+            self._polling = None
+        self._jobs.put(None)
+        self._thread.join(CLOSE_TIMEOUT)
+
+    # ---------- worker thread ----------
+    def _run(self) -> None:
+        self._conn = connect(self.path)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                with self._lock:
+                    if self._stale(job):
+                        self._results.put((job, False, None))
+                        continue
+                    self._running = job
+                try:
+                    result, ok = job.fn(self._conn), True
+                except Exception as e:
+                    result, ok = e, False
+                finally:
+                    with self._lock:
+                        self._running = None
+                    if self._conn.in_transaction:
+                        self._conn.rollback()  # a failed or interrupted job leaves nothing open
+                self._results.put((job, ok, result))
+        finally:
+            self._conn.close()
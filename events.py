@@ -0,0 +1,225 @@
+# events.py
+# SBMP College Lost and Found System
+# Change log and Server-Sent Events fan-out
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+from repository import ARCHIVED, KINDS
+
+# ==========================================
+# 📜 CHANGE LOG
+# ==========================================
+# Triggers append one row per insert, update and delete on either item
+# table, whichever client made the write. Updates only count when they
+# touch the item's FIELDS, so timestamp backfills stay out of the feed,
+# and rows moved to the archive are not announced as deletes.
+# seq is the SSE event id, so a reconnecting browser resumes exactly
+# where it left off.
+CHANGE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        item_id INTEGER NOT NULL,
+        op TEXT NOT NULL
+    )
+"""
+
+CHANGE_TRIGGERS = {
+    f'changes_{kind}_{suffix}': f"""
+        CREATE TRIGGER changes_{kind}_{suffix} AFTER {event} ON {kind}_items {when} BEGIN
+            INSERT INTO changes (kind, item_id, op) VALUES ('{kind}', {row}.id, '{op}');
+        END
+    """
+    for kind in ('lost', 'found')
+    for suffix, event, row, op, when in (('ai', 'INSERT', 'new', 'insert', ''),
+                                         ('au', f'UPDATE OF {KINDS[kind].FIELDS}', 'new', 'update', ''),
+                                         ('ad', 'DELETE', 'old', 'delete', f'WHEN NOT {ARCHIVED[kind]}'))
+}
+
+CHANGE_LOG_KEEP = 10000     # rows kept for reconnecting clients
+
+FEED_SQL = "SELECT seq, kind, item_id, op FROM changes WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?"
+LAST_SEQ_SQL = "SELECT COALESCE(MAX(seq), 0) FROM changes"
+FIRST_SEQ_SQL = "SELECT MIN(seq) FROM changes"
+PRUNE_SQL = "DELETE FROM changes WHERE seq <= ?"
+
+
+def ensure_changes(conn: sqlite3.Connection) -> None:
+    """Create the change log and its triggers, trimming old entries."""
+    conn.execute(CHANGE_SCHEMA)
+    for name, sql in CHANGE_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    last = conn.execute(LAST_SEQ_SQL).fetchone()[0]
+    conn.execute(PRUNE_SQL, (last - CHANGE_LOG_KEEP,))
+    conn.commit()
+
+
+# ==========================================
+# 📡 FAN-OUT
+# ==========================================
+FEED_INTERVAL = 0.5         # seconds between change-log polls
+MAX_EVENT_BATCH = 200       # more changes than this at once: clients just reload
+SUBSCRIBER_QUEUE = 500      # events buffered per client before it is told to reload
+MATCH_REFRESH = 2.0         # minimum seconds between match-list diffs
+KEEPALIVE = 15.0            # seconds of silence before a comment line is sent
+
+
+def sse(event: str, data: dict, seq: Optional[int] = None) -> str:
+    """One Server-Sent Events message."""
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+RELOAD = sse('reload', {})
+
+
+class ChangeFeed:
+    """One background poller turning the change log into SSE deltas.
+
+    However many browsers are connected, the change log is read once per
+    interval and every subscriber gets the same pre-rendered messages:
+    ``item`` (insert/update/delete with the row), ``stats`` (counts) and
+    ``matches`` (dashboard rows to upsert or remove).
+
+    ``describe(conn, kind, ids)`` returns {id: row dict}; ``summary(conn)``
+    returns the /api/stats payload.
+    """
+
+    def __init__(self, pool, describe: Callable, summary: Callable, interval: float = FEED_INTERVAL):
+        self.pool = pool
+        self.describe = describe
+        self.summary = summary
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._subscribers: Set[queue.Queue] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._seq: Optional[int] = None
+        self._matches: Optional[Dict[int, dict]] = None
+        self._summary_due = False
+        self._last_summary = 0.0
+        self._pruned = 0
+
+    # ---------- subscribers ----------
+    def subscribe(self, since: Optional[int] = None) -> queue.Queue:
+        """Register a client; replay changes after ``since`` when still logged."""
+        q: queue.Queue = queue.Queue(SUBSCRIBER_QUEUE)
+        with self._lock:
+            with self.pool.connection() as conn:
+                if self._seq is None:
+                    self._seq = conn.execute(LAST_SEQ_SQL).fetchone()[0]
+                if since is not None and since < self._seq:
+                    first = conn.execute(FIRST_SEQ_SQL).fetchone()[0]
+                    if first is None or since + 1 < first or self._seq - since > MAX_EVENT_BATCH:
+                        q.put(RELOAD)
+                    else:
+                        rows = conn.execute(FEED_SQL, (since, self._seq, MAX_EVENT_BATCH)).fetchall()
+                        for message in self._item_events(conn, rows):
+                            q.put(message)
+            self._subscribers.add(q)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sbmp-events", daemon=True)
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _publish(self, messages: List[str]) -> None:
+        for q in list(self._subscribers):
+            try:
+                for message in messages:
+                    q.put_nowait(message)
+            except queue.Full:
+                # Slow client: drop what it has not read and let it start over
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(RELOAD)
+
+    # ---------- polling ----------
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Change feed error: {e}")
+
+    def poll(self) -> None:
+        """Read new changes once and fan the resulting events out."""
+        with self._lock:
+            if not self._subscribers:
+                # Nobody listening: forget the position, resume from "now" later
+                self._seq = None
+                self._matches = None
+                return
+            with self.pool.connection() as conn:
+                last = conn.execute(LAST_SEQ_SQL).fetchone()[0]
+                messages: List[str] = []
+                if self._seq is None:
+                    self._seq = last
+                if last > self._seq:
+                    if last - self._seq > MAX_EVENT_BATCH:
+                        messages.append(sse('reload', {}, last))
+                        self._matches = None
+                    else:
+                        rows = conn.execute(FEED_SQL, (self._seq, last, MAX_EVENT_BATCH)).fetchall()
+                        messages += self._item_events(conn, rows)
+                    self._seq = last
+                    self._summary_due = True
+                if self._summary_due and time.time() - self._last_summary >= MATCH_REFRESH:
+                    messages += self._summary_events(conn)
+                if last - self._pruned > CHANGE_LOG_KEEP:
+                    conn.execute(PRUNE_SQL, (last - CHANGE_LOG_KEEP,))
+                    conn.commit()
+                    self._pruned = last
+            if messages:
+                self._publish(messages)
+
+    def _item_events(self, conn: sqlite3.Connection, rows: list) -> List[str]:
+        """One ``item`` event per changed item, carrying its current row."""
+        latest: Dict[tuple, int] = {}
+        for seq, kind, item_id, _ in rows:
+            latest[(kind, item_id)] = seq  # several changes to one item collapse
+        found_rows = {}
+        for kind in ('lost', 'found'):
+            ids = [item_id for (k, item_id) in latest if k == kind]
+            if ids:
+                found_rows[kind] = self.describe(conn, kind, ids)
+        inserted = {(kind, item_id) for _, kind, item_id, op in rows if op == 'insert'}
+
+        messages = []
+        for (kind, item_id), seq in sorted(latest.items(), key=lambda kv: kv[1]):
+            row = found_rows.get(kind, {}).get(item_id)
+            if row is None:
+                data = {'type': kind, 'id': item_id, 'op': 'delete'}
+            else:
+                op = 'insert' if (kind, item_id) in inserted else 'update'
+                data = {'type': kind, 'id': item_id, 'op': op, 'item': row}
+            messages.append(sse('item', data, seq))
+        return messages
+
+    def _summary_events(self, conn: sqlite3.Connection) -> List[str]:
+        """Counts plus the dashboard match rows that changed since last time."""
+        self._summary_due = False
+        self._last_summary = time.time()
+        payload = self.summary(conn)
+        messages = [sse('stats', {k: payload[k] for k in ('lost_count', 'found_count', 'match_count')})]
+        current = {m['lost_id']: m for m in payload['matches']}
+        if self._matches is not None:
+            upsert = [m for lost_id, m in current.items() if self._matches.get(lost_id) != m]
+            remove = [lost_id for lost_id in self._matches if lost_id not in current]
+            if upsert or remove:
+                messages.append(sse('matches', {'upsert': upsert, 'remove': remove}))
+        else:
+            messages.append(sse('matches', {'replace': payload['matches']}))
+        self._matches = current
+        return messages
@@ -0,0 +1,77 @@
+# export.py
+# SBMP College Lost and Found System
+# Streaming CSV export
+
+import csv
+import sqlite3
+import zlib
+from typing import Iterable, Iterator
+from repository import tables as source_tables
+
+EXPORT_BATCH = 1000  # rows fetched and encoded per chunk
+
+EXPORT_TABLES = {
+    'lost': ('=== LOST ITEMS ===',
+             ['ID', 'Name', 'Roll', 'Item', 'Room', 'Category', 'Date', 'Status'],
+             "id, student_name, roll_no, item_name, room_no, category, date, status"),
+    'found': ('=== FOUND ITEMS ===',
+              ['ID', 'Finder', 'Item', 'Room', 'Category', 'Date', 'Status'],
+              "id, finder_name, item_name, room_no, category, date, status"),
+}
+
+
+class _Line:
+    """File-like sink so csv.writer hands back each encoded line."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(conn: sqlite3.Connection, tables: Iterable[str] = ('lost', 'found'),
+               status: str = '', date_from: str = '', date_to: str = '',
+               batch_size: int = EXPORT_BATCH, archive: bool = False) -> Iterator[bytes]:
+    """Yield the export as UTF-8 CSV chunks of at most ``batch_size`` rows.
+
+    Rows are stepped through one cursor with fetchmany(), so memory stays
+    flat however large the tables are. With ``archive`` each section also
+    holds the archived rows of its type, in id order with the rest.
+    """
+    writer = csv.writer(_Line())
+    for n, key in enumerate(tables):
+        title, header, columns = EXPORT_TABLES[key]
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if date_from:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("date <= ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        lead = [writer.writerow([])] if n else []
+        yield ''.join(lead + [writer.writerow([title]), writer.writerow(header)]).encode('utf-8')
+
+        sources = source_tables(key, archive)
+        sql = " UNION ALL ".join(f"SELECT {columns} FROM {t} {where}" for t in sources)
+        cursor = conn.execute(f"{sql} ORDER BY id", params * len(sources))
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield ''.join(writer.writerow(r) for r in rows).encode('utf-8')
+        finally:
+            cursor.close()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a chunk stream into one gzip member on the fly."""
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
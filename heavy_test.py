@@ -7,6 +7,8 @@ Tests every single feature, edge case, and potential bug
 import requests
 import json
 import sys
+import threading
+import load_test
 import time
 from datetime import datetime
 
@@ -59,6 +61,16 @@ def test_stats_api():
         log_test("Lost count is number", isinstance(data.get('lost_count'), int))
         log_test("Found count is number", isinstance(data.get('found_count'), int))
         log_test("Matches is array", isinstance(data.get('matches'), list))
+        
+        # Conditional requests: unchanged data answers 304
+        etag = r.headers.get('ETag')
+        log_test("Stats has ETag", bool(etag))
+        if etag:
+            r = requests.get(f"{BASE_URL}/api/stats", headers={'If-None-Match': etag})
+            log_test("Unchanged stats return 304", r.status_code == 304)
+            requests.post(f"{BASE_URL}/api/found", json={"item": "ETag Probe", "room": ""})
+            r = requests.get(f"{BASE_URL}/api/stats", headers={'If-None-Match': etag})
+            log_test("Stats change after a write", r.status_code == 200 and r.headers.get('ETag') != etag)
     except Exception as e:
         log_test("Stats API working", False, str(e))
 
@@ -154,7 +166,7 @@ def test_data_retrieval():
     
     try:
         # Get lost items
-        r = requests.get(f"{BASE_URL}/api/lost")
+        r = requests.get(f"{BASE_URL}/api/lost?all=1")
         lost_items = r.json()
         log_test("Lost items API returns 200", r.status_code == 200)
         log_test("Lost items returns array", isinstance(lost_items, list))
@@ -169,7 +181,7 @@ def test_data_retrieval():
             log_test("Lost item has date", 'date' in item)
         
         # Get found items
-        r = requests.get(f"{BASE_URL}/api/found")
+        r = requests.get(f"{BASE_URL}/api/found?all=1")
         found_items = r.json()
         log_test("Found items API returns 200", r.status_code == 200)
         log_test("Found items returns array", isinstance(found_items, list))
@@ -177,6 +189,81 @@ def test_data_retrieval():
     except Exception as e:
         log_test("Data retrieval working", False, str(e))
 
+def test_pagination():
+    """Test 5b: Keyset pagination and filters"""
+    print("\n📑 TESTING PAGINATION...")
+    
+    try:
+        r = requests.get(f"{BASE_URL}/api/lost?limit=2")
+        page = r.json()
+        log_test("Paginated lost returns 200", r.status_code == 200)
+        log_test("Page has items and cursor", 'items' in page and 'next_cursor' in page)
+        log_test("Page respects limit", len(page.get('items', [])) <= 2)
+        
+        if page.get('next_cursor'):
+            r = requests.get(f"{BASE_URL}/api/lost?limit=2&after={page['next_cursor']}")
+            nxt = r.json()
+            first_ids = {i['id'] for i in page['items']}
+            log_test("Next page has no overlap", not first_ids & {i['id'] for i in nxt['items']})
+            log_test("Next page is older", all(i['id'] < page['next_cursor'] for i in nxt['items']))
+        
+        r = requests.get(f"{BASE_URL}/api/found?status=Available&room=101")
+        items = r.json().get('items', [])
+        log_test("Found filters applied", all(i['room'] == '101' and i['status'] == 'Available' for i in items))
+        
+        r = requests.get(f"{BASE_URL}/api/lost?limit=abc")
+        log_test("Invalid limit rejected", r.status_code == 400)
+        
+        r = requests.get(f"{BASE_URL}/api/items?limit=3")
+        page = r.json()
+        log_test("Combined items returns 200", r.status_code == 200)
+        log_test("Combined items are typed", all(i['type'] in ('lost', 'found') for i in page.get('items', [])))
+        if page.get('next_cursor'):
+            nxt = requests.get(f"{BASE_URL}/api/items?limit=3&cursor={page['next_cursor']}").json()
+            keys = [(i['date'], i['id'], i['type']) for i in page['items'] + nxt['items']]
+            log_test("Combined pages continue in order",
+                     len(set(keys)) == len(keys) and all(a[0] >= b[0] for a, b in zip(keys, keys[1:])))
+        
+        r = requests.get(f"{BASE_URL}/api/items?type=found&status=Available")
+        log_test("Combined filters applied", all(i['type'] == 'found' and i['status'] == 'Available'
+                                                 for i in r.json().get('items', [])))
+        r = requests.get(f"{BASE_URL}/api/items?type=bogus")
+        log_test("Invalid item type rejected", r.status_code == 400)
+        
+        objects = requests.get(f"{BASE_URL}/api/items?limit=5").json()['items']
+        page = requests.get(f"{BASE_URL}/api/items?limit=5&format=columns").json()
+        log_test("Columnar page decodes to the same items",
+                 [dict(zip(page['columns'], row)) for row in page['rows']]
+                 == [{k: i.get(k) for k in page['columns']} for i in objects])
+        page = requests.get(f"{BASE_URL}/api/lost?limit=5&format=columns").json()
+        log_test("Columnar lost page has keys once", page['columns'][0] == 'id' and 'items' not in page)
+        r = requests.get(f"{BASE_URL}/api/lost?format=xml")
+        log_test("Unknown format rejected", r.status_code == 400)
+    except Exception as e:
+        log_test("Pagination working", False, str(e))
+
+def test_search():
+    """Test 5c: Full-text search"""
+    print("\n🔎 TESTING SEARCH...")
+    
+    try:
+        r = requests.get(f"{BASE_URL}/api/search", params={'q': 'blue note'})
+        data = r.json()
+        log_test("Search returns 200", r.status_code == 200)
+        log_test("Search finds prefix matches", any('Notebook' in i['item'] for i in data.get('items', [])))
+        log_test("Search results are ranked", all('score' in i and 'type' in i for i in data.get('items', [])))
+        
+        r = requests.get(f"{BASE_URL}/api/search", params={'q': 'notebook', 'type': 'found'})
+        log_test("Search type filter", all(i['type'] == 'found' for i in r.json().get('items', [])))
+        
+        r = requests.get(f"{BASE_URL}/api/search", params={'q': '\'"*) OR ( NEAR'})
+        log_test("Search escapes FTS syntax", r.status_code == 200)
+        
+        r = requests.get(f"{BASE_URL}/api/search", params={'q': 'x', 'type': 'bogus'})
+        log_test("Search rejects bad type", r.status_code == 400)
+    except Exception as e:
+        log_test("Search working", False, str(e))
+
 def test_room_matching():
     """Test 6: Room matching algorithm"""
     print("\n🔗 TESTING ROOM MATCHING...")
@@ -211,6 +298,23 @@ def test_room_matching():
         if matches:
             match_rooms = [m['room'] for m in matches]
             log_test("Match has correct room", '201' in match_rooms or '101' in match_rooms)
+            lost_ids = [m['lost_id'] for m in matches]
+            log_test("Each lost item listed once", len(lost_ids) == len(set(lost_ids)))
+            
+        # Fuzzy matching: word order, punctuation and room differ
+        requests.post(f"{BASE_URL}/api/found", json={"finder": "Fuzzy Finder", "item": "Notebook (blue)",
+                                                      "room": "102", "category": "Documents"})
+        r = requests.get(f"{BASE_URL}/api/lost?all=1")
+        target = next((i for i in r.json() if i['item'] == 'Blue Notebook'), None)
+        if target:
+            r = requests.get(f"{BASE_URL}/api/matches/{target['id']}")
+            candidates = r.json().get('candidates', [])
+            log_test("Fuzzy match endpoint returns 200", r.status_code == 200)
+            log_test("Fuzzy match finds reworded item", any(c['item'] == 'Notebook (blue)' for c in candidates))
+            log_test("Candidates sorted by score", candidates == sorted(candidates, key=lambda c: -c['score']))
+        
+        r = requests.get(f"{BASE_URL}/api/matches/999999")
+        log_test("Unknown lost item gives 404", r.status_code == 404)
             
     except Exception as e:
         log_test("Room matching algorithm", False, str(e))
@@ -221,16 +325,23 @@ def test_item_management():
     
     try:
         # Get a lost item ID
-        r = requests.get(f"{BASE_URL}/api/lost")
+        r = requests.get(f"{BASE_URL}/api/lost?all=1")
         items = r.json()
         
         if items and len(items) > 0:
             item_id = items[0]['id']
             
             # Test resolve (PUT)
+            since = int(time.time()) - 5
             r = requests.put(f"{BASE_URL}/api/item/lost/{item_id}")
             result = r.json()
             log_test("Item resolve works", result.get('success') == True)
+            r = requests.get(f"{BASE_URL}/api/items", params={"type": "lost", "resolved_from": since, "limit": 500})
+            log_test("Resolve records resolved_at", item_id in [i['id'] for i in r.json()['items']])
+            r = requests.get(f"{BASE_URL}/api/lost", params={"created_from": since - 3600, "limit": 500})
+            log_test("Reports record created_at", item_id in [i['id'] for i in r.json()['items']])
+            r = requests.get(f"{BASE_URL}/api/lost", params={"created_from": "abc"})
+            log_test("Epoch filters reject non-integers", r.status_code == 400)
             
             # Test delete (DELETE)
             r = requests.delete(f"{BASE_URL}/api/item/lost/{item_id}")
@@ -277,6 +388,15 @@ def test_export():
         log_test("Export has CSV content", 'text/csv' in r.headers.get('Content-Type', ''))
         log_test("Export has data", len(r.content) > 0)
         log_test("Export has CSV headers", b'LOST ITEMS' in r.content or b'ID' in r.content)
+        
+        r = requests.get(f"{BASE_URL}/api/export", params={'table': 'found', 'status': 'Available'})
+        log_test("Filtered export has only found items", b'FOUND ITEMS' in r.content and b'LOST ITEMS' not in r.content)
+        
+        r = requests.get(f"{BASE_URL}/api/export", params={'gzip': '1'})
+        log_test("Gzip export is gzip", r.content[:2] == b'\x1f\x8b')
+        
+        r = requests.get(f"{BASE_URL}/api/export", params={'table': 'bogus'})
+        log_test("Invalid export table rejected", r.status_code == 400)
     except Exception as e:
         log_test("CSV export", False, str(e))
 
@@ -301,13 +421,287 @@ def test_stress():
         log_test("Stress test (10 rapid requests)", True)
         
         # Verify all saved
-        r = requests.get(f"{BASE_URL}/api/lost")
+        r = requests.get(f"{BASE_URL}/api/lost?all=1")
         items = r.json()
         log_test("All stress test items saved", len(items) >= 10)
         
+        # The list is well past the gzip threshold by now
+        r = requests.get(f"{BASE_URL}/api/lost?all=1", headers={'Accept-Encoding': 'gzip'})
+        log_test("Large responses are gzipped", r.headers.get('Content-Encoding') == 'gzip'
+                 and 'Accept-Encoding' in r.headers.get('Vary', '') and r.json() == items)
+        r = requests.get(f"{BASE_URL}/api/lost?all=1", headers={'Accept-Encoding': 'identity'})
+        log_test("No gzip unless accepted", 'Content-Encoding' not in r.headers)
+        
+        # Concurrent mixed workload (see load_test.py for the full benchmark)
+        summary, elapsed = load_test.run(('http', BASE_URL), workers=8, duration=3)
+        total = summary['ALL']
+        log_test("Concurrent burst (8 workers) has no server errors", total['errors'] == 0,
+                 f"{total['count']} requests, {total['rps']:.0f} req/s, p99 {total['p99']:.0f}ms")
+        
     except Exception as e:
         log_test("Stress testing", False, str(e))
 
+def test_bulk_ingest():
+    """Test 10b: Bulk ingest (JSON array and NDJSON)"""
+    print("\n📦 TESTING BULK INGEST...")
+    
+    try:
+        rows = [{"name": f"Logbook {i}", "roll": f"LB{i:04d}", "item": f"Logbook Item {i}",
+                 "room": f"{300 + i % 20}", "category": "Other", "date": "2025-01-15"} for i in range(1000)]
+        rows.append({"roll": "LB-BAD", "item": "No Name"})
+        start = time.time()
+        r = requests.post(f"{BASE_URL}/api/lost/bulk", json=rows)
+        elapsed = time.time() - start
+        data = r.json()
+        log_test("Bulk JSON returns 200", r.status_code == 200)
+        log_test("Bulk inserts valid rows", data.get('inserted') == 1000)
+        log_test("Bulk reports invalid row", data.get('failed') == 1 and not data['results'][-1]['success'])
+        log_test("Bulk 1000 rows under 5s", elapsed < 5, f"{elapsed:.2f}s")
+        
+        ndjson = '\n'.join(json.dumps({"finder": "Porter", "item": f"Logbook Found {i}", "room": "301"})
+                           for i in range(50)) + '\nnot json\n'
+        r = requests.post(f"{BASE_URL}/api/found/bulk", data=ndjson.encode(),
+                          headers={'Content-Type': 'application/x-ndjson'})
+        data = r.json()
+        log_test("Bulk NDJSON inserts rows", data.get('inserted') == 50)
+        log_test("Bulk NDJSON flags bad line", data.get('failed') == 1)
+        
+        r = requests.post(f"{BASE_URL}/api/lost/bulk", json={"not": "a list"})
+        log_test("Bulk rejects non-array body", r.status_code == 400)
+        
+        r = requests.post(f"{BASE_URL}/api/lost/bulk",
+                          json=[{"name": ["bad"], "item": "Typed Item"}, {"name": "Typed", "item": "Typed Item"}])
+        data = r.json()
+        log_test("Bulk rejects non-text field per row",
+                 data.get('inserted') == 1 and not data['results'][0]['success'])
+        
+        r = requests.post(f"{BASE_URL}/api/lost/bulk",
+                          json=[{"name": "Week", "item": "Week Date Item", "date": "2024-W01-1"},
+                                {"name": "Week", "item": "Compact Date Item", "date": "20240102"}])
+        data = r.json()
+        log_test("Bulk rejects non-calendar dates", data.get('inserted') == 0 and data.get('failed') == 2)
+        
+        r = requests.post(f"{BASE_URL}/api/lost/bulk", json=[{}] * 50001)
+        log_test("Bulk over row limit returns 413", r.status_code == 413)
+    except Exception as e:
+        log_test("Bulk ingest", False, str(e))
+
+def test_batch_ops():
+    """Test 10c: Batch resolve/delete"""
+    print("\n🧹 TESTING BATCH OPERATIONS...")
+    
+    try:
+        rows = [{"item": f"Batch Bottle {i}", "room": "777", "category": "Bottle", "date": "2020-01-01"}
+                for i in range(20)]
+        ids = [r['id'] for r in requests.post(f"{BASE_URL}/api/found/bulk", json=rows).json()['results']]
+        
+        ops = [{"type": "found", "id": i, "action": "resolve"} for i in ids[:5]]
+        ops.append({"type": "found", "id": ids[5], "action": "delete"})
+        r = requests.post(f"{BASE_URL}/api/items/batch", json={"ops": ops})
+        data = r.json()
+        log_test("Batch ops return 200", r.status_code == 200)
+        log_test("Batch ops count resolves and deletes",
+                 data.get('affected', {}).get('found') == {"resolve": 5, "delete": 1})
+        
+        r = requests.post(f"{BASE_URL}/api/items/batch", json={"ops": ops[:5]})
+        log_test("Batch resolve is idempotent", r.json().get('total') == 0)
+        
+        r = requests.post(f"{BASE_URL}/api/items/batch", json={
+            "filter": {"type": "found", "status": "Available", "category": "Bottle",
+                       "room": "777", "older_than_days": 90},
+            "action": "delete"})
+        log_test("Batch filter deletes old open items", r.json().get('total') == 14)
+        
+        r = requests.post(f"{BASE_URL}/api/items/batch", json={"filter": {"type": "lost"}, "action": "delete"})
+        log_test("Batch rejects unbounded filter", r.status_code == 400)
+        
+        r = requests.post(f"{BASE_URL}/api/items/batch", json={
+            "filter": {"type": "found", "date_before": "20240102"}, "action": "delete"})
+        log_test("Batch rejects compact date", r.status_code == 400)
+        for flt in ({"type": "found", "date_before": 5}, {"type": "found", "older_than_days": [1]}):
+            r = requests.post(f"{BASE_URL}/api/items/batch", json={"filter": flt, "action": "delete"})
+            log_test(f"Batch rejects mistyped filter {list(flt)[1]}", r.status_code == 400)
+        r = requests.post(f"{BASE_URL}/api/items/batch",
+                          json={"ops": [{"type": "lost", "id": 1, "action": "explode"}]})
+        log_test("Batch rejects unknown action", r.status_code == 400)
+    except Exception as e:
+        log_test("Batch operations", False, str(e))
+
+def test_group_commit():
+    """Test 10d: Concurrent reports share group commits"""
+    print("\n🧺 TESTING GROUP COMMIT...")
+    
+    try:
+        before = requests.get(f"{BASE_URL}/api/pool").json()['writer']
+        statuses = []
+        
+        def report(i):
+            r = requests.post(f"{BASE_URL}/api/found", json={"finder": "Burst", "item": f"Burst Item {i}",
+                                                              "room": "205", "category": "Other"})
+            statuses.append(r.status_code)
+        
+        threads = [threading.Thread(target=report, args=(i,)) for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        after = requests.get(f"{BASE_URL}/api/pool").json()['writer']
+        log_test("Concurrent reports all succeed", statuses.count(200) == 40, str(sorted(set(statuses))))
+        log_test("Writer committed every report", after['writes'] - before['writes'] >= 40)
+        log_test("Writer exposes queue depth and batches",
+                 {'queue_depth', 'max_queue_depth', 'batches', 'avg_batch'} <= set(after))
+        r = requests.get(f"{BASE_URL}/metrics")
+        log_test("Metrics has writer batch sizes", 'sbmp_writer_batch_size_bucket' in r.text)
+    except Exception as e:
+        log_test("Group commit", False, str(e))
+
+def test_live_events():
+    """Test 10e: Server-Sent Events change feed"""
+    print("\n📡 TESTING LIVE EVENTS...")
+    
+    events = []
+    
+    def listen(resp):
+        event = None
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event = line[7:]
+                elif line.startswith('data: ') and event:
+                    events.append((event, json.loads(line[6:])))
+        except Exception:
+            pass
+    
+    try:
+        r = requests.get(f"{BASE_URL}/api/events", stream=True, timeout=10)
+        log_test("Events stream opens", r.status_code == 200)
+        log_test("Events stream is text/event-stream",
+                 r.headers.get('Content-Type', '').startswith('text/event-stream'))
+        reader = threading.Thread(target=listen, args=(r,), daemon=True)
+        reader.start()
+        time.sleep(0.5)
+        
+        requests.post(f"{BASE_URL}/api/lost", json={"name": "Live Feed", "roll": "LF001",
+                                                    "item": "Live Feed Compass", "room": "510"})
+        deadline = time.time() + 5
+        while time.time() < deadline and not any(e == 'stats' for e, _ in events):
+            time.sleep(0.1)
+        r.close()
+        
+        inserts = [d for e, d in events if e == 'item' and d.get('op') == 'insert']
+        log_test("Insert arrives as item event",
+                 any(d['item']['item'] == 'Live Feed Compass' for d in inserts))
+        log_test("Stats delta follows the change", any(e == 'stats' for e, _ in events))
+    except Exception as e:
+        log_test("Live events", False, str(e))
+
+def test_analytics():
+    """Test 10f: Rollup-backed analytics"""
+    print("\n📈 TESTING ANALYTICS...")
+    
+    try:
+        room = f"AN-{int(time.time())}"
+        rows = [{"name": "Rollup", "item": "Umbrella", "room": room, "category": "Other", "date": d}
+                for d in ("2021-03-01", "2021-03-02", "2021-03-09")]
+        ids = [r['id'] for r in requests.post(f"{BASE_URL}/api/lost/bulk", json=rows).json()['results']]
+        requests.put(f"{BASE_URL}/api/item/lost/{ids[0]}")
+        
+        url = f"{BASE_URL}/api/analytics?date_from=2021-03-01&date_to=2021-03-14&room={room}"
+        r = requests.get(url)
+        data = r.json()
+        log_test("Analytics returns 200", r.status_code == 200)
+        log_test("Analytics buckets reports by week",
+                 [(w['week'], w['reported'], w['recovered']) for w in data['weekly']]
+                 == [("2021-03-01", 2, 1), ("2021-03-08", 1, 0)], str(data.get('weekly')))
+        log_test("Analytics measures time to resolve",
+                 data['time_to_resolve']['resolved'] == 1 and data['time_to_resolve']['median_days'] > 365)
+        hot = requests.get(f"{BASE_URL}/api/analytics?date_from=2021-03-01&date_to=2021-03-14&top=50").json()
+        log_test("Analytics lists hotspot rooms",
+                 {'room': room, 'reported': 3, 'recovered': 1, 'open': 2} in hot['hotspots'])
+        r = requests.get(url, headers={"If-None-Match": r.headers.get('ETag', '')})
+        log_test("Analytics returns 304 when unchanged", r.status_code == 304)
+        r = requests.get(f"{BASE_URL}/api/analytics?date_from=2021-03-14&date_to=2021-03-01")
+        log_test("Analytics rejects reversed range", r.status_code == 400)
+        r = requests.get(f"{BASE_URL}/api/analytics?date_to=yesterday")
+        log_test("Analytics rejects bad dates", r.status_code == 400)
+        r = requests.get(f"{BASE_URL}/api/analytics?date_from=0001-01-01")
+        log_test("Analytics rejects over-long range", r.status_code == 400)
+    except Exception as e:
+        log_test("Analytics", False, str(e))
+
+def test_archive():
+    """Test 10f: Hot/cold archival"""
+    print("\n🧊 TESTING ARCHIVE...")
+    
+    try:
+        room = f"AR-{int(time.time())}"
+        rows = [{"name": "Archive", "item": "Old Scarf", "room": room, "date": "2021-04-05"},
+                {"name": "Archive", "item": "Open Scarf", "room": room, "date": "2021-04-05"}]
+        ids = [r['id'] for r in requests.post(f"{BASE_URL}/api/lost/bulk", json=rows).json()['results']]
+        requests.put(f"{BASE_URL}/api/item/lost/{ids[0]}")
+        time.sleep(1.1)  # ages are whole seconds
+        
+        r = requests.post(f"{BASE_URL}/api/archive", json={"older_than_days": 0})
+        log_test("Archive pass returns 200", r.status_code == 200)
+        log_test("Archive moves closed items", r.json()['moved']['lost'] >= 1)
+        hot = requests.get(f"{BASE_URL}/api/lost", params={"room": room}).json()['items']
+        log_test("Archived item leaves the hot list, open one stays", [i['id'] for i in hot] == [ids[1]])
+        both = requests.get(f"{BASE_URL}/api/lost", params={"room": room, "archive": 1}).json()['items']
+        log_test("archive=1 includes archived items", [i['id'] for i in both] == [ids[1], ids[0]])
+        mixed = requests.get(f"{BASE_URL}/api/items", params={"room": room, "archive": 1}).json()['items']
+        log_test("Mixed list includes archived items with archive=1", ids[0] in [i['id'] for i in mixed])
+        week = requests.get(f"{BASE_URL}/api/analytics?date_from=2021-04-05&date_to=2021-04-11&room={room}").json()
+        log_test("Analytics still count archived items",
+                 (week['weekly'][0]['reported'], week['weekly'][0]['recovered']) == (2, 1))
+        r = requests.post(f"{BASE_URL}/api/archive", json={"older_than_days": -1})
+        log_test("Archive rejects negative age", r.status_code == 400)
+    except Exception as e:
+        log_test("Archive", False, str(e))
+
+def test_metrics():
+    """Test 10f: Prometheus metrics"""
+    print("\n📈 TESTING METRICS...")
+    
+    try:
+        requests.get(f"{BASE_URL}/api/stats")
+        r = requests.get(f"{BASE_URL}/metrics")
+        text = r.text
+        log_test("Metrics returns 200", r.status_code == 200)
+        log_test("Metrics is Prometheus text", r.headers.get('Content-Type', '').startswith('text/plain'))
+        log_test("Metrics counts requests per route",
+                 'sbmp_http_requests_total{route="/api/stats",method="GET",status="200"}' in text)
+        log_test("Metrics has latency and DB time histograms",
+                 'sbmp_http_request_duration_seconds_bucket{route="/api/stats"' in text
+                 and 'sbmp_http_request_db_seconds_sum{route="/api/stats"' in text)
+        log_test("Metrics has response size, in-flight and pool",
+                 'sbmp_http_response_size_bytes_count' in text
+                 and 'sbmp_http_requests_in_flight 1' in text
+                 and 'sbmp_db_pool_open' in text)
+        post_db = [float(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                   if line.startswith('sbmp_http_request_db_seconds_sum{route="/api/lost",method="POST"')]
+        log_test("Metrics counts writer DB time for POSTs", bool(post_db) and post_db[0] > 0, str(post_db))
+    except Exception as e:
+        log_test("Metrics", False, str(e))
+
+def test_sql_stats():
+    """Test 10g: Per-statement SQL stats"""
+    print("\n🐢 TESTING SQL STATS...")
+    
+    try:
+        r = requests.get(f"{BASE_URL}/api/sql?order=count&limit=5")
+        data = r.json()
+        statements = data.get('statements', [])
+        log_test("SQL stats returns 200", r.status_code == 200)
+        log_test("SQL stats lists statements", 0 < len(statements) <= 5)
+        log_test("SQL stats sorted by count",
+                 [s['count'] for s in statements] == sorted((s['count'] for s in statements), reverse=True))
+        log_test("SQL stats has timings and rows",
+                 all({'total_ms', 'max_ms', 'rows', 'slow'} <= set(s) for s in statements))
+        r = requests.get(f"{BASE_URL}/api/sql?order=bogus")
+        log_test("SQL stats rejects bad order", r.status_code == 400)
+    except Exception as e:
+        log_test("SQL stats", False, str(e))
+
 def test_edge_cases():
     """Test 11: Edge cases"""
     print("\n⚡ TESTING EDGE CASES...")
@@ -404,11 +798,21 @@ def main():
     test_lost_item_submission()
     test_found_item_submission()
     test_data_retrieval()
+    test_pagination()
+    test_search()
     test_room_matching()
     test_item_management()
     test_error_handling()
     test_export()
     test_stress()
+    test_bulk_ingest()
+    test_batch_ops()
+    test_group_commit()
+    test_live_events()
+    test_analytics()
+    test_archive()
+    test_metrics()
+    test_sql_stats()
     test_edge_cases()
     
     # Print summary
@@ -0,0 +1,126 @@
+# ingest.py
+# SBMP College Lost and Found System
+# Bulk loading of lost/found reports (e.g. the porter's logbook)
+
+import json
+import sqlite3
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from repository import iso_day, INSERT_SQL
+
+BULK_BATCH = 500          # rows per transaction
+BULK_MAX_ROWS = 50000     # per request
+
+
+class TooManyRows(Exception):
+    """A JSON array body holds more rows than one request may load."""
+
+
+def row_date(data: dict, today: str) -> str:
+    """Logbook rows may carry their own YYYY-MM-DD date; default is today."""
+    return iso_day(data.get('date') or today)
+
+
+def text(data: dict, key: str, default: str = '') -> str:
+    """One report field as text; lists, objects and booleans are rejected."""
+    value = data.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"Invalid {key} (expected text)")
+    return str(value)
+
+
+def lost_values(data: dict, day: str) -> tuple:
+    """Validate one lost report; same rules as POST /api/lost."""
+    if not data.get('name') or not data.get('item'):
+        raise ValueError('Missing required fields')
+    return (text(data, 'name'), text(data, 'roll'), text(data, 'item'), text(data, 'room'),
+            text(data, 'category', 'Other'), day)
+
+
+def found_values(data: dict, day: str) -> tuple:
+    """Validate one found report; same rules as POST /api/found."""
+    if not data.get('item'):
+        raise ValueError('Item name is required')
+    return (text(data, 'finder'), text(data, 'item'), text(data, 'room'),
+            text(data, 'category', 'Other'), day)
+
+
+# kind -> (table, insert sql, validator, positions of item/category/room/date in values)
+BULK_KINDS = {
+    'lost': ('lost_items', INSERT_SQL['lost'], lost_values, (2, 4, 3, 5)),
+    'found': ('found_items', INSERT_SQL['found'], found_values, (1, 3, 2, 4)),
+}
+
+
+def ndjson_rows(lines: Iterable[bytes]) -> Iterator[object]:
+    """Decode one JSON object per line; undecodable lines become ValueErrors."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield ValueError('Invalid JSON')
+
+
+def bulk_insert(conn: sqlite3.Connection, kind: str, rows: Iterable[object], today: str,
+                engine=None, batch_size: int = BULK_BATCH,
+                max_rows: int = BULK_MAX_ROWS) -> Tuple[List[dict], int]:
+    """Validate and insert rows in batched executemany transactions.
+
+    ``rows`` may be a list or a lazy stream (NDJSON), so at most one batch
+    is held at a time. A list longer than ``max_rows`` raises TooManyRows
+    before anything is written; stream rows past it are reported as
+    failures. Returns (per-row results, inserted count).
+    """
+    if isinstance(rows, list) and len(rows) > max_rows:
+        raise TooManyRows(f'Too many rows (max {max_rows} per request)')
+    table, sql, validate, (i_item, i_cat, i_room, i_date) = BULK_KINDS[kind]
+    results: List[dict] = []
+    inserted = 0
+    numbered = enumerate(rows)
+
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            break
+        valid = []
+        for n, data in batch:
+            try:
+                if n >= max_rows:
+                    raise ValueError(f'Row limit exceeded (max {max_rows} per request)')
+                if isinstance(data, Exception):
+                    raise data
+                if not isinstance(data, dict):
+                    raise ValueError('Row must be a JSON object')
+                values = validate(data, row_date(data, today))
+            except ValueError as e:
+                results.append({'row': n, 'success': False, 'error': str(e)})
+                continue
+            valid.append((n, values))
+        if not valid:
+            continue
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name=?", (table,)).fetchone()
+            first = (seq[0] if seq else 0) + 1
+            conn.executemany(sql, [v for _, v in valid])
+            # AUTOINCREMENT under an exclusive write lock hands out consecutive ids
+            ids = range(first, first + len(valid))
+            if engine is not None:
+                for row_id, (_, v) in zip(ids, valid):
+                    engine.record(conn, kind, row_id, v[i_item], v[i_cat], v[i_room], v[i_date])
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            results.extend({'row': n, 'success': False, 'error': str(e)} for n, _ in valid)
+            continue
+        inserted += len(valid)
+        results.extend({'row': n, 'success': True, 'id': row_id}
+                       for row_id, (n, _) in zip(ids, valid))
+
+    results.sort(key=lambda r: r['row'])
+    return results, inserted
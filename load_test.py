@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+CONCURRENT LOAD TEST
+Mixed read/write workload with per-endpoint throughput and tail latency
+
+Against a running server:   python3 load_test.py --workers 16 --duration 30
+In-process (no server, CI): python3 load_test.py --in-process [--db data.db]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_URL = "http://127.0.0.1:5000"
+
+ROOMS = [str(r) for r in range(101, 121)] + ["Lab 1", "Lab 2", "Library", "Canteen"]
+CATEGORIES = ["Electronics", "Documents", "Accessories", "Clothing", "Bottle", "Other"]
+ITEMS = ["Black Wallet", "Blue Water Bottle", "Scientific Calculator", "ID Card", "USB Drive",
+         "Red Umbrella", "Lab Coat", "Headphones", "Phone Charger", "Notebook", "Spectacles"]
+SEARCH_TERMS = ["wallet", "bottle", "calc", "id card", "usb", "umbrella", "note", "phone"]
+
+
+# ==========================================
+# 🔌 TARGETS
+# ==========================================
+class HttpTarget:
+    """A live server, one keep-alive session per worker."""
+
+    def __init__(self, base_url: str):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method: str, path: str, json=None, headers=None) -> Tuple[int, int, Dict]:
+        r = self.session.request(method, self.base_url + path, json=json, headers=headers, timeout=30)
+        return r.status_code, len(r.content), r.headers
+
+
+class AppTarget:
+    """The Flask app in this process via its test client (no server needed)."""
+
+    def __init__(self, db_path: str):
+        os.environ['SBMP_DB'] = db_path
+        import app as webapp
+        self.client = webapp.app.test_client()
+
+    def request(self, method: str, path: str, json=None, headers=None) -> Tuple[int, int, Dict]:
+        r = self.client.open(path, method=method, json=json, headers=headers)
+        return r.status_code, len(r.get_data()), r.headers
+
+
+def make_target(spec: Tuple[str, str]):
+    kind, where = spec
+    return HttpTarget(where) if kind == 'http' else AppTarget(where)
+
+
+def prepare_app_db(db_path: str, seed_rows: int) -> None:
+    """Create the schema and, for an empty database, a small seed set."""
+    os.environ['SBMP_DB'] = db_path
+    import app as webapp
+    webapp.init_db()
+    client = webapp.app.test_client()
+    if client.get('/api/lost?limit=1').get_json()['items']:
+        return
+    rng = random.Random(0)
+    client.post('/api/lost/bulk', json=[report(rng, 'lost') for _ in range(seed_rows)])
+    client.post('/api/found/bulk', json=[report(rng, 'found') for _ in range(seed_rows)])
+
+
+# ==========================================
+# 🧪 WORKLOAD
+# ==========================================
+def report(rng: random.Random, kind: str) -> dict:
+    data = {"item": rng.choice(ITEMS), "room": rng.choice(ROOMS), "category": rng.choice(CATEGORIES)}
+    if kind == 'lost':
+        n = rng.randrange(100000)
+        data.update(name=f"Load Test {n}", roll=f"LT{n:05d}")
+    else:
+        data.update(finder="Load Test")
+    return data
+
+
+class Worker:
+    """Per-worker state: its own target, RNG and the dashboard's last ETag."""
+
+    def __init__(self, target, seed: int, max_id: int):
+        self.target = target
+        self.rng = random.Random(seed)
+        self.max_id = max(max_id, 1)
+        self.etag = None
+
+    def dashboard_poll(self):
+        headers = {'If-None-Match': self.etag} if self.etag else None
+        status, size, resp_headers = self.target.request('GET', '/api/stats', headers=headers)
+        self.etag = resp_headers.get('ETag', self.etag)
+        return status, size
+
+    def inventory(self):
+        return self.target.request('GET', '/api/items?limit=100')[:2]
+
+    def inventory_found(self):
+        return self.target.request('GET', '/api/found?status=Available&limit=50')[:2]
+
+    def search(self):
+        return self.target.request('GET', f"/api/search?q={self.rng.choice(SEARCH_TERMS)}")[:2]
+
+    def matches(self):
+        return self.target.request('GET', f"/api/matches/{self.rng.randint(1, self.max_id)}")[:2]
+
+    def report_lost(self):
+        return self.target.request('POST', '/api/lost', json=report(self.rng, 'lost'))[:2]
+
+    def report_found(self):
+        return self.target.request('POST', '/api/found', json=report(self.rng, 'found'))[:2]
+
+    def resolve(self):
+        kind = self.rng.choice(['lost', 'found'])
+        return self.target.request('PUT', f"/api/item/{kind}/{self.rng.randint(1, self.max_id)}")[:2]
+
+
+# (label, weight, is_write, Worker method)
+WORKLOAD: List[Tuple[str, int, bool, Callable]] = [
+    ('GET /api/stats', 40, False, Worker.dashboard_poll),
+    ('GET /api/items', 12, False, Worker.inventory),
+    ('GET /api/found', 5, False, Worker.inventory_found),
+    ('GET /api/search', 10, False, Worker.search),
+    ('GET /api/matches/<id>', 5, False, Worker.matches),
+    ('POST /api/lost', 9, True, Worker.report_lost),
+    ('POST /api/found', 8, True, Worker.report_found),
+    ('PUT /api/item/<type>/<id>', 6, True, Worker.resolve),
+]
+
+MIXES = {'mixed': (True, True), 'read': (True, False), 'write': (False, True)}
+
+
+def pick_ops(mix: str) -> Tuple[List, List[int]]:
+    reads, writes = MIXES[mix]
+    ops = [op for op in WORKLOAD if (writes if op[2] else reads)]
+    return ops, [op[1] for op in ops]
+
+
+def run_worker(spec: Tuple[str, str], seed: int, max_id: int, mix: str,
+               deadline: float, max_requests: int) -> List[Tuple[str, float, int, int]]:
+    """Fire requests until the deadline or request budget; return samples.
+
+    Each sample is (label, latency seconds, status, response bytes).
+    """
+    worker = Worker(make_target(spec), seed, max_id)
+    ops, weights = pick_ops(mix)
+    samples = []
+    while time.time() < deadline and len(samples) < max_requests:
+        label, _, _, op = worker.rng.choices(ops, weights)[0]
+        start = time.perf_counter()
+        try:
+            status, size = op(worker)
+        except Exception:
+            status, size = 0, 0
+        samples.append((label, time.perf_counter() - start, status, size))
+    return samples
+
+
+# ==========================================
+# 📈 REPORT
+# ==========================================
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples: List[Tuple[str, float, int, int]], elapsed: float) -> Dict[str, dict]:
+    """Per-endpoint and overall count, errors, req/s and latency percentiles (ms)."""
+    groups: Dict[str, List[Tuple[float, int]]] = {}
+    for label, latency, status, _ in samples:
+        groups.setdefault(label, []).append((latency, status))
+        groups.setdefault('ALL', []).append((latency, status))
+
+    summary = {}
+    for label, rows in groups.items():
+        latencies = sorted(latency for latency, _ in rows)
+        summary[label] = {
+            'count': len(rows),
+            'errors': sum(1 for _, status in rows if status == 0 or status >= 500),
+            'rps': len(rows) / elapsed if elapsed else 0.0,
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000,
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, dict], elapsed: float, workers: int, mode: str) -> None:
+    print("=" * 88)
+    print(f"📊 LOAD TEST - {workers} {mode} worker(s), {elapsed:.1f}s")
+    print("=" * 88)
+    print(f"{'endpoint':<28}{'count':>8}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for label in sorted(summary, key=lambda l: (l == 'ALL', l)):
+        s = summary[label]
+        print(f"{label:<28}{s['count']:>8}{s['errors']:>8}{s['rps']:>10.1f}"
+              f"{s['p50']:>9.1f}{s['p95']:>9.1f}{s['p99']:>9.1f}{s['max']:>9.1f}")
+
+
+# ==========================================
+# 🚀 DRIVER
+# ==========================================
+def newest_id(spec: Tuple[str, str]) -> int:
+    """Highest lost id, so resolves and match lookups hit real rows."""
+    target = make_target(spec)
+    if isinstance(target, AppTarget):
+        data = target.client.get('/api/lost?limit=1').get_json()
+    else:
+        data = target.session.get(f"{target.base_url}/api/lost?limit=1", timeout=10).json()
+    items = data.get('items') or []
+    return items[0]['id'] if items else 1
+
+
+def run(spec: Tuple[str, str], workers: int = 8, duration: float = 10.0, mode: str = 'thread',
+        mix: str = 'mixed', max_requests: int = 10 ** 9, seed: int = 1) -> Tuple[Dict[str, dict], float]:
+    """Run the workload with ``workers`` threads or processes; return (summary, elapsed)."""
+    max_id = newest_id(spec)
+    per_worker = max(max_requests // workers, 1)
+    start = time.time()
+    deadline = start + duration
+    args = [(spec, seed + n, max_id, mix, deadline, per_worker) for n in range(workers)]
+
+    if mode == 'process':
+        with multiprocessing.Pool(workers) as procs:
+            results = procs.starmap(run_worker, args)
+    else:
+        results = [None] * workers
+
+        def target(n):
+            results[n] = run_worker(*args[n])
+
+        threads = [threading.Thread(target=target, args=(n,)) for n in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    elapsed = time.time() - start
+    samples = [s for worker_samples in results for s in worker_samples]
+    return summarize(samples, elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Lost & Found API")
+    parser.add_argument('--url', default=DEFAULT_URL, help="server to test (default %(default)s)")
+    parser.add_argument('--in-process', action='store_true', help="use Flask's test client, no server")
+    parser.add_argument('--db', help="database for --in-process (default: seeded scratch file)")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds (default %(default)s)")
+    parser.add_argument('--requests', type=int, default=10 ** 9, help="stop after this many in total")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--seed-rows', type=int, default=500,
+                        help="rows per table put into an empty --in-process database")
+    args = parser.parse_args()
+
+    if args.in_process:
+        db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='sbmp_load_'), 'load.db')
+        prepare_app_db(db_path, args.seed_rows)
+        spec = ('app', db_path)
+    else:
+        spec = ('http', args.url)
+
+    try:
+        summary, elapsed = run(spec, args.workers, args.duration, args.mode, args.mix,
+                               args.requests, args.seed)
+    except Exception as e:
+        print(f"❌ Load test could not start: {e}")
+        sys.exit(1)
+    print_summary(summary, elapsed, args.workers, args.mode)
+    sys.exit(1 if summary.get('ALL', {}).get('errors') else 0)
+
+
+if __name__ == "__main__":
+    main()
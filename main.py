@@ -3,15 +3,28 @@
 # Made by: Aryan Yadav
 # Diploma Computer Science Project
 
+import time
+STARTED = time.perf_counter()  # startup clock; imports below count towards it
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 import sqlite3
-import csv
 import os
+import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Tuple, Optional
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import charts
+from batch import apply_ops
+from counters import data_version, ensure_counters, read_counters
+from db import ensure_indexes
+from dbworker import DbWorker
+from events import ensure_changes
+from export import csv_chunks
+from matching import ensure_matches, open_matches, report_found, report_lost, MatchEngine
+from migrations import migrate
+from repository import ensure_schema, items_page
+from rollups import ensure_rollups
+from search import ensure_search, search_items
 
 # ==========================================
 # 🎨 CONSTANTS & CONFIGURATION
@@ -35,44 +48,56 @@ BORDER_COLOR = "#333333"
 # 📊 DATABASE SETUP
 # ==========================================
 
-def setup_database() -> None:
+def setup_database(conn: sqlite3.Connection) -> None:
     """Initializes the SQLite database and creates necessary tables."""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        
-        # LOST ITEMS TABLE
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS lost_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_name TEXT NOT NULL,
-                roll_no TEXT NOT NULL,
-                item_name TEXT NOT NULL,
-                room_no TEXT,
-                date TEXT,
-                category TEXT DEFAULT 'Other',
-                status TEXT DEFAULT 'Pending'
-            )
-        """)
-        
-        # FOUND ITEMS TABLE
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS found_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                finder_name TEXT,
-                item_name TEXT NOT NULL,
-                room_no TEXT,
-                date TEXT,
-                category TEXT DEFAULT 'Other',
-                status TEXT DEFAULT 'Available'
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        ensure_schema(conn)
+        migrate(conn)
+        ensure_indexes(conn)
+        ensure_search(conn)
+        ensure_matches(conn)
+        ensure_counters(conn)
+        ensure_changes(conn)
+        ensure_rollups(conn)
     except sqlite3.Error as e:
         print(f"Database Error: {e}")
 
+# ==========================================
+# 📦 INVENTORY PAGING
+# ==========================================
+# The inventory never loads whole tables: it asks for one page at a time
+# (keyset on date/id, or an offset into the ranked search) and formats
+# only that page's rows, so opening it costs the same at any table size.
+INVENTORY_PAGE = 200      # rows fetched per page
+INVENTORY_PREFETCH = 50   # fetch the next page when the view is this close to the end
+FILTER_KINDS = {"All": "all", "Lost": "lost", "Found": "found"}
+
+@lru_cache(maxsize=4096)
+def friendly_date(iso: str) -> str:
+    """Low Fix #76: '2024-05-01' -> '01 May 2024'. Dates repeat a lot, so cached."""
+    try:
+        return datetime.strptime(iso, "%Y-%m-%d").strftime("%d %b %Y")
+    except (TypeError, ValueError):
+        return iso or "N/A"
+
+def inventory_line(r) -> str:
+    """Low Fix #80: one Listbox line per record, ID first."""
+    if r.type == "lost":
+        return f" #{r.id} | [Lost] {r.item} - {r.name} | {friendly_date(r.date)}"
+    return f" #{r.id} | [Found] {r.item} - by {r.finder} | {friendly_date(r.date)}"
+
+def inventory_page(conn: sqlite3.Connection, text: str, kind: str,
+                   cursor: Optional[str]) -> Tuple[list, Optional[str]]:
+    """(records, next cursor) for one inventory page; cursor None = first page."""
+    if text:
+        # Same ranked FTS search as /api/search, paged by offset
+        offset = int(cursor or 0)
+        rows = search_items(conn, text, kind, limit=INVENTORY_PAGE + 1, offset=offset)
+        more = len(rows) > INVENTORY_PAGE
+        return rows[:INVENTORY_PAGE], (str(offset + INVENTORY_PAGE) if more else None)
+    # Same newest-first stream of both tables as /api/items
+    return items_page(conn, kind, "newest", {}, INVENTORY_PAGE, cursor or "")
+
 # ==========================================
 # 🖥️ MAIN APPLICATION
 # ==========================================
@@ -84,8 +109,6 @@ class LostFoundApp:
         self.root.title("SBMP | Assets & Recovery System")
         self.root.geometry(WINDOW_SIZE)
         self.root.configure(bg=BG_DARK)
-        
-        setup_database()
 
         # Handle Window Close (Low Fix #102)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -114,21 +137,47 @@ class LostFoundApp:
         self.status_bar = tk.Label(self.root, text="System Ready", bd=1, relief="sunken", anchor="w", bg=BG_CARD, fg=TEXT_GRAY, font=("Arial", 9))
         self.status_bar.pack(side="bottom", fill="x")
 
+        # All SQLite work runs on one background thread with its own
+        # connection, so a slow query or a locked file never freezes the window
+        self.db = DbWorker(self.root, DB_NAME, on_busy=self.show_busy, on_error=self.show_db_error)
+        self.db.submit(setup_database, cancellable=False)
+        self.engine = MatchEngine()   # fuzzy matches for new reports; used on the db thread
+
         # Main Content
         self.content = tk.Frame(self.root, bg=BG_DARK)
         self.content.pack(side="left", fill="both", expand=True, padx=25, pady=25)
         
+        self.chart = None         # analytics figure, built on the first visit
+        self.startup_ms = None
         self.show_dashboard()
+        self.root.after_idle(self.startup_done)
+
+    def startup_done(self) -> None:
+        """First idle moment after the window is built: record the cold start."""
+        self.startup_ms = (time.perf_counter() - STARTED) * 1000
+        if "--startup-time" in sys.argv:
+            # python main.py --startup-time prints the figure and exits
+            print(f"Startup: {self.startup_ms:.0f} ms")
+            self.db.close(); self.root.destroy()
 
     def on_closing(self):
         """LOW FIX #102: Confirmation on closing."""
         if messagebox.askokcancel("Quit", "Do you want to quit the application?"):
+            self.db.close()
             self.root.destroy()
 
     def update_status(self, msg: str):
         """Updates the status bar message."""
         self.status_bar.config(text=f" Status: {msg}")
 
+    def show_busy(self, pending: int) -> None:
+        """Loading indicator: busy cursor and status text while DB jobs run."""
+        self.root.config(cursor="watch" if pending else "")
+        self.update_status(f"Loading... ({pending} pending)" if pending else "System Ready")
+
+    def show_db_error(self, e: Exception) -> None:
+        messagebox.showerror("Database Error", str(e))
+
     def add_nav_btn(self, parent: tk.Frame, text: str, command: callable, tooltip: str = "") -> None:
         """Helper to create menu buttons with hover effects."""
         btn = tk.Button(parent, text=text, font=("Arial", 11, "bold"), bg=BG_CARD, fg=TEXT_WHITE,
@@ -140,8 +189,12 @@ class LostFoundApp:
     
     def clear_ui(self) -> None:
         """Clears the main content area for new page load."""
+        self.db.cancel_stale()  # reads for the old page are no longer wanted
         for widget in self.content.winfo_children():
-            widget.destroy()
+            if self.chart is not None and widget is self.chart.widget:
+                widget.pack_forget()  # kept for the next Analytics visit
+            else:
+                widget.destroy()
 
     # ==========================================
     # PAGE: DASHBOARD
@@ -153,13 +206,8 @@ class LostFoundApp:
         stats_frame = tk.Frame(self.content, bg=BG_DARK)
         stats_frame.pack(fill="x")
         
-        conn = sqlite3.connect(DB_NAME)
-        lost_c = conn.execute("SELECT COUNT(*) FROM lost_items WHERE status='Pending'").fetchone()[0]
-        found_c = conn.execute("SELECT COUNT(*) FROM found_items WHERE status='Available'").fetchone()[0]
-        conn.close()
-        
-        self.draw_card(stats_frame, "ACTIVE LOSSES", lost_c, ACCENT_RED)
-        self.draw_card(stats_frame, "ITEMS RECOVERED", found_c, ACCENT_GREEN)
+        lost_v = self.draw_card(stats_frame, "ACTIVE LOSSES", "...", ACCENT_RED)
+        found_v = self.draw_card(stats_frame, "ITEMS RECOVERED", "...", ACCENT_GREEN)
         self.draw_card(stats_frame, "STATUS", "STABLE", ACCENT_BLUE)
 
         # Room Match Logic
@@ -170,26 +218,28 @@ class LostFoundApp:
         
         lb = tk.Listbox(list_f, bg=BG_CARD, fg=TEXT_WHITE, font=("Arial", 11), bd=0, highlightthickness=0)
         lb.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        conn = sqlite3.connect(DB_NAME)
-        matches = conn.execute("""
-            SELECT l.student_name, l.item_name, l.room_no 
-            FROM lost_items l JOIN found_items f ON l.room_no = f.room_no 
-            WHERE l.status='Pending' AND f.status='Available' AND l.room_no != ''
-        """).fetchall()
-        conn.close()
-        
-        if not matches:
-            lb.insert(tk.END, " No potential room overlaps found.")
-        else:
-            for m in matches:
-                lb.insert(tk.END, f" 🔔 {m[0]} lost '{m[1]}' - Item match in Room {m[2]}")
+        lb.insert(tk.END, " Loading...")
 
-    def draw_card(self, parent: tk.Frame, title: str, val: any, color: str) -> None:
+        def fill(result):
+            counters, matches = result
+            lost_v.config(text=str(counters['lost_open']))
+            found_v.config(text=str(counters['found_open']))
+            lb.delete(0, tk.END)
+            if not matches:
+                lb.insert(tk.END, " No potential room overlaps found.")
+            else:
+                for m in matches:
+                    lb.insert(tk.END, f" 🔔 {m['name']} lost '{m['item']}' - {m['candidates']} item match(es) in Room {m['room']}")
+
+        self.db.submit(lambda conn: (read_counters(conn), open_matches(conn)), done=fill)
+
+    def draw_card(self, parent: tk.Frame, title: str, val: any, color: str) -> tk.Label:
         c = tk.Frame(parent, bg=BG_CARD, padx=30, pady=25, bd=1, relief="solid", highlightbackground=BORDER_COLOR)
         c.pack(side="left", expand=True, fill="both", padx=10)
         tk.Label(c, text=title, font=("Arial", 10, "bold"), bg=BG_CARD, fg=TEXT_GRAY).pack()
-        tk.Label(c, text=str(val), font=("Arial", 28, "bold"), bg=BG_CARD, fg=color).pack(pady=5)
+        value = tk.Label(c, text=str(val), font=("Arial", 28, "bold"), bg=BG_CARD, fg=color)
+        value.pack(pady=5)
+        return value
 
     # ==========================================
     # PAGE: ADD LOST / FOUND
@@ -224,11 +274,14 @@ class LostFoundApp:
             messagebox.showerror("Error", "Required fields (*) are missing!")
             return
         
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute("INSERT INTO lost_items (student_name, roll_no, item_name, room_no, date, category) VALUES (?,?,?,?,?,?)",
-                    (n, r, i, rm, datetime.now().strftime("%Y-%m-%d"), cat))
-        conn.commit(); conn.close()
-        messagebox.showinfo("Success", "Incident Logged."); self.show_dashboard()
+        today = datetime.now().strftime("%Y-%m-%d")
+        def save(conn):
+            report_lost(conn, self.engine, n, r, i, rm, cat, today); conn.commit()
+        self.db.submit(save, done=lambda _: self.saved("Success", "Incident Logged."), cancellable=False)
+
+    def saved(self, title: str, msg: str) -> None:
+        """A write finished: confirm it and show the updated dashboard."""
+        messagebox.showinfo(title, msg); self.show_dashboard()
 
     def show_add_found(self) -> None:
         self.clear_ui()
@@ -250,11 +303,10 @@ class LostFoundApp:
     def save_found(self) -> None:
         n, i, rm, cat = self.f_name.get(), self.f_item.get(), self.f_room.get(), self.f_cat.get()
         if not i: messagebox.showerror("Error", "Item name is needed."); return
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute("INSERT INTO found_items (finder_name, item_name, room_no, date, category) VALUES (?,?,?,?,?)",
-                    (n, i, rm, datetime.now().strftime("%Y-%m-%d"), cat))
-        conn.commit(); conn.close()
-        messagebox.showinfo("Logged", "Record Added."); self.show_dashboard()
+        today = datetime.now().strftime("%Y-%m-%d")
+        def save(conn):
+            report_found(conn, self.engine, n, i, rm, cat, today); conn.commit()
+        self.db.submit(save, done=lambda _: self.saved("Logged", "Record Added."), cancellable=False)
 
     # ==========================================
     # PAGE: INVENTORY & EDIT
@@ -281,66 +333,93 @@ class LostFoundApp:
         f = tk.Frame(self.content, bg=BG_CARD)
         f.pack(fill="both", expand=True)
         
-        self.lb = tk.Listbox(f, bg=BG_INPUT, fg=TEXT_WHITE, font=("Arial", 11), bd=0, selectbackground=ACCENT_BLUE)
+        # Rows arrive a page at a time as the list scrolls towards its end
+        self.inv_more = self.inv_pending = False
+        self.lb_scroll = tk.Scrollbar(f, orient="vertical")
+        self.lb_scroll.pack(side="right", fill="y")
+        # Shift/Ctrl-click to pick several rows, then Enter to manage them together
+        self.lb = tk.Listbox(f, bg=BG_INPUT, fg=TEXT_WHITE, font=("Arial", 11), bd=0,
+                             selectbackground=ACCENT_BLUE, selectmode=tk.EXTENDED,
+                             yscrollcommand=self.on_inventory_scroll)
         self.lb.pack(fill="both", expand=True, padx=5, pady=5)
+        self.lb_scroll.config(command=self.lb.yview)
         self.lb.bind("<Double-Button-1>", self.open_manager)
+        self.lb.bind("<Return>", self.open_manager)
         
         self.refresh_list()
 
     def refresh_list(self) -> None:
+        """Start the inventory over from its first page."""
+        self.db.cancel_stale()  # a page still loading belongs to the old query
         self.lb.delete(0, tk.END)
         self.lb_map = {}
-        q = f"%{self.search_in.get()}%"
-        flt = self.filter_val.get()
-        conn = sqlite3.connect(DB_NAME)
-        
-        total_items = 0
-        
-        if flt in ["All", "Lost"]:
-            lost = conn.execute("SELECT * FROM lost_items WHERE item_name LIKE ? OR student_name LIKE ?", (q, q)).fetchall()
-            for r in lost:
-                # Low Fix #76 & #80: Formatting Date and showing ID
-                date_obj = datetime.strptime(r[5], "%Y-%m-%d")
-                friendly_date = date_obj.strftime("%d %b %Y")
-                self.lb.insert(tk.END, f" #{r[0]} | [Lost] {r[3]} - {r[1]} | {friendly_date}")
-                self.lb_map[self.lb.size()-1] = ("lost", r[0])
-                self.lb.itemconfig(tk.END, fg=ACCENT_RED) # Low Fix #81: Visual distinction
-                total_items += 1
-        
-        if flt in ["All", "Found"]:
-            found = conn.execute("SELECT * FROM found_items WHERE item_name LIKE ?", (q,)).fetchall()
-            for r in found:
-                date_obj = datetime.strptime(r[4], "%Y-%m-%d")
-                friendly_date = date_obj.strftime("%d %b %Y")
-                self.lb.insert(tk.END, f" #{r[0]} | [Found] {r[2]} - by {r[1]} | {friendly_date}")
-                self.lb_map[self.lb.size()-1] = ("found", r[0])
-                self.lb.itemconfig(tk.END, fg=ACCENT_GREEN) # Low Fix #81: Visual distinction
-                total_items += 1
-        conn.close()
-        self.count_label.config(text=f"Total: {total_items} items")
+        self.inv_query = (self.search_in.get().strip(), FILTER_KINDS.get(self.filter_val.get(), "all"))
+        self.inv_cursor = None
+        self.inv_more = True
+        self.inv_pending = False
+        self.count_label.config(text="Loading...")
+        self.load_more_items()
+
+    def load_more_items(self) -> None:
+        """Fetch the next page on the DB thread; add_items appends it."""
+        if not self.inv_more:
+            return
+        self.inv_pending = True
+        text, kind = self.inv_query
+        cursor = self.inv_cursor
+        self.db.submit(lambda conn: inventory_page(conn, text, kind, cursor), done=self.add_items)
+
+    def add_items(self, page) -> None:
+        """Append one fetched page to the Listbox."""
+        rows, self.inv_cursor = page
+        self.inv_more = self.inv_cursor is not None
+        self.inv_pending = False
+        
+        start = self.lb.size()
+        self.lb.insert(tk.END, *[inventory_line(r) for r in rows])
+        for i, r in enumerate(rows, start):
+            self.lb_map[i] = (r.type, r.id)
+            self.lb.itemconfig(i, fg=ACCENT_RED if r.type == "lost" else ACCENT_GREEN) # Low Fix #81
+        # Low Fix #77: Count Label
+        self.count_label.config(text=f"Showing: {self.lb.size()}{'+' if self.inv_more else ''} items")
+
+    def on_inventory_scroll(self, first: str, last: str) -> None:
+        """Keep the scrollbar in step and load ahead near the end of the list."""
+        self.lb_scroll.set(first, last)
+        if self.inv_more and not self.inv_pending:
+            size = self.lb.size()
+            if float(last) * size >= size - INVENTORY_PREFETCH:
+                self.load_more_items()
 
     def open_manager(self, event) -> None:
-        idx = self.lb.curselection()
-        if not idx or idx[0] not in self.lb_map: return
-        tab, rid = self.lb_map[idx[0]]
+        picked = [self.lb_map[i] for i in self.lb.curselection() if i in self.lb_map]
+        if not picked: return
         
         pop = tk.Toplevel(self.root)
-        pop.title("Edit Record")
+        pop.title("Edit Record" if len(picked) == 1 else f"Edit {len(picked)} Records")
         pop.geometry("400x300"); pop.configure(bg=BG_CARD)
         
-        tk.Label(pop, text="MODIFY RECORD", font=("Arial", 12, "bold"), bg=BG_CARD, fg=ACCENT_BLUE).pack(pady=20)
+        tk.Label(pop, text="MODIFY RECORD" if len(picked) == 1 else f"MODIFY {len(picked)} RECORDS",
+                 font=("Arial", 12, "bold"), bg=BG_CARD, fg=ACCENT_BLUE).pack(pady=20)
+        
+        def apply(action):
+            # Same single-transaction path as POST /api/items/batch
+            ops = [(tab, rid, action) for tab, rid in picked]
+            def run(conn):
+                conn.execute("BEGIN IMMEDIATE")
+                apply_ops(conn, ops)
+                conn.commit()
+            pop.destroy()
+            # Writes are never cancelled, so the inventory may be gone by the time it lands
+            self.db.submit(run, done=lambda _: self.lb.winfo_exists() and self.refresh_list(),
+                           cancellable=False)
         
         def resolve():
-            conn = sqlite3.connect(DB_NAME)
-            st = "Resolved" if tab == "lost" else "Claimed"
-            conn.execute(f"UPDATE {tab}_items SET status=? WHERE id=?", (st, rid))
-            conn.commit(); conn.close(); pop.destroy(); self.refresh_list()
+            apply("resolve")
             
         def delete():
-            if messagebox.askyesno("Delete", "Delete record forever?"):
-                conn = sqlite3.connect(DB_NAME)
-                conn.execute(f"DELETE FROM {tab}_items WHERE id=?", (rid,))
-                conn.commit(); conn.close(); pop.destroy(); self.refresh_list()
+            if messagebox.askyesno("Delete", f"Delete {len(picked)} record(s) forever?"):
+                apply("delete")
 
         tk.Button(pop, text="✅ Resolve / Mark Claimed", bg=ACCENT_GREEN, width=25, command=resolve).pack(pady=10)
         tk.Button(pop, text="🗑️ Delete Permanently", bg=ACCENT_RED, width=25, command=delete).pack(pady=10)
@@ -351,36 +430,44 @@ class LostFoundApp:
     def show_analytics(self) -> None:
         self.clear_ui()
         tk.Label(self.content, text="CAMPUS ANALYTICS", font=("Arial", 20, "bold"), bg=BG_DARK, fg=TEXT_WHITE).pack(pady=10, anchor="w")
-        
-        conn = sqlite3.connect(DB_NAME)
-        data = conn.execute("SELECT category, COUNT(*) FROM lost_items GROUP BY category").fetchall()
-        conn.close()
-        
+        if self.chart is not None and self.chart.version is not None:
+            # Show the last drawing at once; it is redrawn below only if the data moved on
+            self.chart.widget.pack(pady=20)
+        shown = self.chart.version if self.chart is not None else None
+
+        def load(conn):
+            version = data_version(conn)
+            return version, (None if version == shown else charts.category_counts(conn))
+
+        self.db.submit(load, done=self.draw_analytics)
+
+    def draw_analytics(self, result: Tuple[str, Optional[List[Tuple[str, int]]]]) -> None:
+        version, data = result
+        if data is None:
+            return  # cached chart is current
         if not data:
+            if self.chart is not None:
+                self.chart.widget.pack_forget()
             tk.Label(self.content, text="No analytical data found.", bg=BG_DARK, fg=TEXT_GRAY).pack(pady=100)
             return
 
-        cats = [x[0] for x in data]; cnts = [x[1] for x in data]
-        plt.style.use('dark_background')
-        fig, ax = plt.subplots(figsize=(6, 5))
-        fig.patch.set_facecolor(BG_DARK)
-        ax.pie(cnts, labels=cats, autopct='%1.1f%%', colors=[ACCENT_BLUE, ACCENT_GREEN, ACCENT_RED, ACCENT_PURPLE, "orange"])
-        ax.set_title("Lost Items by Category", color=TEXT_WHITE)
-        
-        canv = FigureCanvasTkAgg(fig, master=self.content)
-        canv.draw(); canv.get_tk_widget().pack(pady=20)
+        if self.chart is None:
+            self.chart = charts.CategoryChart(self.content, BG_DARK, TEXT_WHITE,
+                                              [ACCENT_BLUE, ACCENT_GREEN, ACCENT_RED, ACCENT_PURPLE, "orange"])
+        self.chart.draw(data, version)
+        self.chart.widget.pack(pady=20)
 
     def export_data(self) -> None:
         path = filedialog.asksaveasfilename(defaultextension=".csv")
         if not path: return
-        conn = sqlite3.connect(DB_NAME)
-        data = conn.execute("SELECT * FROM lost_items").fetchall()
-        with open(path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["ID", "Name", "Roll", "Item", "Room", "Date", "Category", "Status"])
-            writer.writerows(data)
-        conn.close()
-        messagebox.showinfo("Success", "Backup generated.")
+        def export(conn):
+            # Same batched stream as the web export; never holds the table in memory
+            with open(path, "wb") as f:
+                for chunk in csv_chunks(conn, ["lost"]):
+                    f.write(chunk)
+        # Not cancellable: leaving the page must not abort a half-written file
+        self.db.submit(export, done=lambda _: messagebox.showinfo("Success", "Backup generated."),
+                       cancellable=False)
 
     # ==========================================
     # LOW FIXES: INFO PAGES
@@ -400,6 +487,10 @@ class LostFoundApp:
             "- Data Analytics & Visualization\n"
             "- CSV Export Module"
         )
+        if self.startup_ms is not None:
+            info += f"\n\nStartup time: {self.startup_ms:.0f} ms"
+        if charts.LOAD_SECONDS is not None:
+            info += f"\nChart engine load: {charts.LOAD_SECONDS * 1000:.0f} ms"
         tk.Label(self.content, text=info, font=("Arial", 12), bg=BG_DARK, fg=TEXT_WHITE, justify="left").pack(pady=20, anchor="w")
 
     def show_help(self) -> None:
@@ -0,0 +1,465 @@
+# matching.py
+# SBMP College Lost and Found System
+# Lost/found match suggestions
+
+import heapq
+import math
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
+from counters import bump_version, read_counters, version_tag
+from repository import insert_found, insert_lost
+
+# ==========================================
+# 🔗 MATCH TABLES
+# ==========================================
+# Same-room candidates are not stored pair by pair: a busy room with N
+# open lost and M open found items would need N x M rows, all rewritten
+# on every report or resolve there. match_rooms keeps the number of open
+# lost and found items per (room, category) instead, and triggers add or
+# subtract one on insert, resolve/claim, room or category edits and
+# delete. matches only holds the fuzzy engine's pairs, at most k per
+# reported item. Dashboards read both in O(open matches) instead of
+# re-running the room join.
+MATCH_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS matches (
+        lost_id INTEGER NOT NULL,
+        found_id INTEGER NOT NULL,
+        score REAL NOT NULL DEFAULT 1.0,
+        created_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+        PRIMARY KEY (lost_id, found_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_matches_found ON matches(found_id)",
+    """
+    CREATE TABLE IF NOT EXISTS match_rooms (
+        room TEXT NOT NULL,
+        category TEXT NOT NULL,
+        lost INTEGER NOT NULL DEFAULT 0,
+        found INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (room, category)
+    ) WITHOUT ROWID
+    """,
+)
+
+# Score weights shared by the room counts and the fuzzy engine below. A
+# room candidate only knows room and category, so it scores the same as
+# an engine match whose name and date terms are zero.
+NAME_WEIGHT = 0.55
+CATEGORY_WEIGHT = 0.20
+ROOM_WEIGHT = 0.15
+DATE_WEIGHT = 0.10
+
+OPEN_STATUS = {'lost': 'Pending', 'found': 'Available'}
+
+
+def _count(kind: str, row: str) -> str:
+    """Count ``row`` in match_rooms when it is open and has a room."""
+    return (f"INSERT INTO match_rooms (room, category, {kind}) "
+            f"SELECT {row}.room_no, coalesce({row}.category, ''), 1 "
+            f"WHERE {row}.status = '{OPEN_STATUS[kind]}' AND {row}.room_no != '' "
+            f"ON CONFLICT (room, category) DO UPDATE SET {kind} = {kind} + 1;")
+
+
+def _uncount(kind: str, row: str) -> str:
+    key = f"room = {row}.room_no AND category = coalesce({row}.category, '')"
+    return (f"UPDATE match_rooms SET {kind} = {kind} - 1 "
+            f"WHERE {key} AND {row}.status = '{OPEN_STATUS[kind]}'; "
+            f"DELETE FROM match_rooms WHERE {key} AND lost <= 0 AND found <= 0;")
+
+
+def _triggers() -> Dict[str, str]:
+    triggers = {}
+    for kind in OPEN_STATUS:
+        table = f"{kind}_items"
+        triggers[f'matches_{kind}_ai'] = f"""
+            CREATE TRIGGER matches_{kind}_ai AFTER INSERT ON {table} BEGIN
+                {_count(kind, 'new')}
+            END
+        """
+        # Fuzzy scores depend on room and category, so an edit drops them too
+        triggers[f'matches_{kind}_au'] = f"""
+            CREATE TRIGGER matches_{kind}_au AFTER UPDATE OF status, room_no, category ON {table}
+            WHEN old.status IS NOT new.status OR old.room_no IS NOT new.room_no
+              OR old.category IS NOT new.category BEGIN
+                {_uncount(kind, 'old')}
+                {_count(kind, 'new')}
+                DELETE FROM matches WHERE {kind}_id = old.id;
+            END
+        """
+        triggers[f'matches_{kind}_ad'] = f"""
+            CREATE TRIGGER matches_{kind}_ad AFTER DELETE ON {table} BEGIN
+                {_uncount(kind, 'old')}
+                DELETE FROM matches WHERE {kind}_id = old.id;
+            END
+        """
+    return triggers
+
+
+MATCH_TRIGGERS = _triggers()
+
+
+def ensure_matches(conn: sqlite3.Connection) -> None:
+    """Create the match tables and triggers, counting existing rooms once."""
+    missing = {name for name in ('matches', 'match_rooms') if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is None}
+    for sql in MATCH_SCHEMA:
+        conn.execute(sql)
+    # Triggers are recreated every start so changes reach old databases
+    for name, sql in MATCH_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    if missing == {'match_rooms'}:
+        # Databases from before match_rooms stored every same-room pair,
+        # scored exactly like this; the fuzzy pairs stay
+        conn.execute(f"DELETE FROM matches WHERE score IN ({ROOM_WEIGHT}, {ROOM_WEIGHT} + {CATEGORY_WEIGHT})")
+    if missing:
+        count_rooms(conn)
+    conn.commit()
+
+
+def count_rooms(conn: sqlite3.Connection) -> int:
+    """Recount match_rooms from the open items; returns its row count."""
+    conn.execute("DELETE FROM match_rooms")
+    for kind, status in OPEN_STATUS.items():
+        conn.execute(f"""
+            INSERT INTO match_rooms (room, category, {kind})
+            SELECT room_no, coalesce(category, ''), COUNT(*) FROM {kind}_items
+            WHERE status = ? AND room_no != '' GROUP BY 1, 2 ORDER BY 1, 2
+            ON CONFLICT (room, category) DO UPDATE SET {kind} = excluded.{kind}
+        """, (status,))
+    return conn.execute("SELECT COUNT(*) FROM match_rooms").fetchone()[0]
+
+
+def rebuild_matches(conn: sqlite3.Connection) -> int:
+    """Drop every fuzzy pair and recount the rooms; returns the room rows."""
+    conn.execute("DELETE FROM matches")
+    return count_rooms(conn)
+
+
+# Open lost items that have a same-room candidate or a stored fuzzy pair
+OPEN_MATCHES_SQL = """
+    SELECT l.id, l.student_name, l.item_name, l.room_no, coalesce(l.category, '')
+    FROM (SELECT room FROM match_rooms GROUP BY room HAVING SUM(found) > 0) r
+    JOIN lost_items l ON l.room_no = r.room AND l.status = 'Pending'
+    UNION
+    SELECT l.id, l.student_name, l.item_name, l.room_no, coalesce(l.category, '')
+    FROM lost_items l WHERE l.id IN (SELECT lost_id FROM matches)
+"""
+
+
+def open_matches(conn: sqlite3.Connection) -> List[dict]:
+    """Lost items with at least one candidate, each listed once, best first.
+
+    candidates is the open found items in the same room plus the fuzzy
+    pairs from other rooms, so no found item is counted twice.
+    """
+    rooms: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for room, category, found in conn.execute("SELECT room, category, found FROM match_rooms WHERE found > 0"):
+        rooms[room][category] = found
+    fuzzy: Dict[int, List[Tuple[float, str]]] = defaultdict(list)
+    # CROSS JOIN keeps the small matches table outermost whatever the statistics say
+    for lost_id, score, room in conn.execute("""
+            SELECT m.lost_id, m.score, f.room_no FROM matches m CROSS JOIN found_items f
+            ON f.id = m.found_id"""):
+        fuzzy[lost_id].append((score, room))
+
+    results = []
+    for lost_id, name, item, room, category in conn.execute(OPEN_MATCHES_SQL):
+        in_room = rooms.get(room, {}) if room else {}
+        candidates = sum(in_room.values())
+        best = 0.0
+        if candidates:
+            best = ROOM_WEIGHT + (CATEGORY_WEIGHT if category and category in in_room else 0)
+        for score, found_room in fuzzy.get(lost_id, ()):
+            # A pair in the lost item's own room is already in the room count
+            candidates += not (room and found_room == room)
+            best = max(best, score)
+        if candidates:
+            results.append({'lost_id': lost_id, 'name': name, 'item': item, 'room': room,
+                            'candidates': candidates, 'score': round(best, 4)})
+    results.sort(key=lambda m: (-m['score'], -m['lost_id']))
+    return results
+
+
+# ==========================================
+# 🧠 FUZZY MATCHING ENGINE
+# ==========================================
+# "Blue notebook" in 101 should meet "notebook (blue)" in 102. Each side's
+# open items are kept in an in-memory inverted index over normalized name
+# tokens; a lookup only touches postings of the query's own tokens.
+MATCH_TOP_K = 10
+MAX_TOP_K = 100
+MIN_SCORE = 0.35            # below this a candidate is noise
+DATE_WINDOW_DAYS = 30       # date proximity decays to zero over this gap
+COMMON_POSTINGS = 2000      # tokens this frequent only seed same-room items
+ROOM_SEEDS = 200            # ...and at most this many of them, newest first
+
+WORD = re.compile(r'[^\W_]+', re.UNICODE)
+STOPWORDS = frozenset({'a', 'an', 'the', 'my', 'of', 'with', 'and', 'in', 'on',
+                       'for', 'to', 'at', 'from', 'by', 'colour', 'color'})
+
+# (tokens, category, room, day ordinal)
+Entry = Tuple[Tuple[str, ...], str, str, int]
+
+
+def normalize(text: str) -> Tuple[str, ...]:
+    """Lower-case word tokens with stopwords and simple plurals removed."""
+    tokens = []
+    for word in WORD.findall((text or '').lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        if word not in tokens:
+            tokens.append(word)
+    return tuple(tokens)
+
+
+def day_number(value: Optional[str]) -> int:
+    """Date string (YYYY-MM-DD) to a day ordinal; 0 when unknown."""
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+class TokenIndex:
+    """Inverted index over the names of one side's open items."""
+
+    def __init__(self):
+        self.entries: Dict[int, Entry] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        # Per-room postings keep insertion (id) order so the newest come cheaply
+        self.room_postings: Dict[Tuple[str, str], Dict[int, None]] = defaultdict(dict)
+        self.max_id = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, item_id: int, name: str, category: str, room: str, day: str) -> None:
+        self.discard(item_id)
+        tokens = normalize(name)
+        room = room or ''
+        self.entries[item_id] = (tokens, category or '', room, day_number(day))
+        for t in tokens:
+            self.postings[t].add(item_id)
+            if room:
+                self.room_postings[(t, room)][item_id] = None
+        self.max_id = max(self.max_id, item_id)
+
+    def discard(self, item_id: int) -> None:
+        entry = self.entries.pop(item_id, None)
+        if entry is None:
+            return
+        tokens, _, room, _ = entry
+        for t in tokens:
+            self.postings[t].discard(item_id)
+            if not self.postings[t]:
+                del self.postings[t]
+            if room:
+                self.room_postings[(t, room)].pop(item_id, None)
+                if not self.room_postings[(t, room)]:
+                    del self.room_postings[(t, room)]
+
+    def top(self, name: str, category: str, room: str, day: str,
+            k: int = MATCH_TOP_K) -> List[Tuple[float, int]]:
+        """Best ``k`` (score, item_id) pairs for an item from the other side."""
+        tokens = normalize(name)
+        if not tokens or not self.entries:
+            return []
+        n = len(self.entries)
+        weights = {t: math.log(1 + n / (1 + len(self.postings.get(t, ())))) for t in tokens}
+        total = sum(weights.values())
+        room = room or ''
+
+        # Rarest tokens first so common words mostly boost existing candidates
+        acc: Dict[int, float] = {}
+        for t in sorted(tokens, key=lambda t: len(self.postings.get(t, ()))):
+            posts = self.postings.get(t)
+            if not posts:
+                continue
+            w = weights[t]
+            if len(posts) <= COMMON_POSTINGS:
+                for i in posts:
+                    acc[i] = acc.get(i, 0.0) + w
+            else:
+                seeds = self.room_postings.get((t, room), {})
+                for i in islice(reversed(seeds), ROOM_SEEDS):
+                    acc.setdefault(i, 0.0)
+                for i in acc:
+                    if i in posts:
+                        acc[i] += w
+
+        category = category or ''
+        target = day_number(day)
+        scored = []
+        for i, shared in acc.items():
+            _, c_cat, c_room, c_day = self.entries[i]
+            score = NAME_WEIGHT * shared / total
+            if category and c_cat == category:
+                score += CATEGORY_WEIGHT
+            if room and c_room == room:
+                score += ROOM_WEIGHT
+            if target and c_day:
+                score += DATE_WEIGHT * max(0.0, 1 - abs(target - c_day) / DATE_WINDOW_DAYS)
+            if score >= MIN_SCORE:
+                scored.append((round(score, 4), i))
+        return heapq.nlargest(k, scored)
+
+
+class MatchEngine:
+    """Open lost and found items indexed for matching in both directions.
+
+    The index lives in process memory. sync() cheaply catches up with rows
+    written elsewhere (e.g. by the other client): nothing is read unless
+    the data version moved; then new ids are pulled by rowid range, and a
+    side whose size differs from its trigger-kept open counter is
+    reloaded in full.
+    """
+
+    SIDES = {
+        'lost': ("lost_items", "Pending"),
+        'found': ("found_items", "Available"),
+    }
+
+    def __init__(self):
+        self.lost = TokenIndex()
+        self.found = TokenIndex()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None   # data version the indexes reflect
+
+    def _index(self, kind: str) -> TokenIndex:
+        return self.lost if kind == 'lost' else self.found
+
+    def sync(self, conn: sqlite3.Connection) -> None:
+        """Bring both indexes up to date with the database."""
+        counters = read_counters(conn)
+        version = version_tag(counters)
+        with self._lock:
+            if version == self._version:
+                return
+            for kind, (table, status) in self.SIDES.items():
+                index = self._index(kind)
+                for r in conn.execute(f"""
+                        SELECT id, item_name, category, room_no, date FROM {table}
+                        WHERE id > ? AND status = ?""", (index.max_id, status)):
+                    index.add(*r)
+                if counters[f'{kind}_open'] != len(index):
+                    self._reload(conn, kind)
+            self._version = version
+
+    def _reload(self, conn: sqlite3.Connection, kind: str) -> None:
+        table, status = self.SIDES[kind]
+        index = TokenIndex()
+        for r in conn.execute(f"""
+                SELECT id, item_name, category, room_no, date FROM {table}
+                WHERE status = ? ORDER BY id""", (status,)):
+            index.add(*r)
+        if kind == 'lost':
+            self.lost = index
+        else:
+            self.found = index
+
+    def forget(self, kind: str, item_id: int) -> None:
+        """Drop an item that was resolved, claimed or deleted."""
+        with self._lock:
+            self._index(kind).discard(item_id)
+            self._version = None
+
+    def candidates(self, kind: str, name: str, category: str, room: str, day: str,
+                   k: int = MATCH_TOP_K) -> List[Tuple[float, int]]:
+        """Top matches on the opposite side for an item of type ``kind``."""
+        with self._lock:
+            other = self.found if kind == 'lost' else self.lost
+            return other.top(name, category, room, day, k)
+
+    def record(self, conn: sqlite3.Connection, kind: str, item_id: int, name: str,
+               category: str, room: str, day: str, k: int = MATCH_TOP_K) -> int:
+        """Index a newly reported open item and store its fuzzy matches.
+
+        Runs inside the caller's transaction; returns the pairs written.
+        """
+        with self._lock:
+            self._index(kind).add(item_id, name, category, room, day)
+            self._version = None    # recheck the counters in case this rolls back
+        top = self.candidates(kind, name, category, room, day, k)
+        if kind == 'lost':
+            pairs = [(item_id, other, score) for score, other in top]
+        else:
+            pairs = [(other, item_id, score) for score, other in top]
+        upsert_pairs(conn, pairs)
+        return len(pairs)
+
+
+def report_lost(conn: sqlite3.Connection, engine: MatchEngine, name: str, roll: str, item: str,
+                room: str, category: str, day: str) -> int:
+    """Add a lost report and store its fuzzy matches; returns its id.
+
+    The one insert path for single reports from either client.
+    """
+    engine.sync(conn)
+    item_id = insert_lost(conn, name, roll, item, room, category, day)
+    engine.record(conn, 'lost', item_id, item, category, room, day)
+    return item_id
+
+
+def report_found(conn: sqlite3.Connection, engine: MatchEngine, finder: str, item: str,
+                 room: str, category: str, day: str) -> int:
+    """Log a found item and store its fuzzy matches; returns its id."""
+    engine.sync(conn)
+    item_id = insert_found(conn, finder, item, room, category, day)
+    engine.record(conn, 'found', item_id, item, category, room, day)
+    return item_id
+
+
+def upsert_pairs(conn: sqlite3.Connection, pairs: List[Tuple[int, int, float]]) -> None:
+    """Store (lost_id, found_id, score) pairs, keeping the higher score."""
+    conn.executemany("""
+        INSERT INTO matches (lost_id, found_id, score) VALUES (?, ?, ?)
+        ON CONFLICT (lost_id, found_id) DO UPDATE SET score = MAX(score, excluded.score)
+    """, pairs)
+
+
+def rematch_all(conn: sqlite3.Connection, engine: MatchEngine, k: int = MATCH_TOP_K) -> dict:
+    """Recount the rooms and recompute every lost item's fuzzy top-k."""
+    start = time.perf_counter()
+    engine.sync(conn)
+    lost = conn.execute(
+        "SELECT id, item_name, category, room_no, date FROM lost_items WHERE status = 'Pending'").fetchall()
+    rooms = rebuild_matches(conn)
+    pairs = []
+    for lost_id, name, category, room, day in lost:
+        pairs.extend((lost_id, other, score)
+                     for score, other in engine.candidates('lost', name, category, room, day, k))
+    upsert_pairs(conn, pairs)
+    bump_version(conn)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    return {
+        'lost_items': len(lost),
+        'rooms': rooms,
+        'fuzzy_pairs': len(pairs),
+        'seconds': round(elapsed, 3),
+    }
+
+
+if __name__ == "__main__":
+    # Bulk rematch: python3 matching.py [database]
+    from counters import ensure_counters
+    from db import connect
+    target = sys.argv[1] if len(sys.argv) > 1 else "college_data.db"
+    conn = connect(target)
+    ensure_matches(conn)
+    ensure_counters(conn)
+    result = rematch_all(conn, MatchEngine())
+    conn.close()
+    print(f"🔗 Rematched {result['lost_items']} open lost items in {result['seconds']}s")
+    print(f"   {result['rooms']} room/category counts, {result['fuzzy_pairs']} fuzzy pairs")
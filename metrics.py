@@ -0,0 +1,164 @@
+# metrics.py
+# SBMP College Lost and Found System
+# Request metrics in Prometheus text format
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# Upper bounds; an implicit +Inf bucket follows the last one
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# pool.stats() key -> (metric type, help); the rest are not exported
+POOL_METRICS = {
+    'size': ('gauge', 'Maximum pooled connections'),
+    'open': ('gauge', 'Open pooled connections'),
+    'idle': ('gauge', 'Idle pooled connections'),
+    'in_use': ('gauge', 'Borrowed pooled connections'),
+    'acquired': ('counter', 'Connections handed out'),
+    'connects': ('counter', 'Connections opened'),
+    'waits': ('counter', 'Acquires that had to wait'),
+    'timeouts': ('counter', 'Acquires that timed out'),
+}
+
+# writer.stats() key -> (metric type, help)
+WRITER_METRICS = {
+    'queue_depth': ('gauge', 'Writes waiting for the writer thread'),
+    'max_queue_depth': ('gauge', 'Deepest the write queue has been'),
+    'writes': ('counter', 'Writes committed or failed by the writer'),
+    'failed': ('counter', 'Writes that raised or whose commit failed'),
+    'rejected': ('counter', 'Writes turned away because the queue was full'),
+    'expired': ('counter', 'Writes withdrawn because they did not start in time'),
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram; per-bucket counts, made cumulative on render."""
+
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        out, total = [], 0
+        sep = ',' if labels else ''
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            total += count
+            out.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {total}')
+        tail = f'{{{labels}}}' if labels else ''
+        out.append(f'{name}_sum{tail} {self.sum}')
+        out.append(f'{name}_count{tail} {total}')
+        return out
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Per-route request counters and histograms.
+
+    The hot path is a handful of dict lookups and list increments under one
+    lock; all formatting happens when /metrics is scraped.
+    """
+
+    def __init__(self, prefix: str = 'sbmp'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], Histogram] = {}
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, route: str, method: str, status: int, seconds: float, db_seconds: float) -> None:
+        """Record one completed request."""
+        key = (route, method)
+        with self._lock:
+            self.requests[(route, method, status)] = self.requests.get((route, method, status), 0) + 1
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.db_latency[key] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+            self.db_latency[key].observe(db_seconds)
+
+    def observe_size(self, route: str, method: str, size: int) -> None:
+        """Record a response body size (called at stream end for streamed bodies)."""
+        key = (route, method)
+        with self._lock:
+            hist = self.sizes.get(key)
+            if hist is None:
+                hist = self.sizes[key] = Histogram(SIZE_BUCKETS)
+            hist.observe(size)
+
+    def render(self, pool_stats: Dict[str, float] = None, writer=None) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        p = self.prefix
+        out = []
+        with self._lock:
+            out += [f'# HELP {p}_http_requests_in_flight Requests currently being served',
+                    f'# TYPE {p}_http_requests_in_flight gauge',
+                    f'{p}_http_requests_in_flight {self.in_flight}']
+
+            out += [f'# HELP {p}_http_requests_total Completed requests',
+                    f'# TYPE {p}_http_requests_total counter']
+            for (route, method, status), n in sorted(self.requests.items()):
+                out.append(f'{p}_http_requests_total{{route="{_label(route)}",method="{method}",'
+                           f'status="{status}"}} {n}')
+
+            for name, help_text, table in (
+                    ('http_request_duration_seconds', 'Total time to build the response', self.latency),
+                    ('http_request_db_seconds', 'Time spent inside SQLite per request', self.db_latency),
+                    ('http_response_size_bytes', 'Response body size', self.sizes)):
+                out += [f'# HELP {p}_{name} {help_text}', f'# TYPE {p}_{name} histogram']
+                for (route, method), hist in sorted(table.items()):
+                    out += hist.lines(f'{p}_{name}', f'route="{_label(route)}",method="{method}"')
+
+        for key, value in (pool_stats or {}).items():
+            if key in POOL_METRICS:
+                kind, help_text = POOL_METRICS[key]
+                name = f'{p}_db_pool_{key}_total' if kind == 'counter' else f'{p}_db_pool_{key}'
+                out += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+        if pool_stats and 'wait_time_ms' in pool_stats:
+            name = f'{p}_db_pool_wait_seconds_total'
+            out += [f'# HELP {name} Time spent waiting for a connection', f'# TYPE {name} counter',
+                    f'{name} {pool_stats["wait_time_ms"] / 1000}']
+
+        if writer is not None:
+            for key, value in writer.stats().items():
+                if key in WRITER_METRICS:
+                    kind, help_text = WRITER_METRICS[key]
+                    name = f'{p}_writer_{key}_total' if kind == 'counter' else f'{p}_writer_{key}'
+                    out += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+            name = f'{p}_writer_batch_size'
+            out += [f'# HELP {name} Writes per group commit', f'# TYPE {name} histogram']
+            out += writer.batch_sizes.lines(name, '')
+        return '\n'.join(out) + '\n'
+
+
+def counting(chunks: Iterable[bytes], done) -> Iterable[bytes]:
+    """Pass a streamed body through, calling done(total bytes) at the end."""
+    total = 0
+    try:
+        for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+    finally:
+        done(total)
@@ -0,0 +1,136 @@
+# migrations.py
+# SBMP College Lost and Found System
+# Versioned schema migrations run at startup by both clients
+
+import sqlite3
+import time
+from typing import List
+from repository import KINDS
+
+# ==========================================
+# 🧬 SCHEMA VERSION
+# ==========================================
+# repository.SCHEMA is version 0; every later change to the item tables
+# is a numbered step below. Both init_db() and setup_database() call
+# migrate() right after ensure_schema(), so whichever client starts first
+# upgrades the file. A step is only recorded once it has finished and is
+# written to be safe to re-run, so an interrupted upgrade resumes on the
+# next start.
+VERSION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at INTEGER NOT NULL
+    )
+"""
+
+BACKFILL_BATCH = 5000   # rows per backfill transaction
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Highest migration applied to this database (0 = none)."""
+    conn.execute(VERSION_SCHEMA)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def backfill(conn: sqlite3.Connection, table: str, assign: str, where: str,
+             batch: int = BACKFILL_BATCH) -> int:
+    """UPDATE table SET assign WHERE where, one id range per transaction.
+
+    Each batch commits on its own, so the other client only ever waits
+    for one short batch instead of the whole table. Returns rows changed.
+    """
+    last = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    changed = 0
+    for start in range(0, last, batch):
+        changed += conn.execute(f"UPDATE {table} SET {assign} WHERE id > ? AND id <= ? AND {where}",
+                                (start, start + batch)).rowcount
+        conn.commit()
+    return changed
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: str) -> None:
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    for column in columns.split(', '):
+        name = column.split()[0]
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+    conn.commit()
+
+
+# ==========================================
+# 🪜 MIGRATION STEPS
+# ==========================================
+def add_item_timestamps(conn: sqlite3.Connection) -> None:
+    """1: created_at / resolved_at as integer Unix epochs.
+
+    created_at of existing rows is local midnight of their date; nothing
+    recorded when closed items were closed, so their resolved_at stays NULL.
+    The indexes come from db.INDEXES, built after the backfill.
+    """
+    for cls in KINDS.values():
+        _add_columns(conn, cls.TABLE, "created_at INTEGER, resolved_at INTEGER")
+        backfill(conn, cls.TABLE, "created_at = CAST(strftime('%s', date, 'utc') AS INTEGER)",
+                 "created_at IS NULL")
+
+
+def add_archive_tables(conn: sqlite3.Connection) -> None:
+    """2: lost_archive / found_archive, where archive.py moves closed items.
+
+    Same columns as the item tables plus archived_at. Rows keep their
+    original id, so there is no AUTOINCREMENT here.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lost_archive (
+            id INTEGER PRIMARY KEY,
+            student_name TEXT NOT NULL,
+            roll_no TEXT NOT NULL,
+            item_name TEXT NOT NULL,
+            room_no TEXT,
+            category TEXT,
+            date TEXT,
+            status TEXT,
+            created_at INTEGER,
+            resolved_at INTEGER,
+            archived_at INTEGER NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS found_archive (
+            id INTEGER PRIMARY KEY,
+            finder_name TEXT,
+            item_name TEXT NOT NULL,
+            room_no TEXT,
+            category TEXT,
+            date TEXT,
+            status TEXT,
+            created_at INTEGER,
+            resolved_at INTEGER,
+            archived_at INTEGER NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+# (version, name, step) in the order they apply
+MIGRATIONS = (
+    (1, 'item timestamps', add_item_timestamps),
+    (2, 'archive tables', add_archive_tables),
+)
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """Apply every pending migration in order; returns the versions applied."""
+    current = schema_version(conn)
+    conn.commit()
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        step(conn)
+        # OR IGNORE: the other client may have finished the same step meanwhile
+        conn.execute("INSERT OR IGNORE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                     (version, name, int(time.time())))
+        conn.commit()
+        applied.append(version)
+    return applied
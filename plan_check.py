@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+QUERY PLAN CHECK
+Runs EXPLAIN QUERY PLAN on every statement the app issues and fails
+if any of them falls back to a full table scan.
+
+Usage:
+    python3 plan_check.py                 # scratch database
+    python3 plan_check.py college_data.db # explain against a real dataset
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import charts
+
+# Statements are captured by driving the Flask API through its test
+# client against a scratch database, then explained against the target
+# database given on the command line (or the scratch one).
+PROBES = [
+    ('GET', '/api/stats', None),
+    ('POST', '/api/lost', {'name': 'Plan Check', 'roll': 'PC001', 'item': 'Blue Notebook',
+                           'room': '101', 'category': 'Documents'}),
+    ('POST', '/api/found', {'finder': 'Plan Check', 'item': 'Notebook', 'room': '101',
+                            'category': 'Documents'}),
+    ('POST', '/api/lost/bulk', [{'name': 'Bulk', 'item': 'Red Pen', 'room': '101', 'date': '2024-05-01'}]),
+    ('POST', '/api/found/bulk', [{'item': 'Pen', 'room': '101'}]),
+    ('GET', '/api/matches/1', None),
+    ('PUT', '/api/item/lost/1', None),
+    ('PUT', '/api/item/found/1', None),
+    ('DELETE', '/api/item/lost/1', None),
+    ('DELETE', '/api/item/found/1', None),
+    ('POST', '/api/items/batch', {'ops': [{'type': 'lost', 'id': 2, 'action': 'resolve'},
+                                          {'type': 'found', 'id': 2, 'action': 'delete'}]}),
+    ('POST', '/api/items/batch', {'filter': {'type': 'found', 'status': 'Available', 'category': 'Bottle',
+                                             'older_than_days': 90}, 'action': 'delete'}),
+    ('POST', '/api/items/batch', {'filter': {'type': 'lost', 'room': '101'}, 'action': 'resolve'}),
+    ('GET', '/api/lost', None),
+    ('GET', '/api/lost?after=100&limit=20', None),
+    ('GET', '/api/lost?status=Pending&room=101', None),
+    ('GET', '/api/lost?category=Documents&after=100', None),
+    ('GET', '/api/lost?date_from=2024-01-01&date_to=2024-12-31', None),
+    ('GET', '/api/found?status=Available&after=100', None),
+    ('GET', '/api/found?room=101', None),
+    ('GET', '/api/lost?archive=1&status=Resolved&after=100', None),
+    ('GET', '/api/items', None),
+    ('GET', '/api/items?cursor=lost:100:2024-05-01&limit=20', None),
+    ('GET', '/api/items?status=Pending&cursor=found:100:2024-05-01', None),
+    ('GET', '/api/items?type=found&room=101&sort=oldest', None),
+    ('GET', '/api/items?type=lost&category=Documents&date_from=2024-01-01', None),
+    ('GET', '/api/items?archive=1&cursor=lost:100:2024-05-01', None),
+    ('GET', '/api/items?type=lost&created_from=1700000000', None),
+    ('GET', '/api/found?resolved_from=1700000000&resolved_to=1800000000', None),
+    ('GET', '/api/items?q=notebook&type=found&cursor=25', None),
+    ('GET', '/api/search?q=blue+note', None),
+    ('GET', '/api/search?q=notebook&type=lost&status=Pending&offset=25', None),
+    ('GET', '/api/search?q=101&type=found', None),
+]
+
+# Routes that read whole tables on purpose; their statements may scan.
+FULL_READ_PROBES = [
+    ('GET', '/api/lost?all=1', None),
+    ('GET', '/api/found?all=1', None),
+    ('GET', '/api/analytics', None),
+    ('GET', '/api/analytics?type=all&category=Keys&room=101&date_from=2024-01-01', None),
+    ('GET', '/api/export', None),
+    ('GET', '/api/export?table=lost&status=Pending&date_from=2024-01-01&gzip=1', None),
+    ('GET', '/api/export?archive=1', None),
+    ('GET', '/api/archive', None),
+    ('POST', '/api/archive', {'older_than_days': 0}),
+]
+
+# Statements issued by the Tkinter client (main.py) that the API does not share.
+DESKTOP_QUERIES = [
+    # (sql, params, full_read)
+    (charts.CATEGORY_SQL, (), False),
+]
+
+# Tables that only ever hold open, derived rows; reading them whole is the point.
+BOUNDED_TABLES = {'matches', 'match_rooms', 'counters', 'sqlite_sequence'}
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+# A full pass over a table, in rowid order or along one of its indexes
+TABLE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$')
+SUBQUERY = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\w+)')
+# FROM/JOIN table followed by a (lower-case) alias, which plans show instead
+ALIAS = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)\s+(?:AS\s+)?([a-z_]\w*)\b')
+
+
+def capture_statements(db_path):
+    """Drive the API and return (statements, full_read_statements)."""
+    os.environ['SBMP_DB'] = db_path
+    import app as webapp
+    from db import ConnectionPool
+    from writer import WriteQueue
+
+    # One connection so every statement (writer thread included) flows
+    # through the traced handle
+    webapp.pool = ConnectionPool(db_path, size=1)
+    webapp.writer = WriteQueue(webapp.pool)
+    webapp.feed.pool = webapp.pool
+    webapp.archiver.pool = webapp.pool
+    webapp.init_db()
+
+    seen = []
+    conn = webapp.pool.acquire()
+    conn.set_trace_callback(seen.append)
+    webapp.pool.release(conn)
+
+    client = webapp.app.test_client()
+
+    def run(probes):
+        seen.clear()
+        for method, url, body in probes:
+            # Read the body so streamed responses actually run their queries
+            client.open(url, method=method, json=body).get_data()
+        return {s.strip() for s in seen if s.strip().upper().startswith(EXPLAINABLE)}
+
+    # Seed first so PUT/DELETE probes hit real rows
+    run(PROBES[1:3])
+    webapp.feed.subscribe(0)
+    normal = run(PROBES)
+    # The live-update poller runs in the background; drive one round here
+    seen.clear()
+    webapp.feed.poll()
+    normal |= {s.strip() for s in seen if s.strip().upper().startswith(EXPLAINABLE)}
+    full_read = run(FULL_READ_PROBES) - normal
+    conn.set_trace_callback(None)
+    return normal, full_read
+
+
+def explain(conn, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def full_scans(sql, plan):
+    """Table names the plan reads end to end, directly or through an index.
+
+    A plain rowid-ordered scan that stops at a LIMIT (no temp sort) only
+    reads one page, so it does not count; an index walk with a LIMIT
+    still may pass every entry its WHERE rejects, so it does.
+    """
+    limited = ' LIMIT ' in sql.upper() and not any('TEMP B-TREE' in line for line in plan)
+    # Scanning an already-materialized subquery result is not a table read
+    skip = BOUNDED_TABLES | {m.group(1) for m in (SUBQUERY.match(line) for line in plan) if m}
+    aliases = dict((alias, table) for table, alias in ALIAS.findall(sql))
+    scans = [(aliases.get(m.group(1), m.group(1)), m.group(2))
+             for m in (TABLE_SCAN.match(line) for line in plan) if m]
+    return [table for table, index in scans
+            if table not in skip and not (limited and not index)]
+
+
+def main():
+    target = sys.argv[1] if len(sys.argv) > 1 else None
+    print("=" * 70)
+    print("🔬 QUERY PLAN CHECK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scratch = os.path.join(tmp, 'plan_check.db')
+        normal, full_read = capture_statements(scratch)
+
+        conn = sqlite3.connect(target or scratch)
+        checks = [(sql, (), False) for sql in sorted(normal)]
+        checks += [(sql, (), True) for sql in sorted(full_read)]
+        checks += DESKTOP_QUERIES
+
+        failures = []
+        for sql, params, allow_scan in checks:
+            plan = explain(conn, sql, params)
+            scans = full_scans(sql, plan)
+            one_line = ' '.join(sql.split())
+            if scans and not allow_scan:
+                failures.append(one_line)
+                print(f"❌ FULL SCAN ({', '.join(scans)}): {one_line}")
+            else:
+                tag = "⚪ FULL READ" if scans else "✅ OK"
+                print(f"{tag}: {one_line}")
+            for line in plan:
+                print(f"      {line}")
+        conn.close()
+
+    print("=" * 70)
+    print(f"Statements checked: {len(checks)}")
+    if failures:
+        print(f"❌ {len(failures)} statement(s) fall back to a full table scan")
+        return False
+    print("🎉 No unexpected full table scans")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
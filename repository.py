@@ -0,0 +1,347 @@
+# repository.py
+# SBMP College Lost and Found System
+# Shared schema, row objects and item queries for the web and desktop apps
+
+import sqlite3
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, Tuple
+
+# ==========================================
+# 🗄️ CANONICAL SCHEMA
+# ==========================================
+# The one definition of the item tables. Databases created by older
+# desktop builds have date and category swapped on disk; every query
+# below names its columns, so either layout reads the same.
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS lost_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_name TEXT NOT NULL,
+        roll_no TEXT NOT NULL,
+        item_name TEXT NOT NULL,
+        room_no TEXT,
+        category TEXT DEFAULT 'Other',
+        date TEXT,
+        status TEXT DEFAULT 'Pending'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS found_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        finder_name TEXT,
+        item_name TEXT NOT NULL,
+        room_no TEXT,
+        category TEXT DEFAULT 'Other',
+        date TEXT,
+        status TEXT DEFAULT 'Available'
+    )
+    """,
+)
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Create the item tables if they do not exist yet."""
+    for sql in SCHEMA:
+        conn.execute(sql)
+    conn.commit()
+
+
+# ==========================================
+# 📦 ROW SHAPES
+# ==========================================
+# Each table is read through one column list (FIELDS are the columns a
+# user can see or change; triggers that mirror items watch only those)
+# and comes back in one of two shapes built from it: a LostItem/FoundItem record (attributes,
+# __slots__, used by the desktop app) or the dict the web API sends.
+# The API dicts are built straight from the row tuple, which measured
+# cheaper than serializing record objects through a json default hook.
+class LostItem:
+    """One lost_items row."""
+
+    __slots__ = ('id', 'name', 'roll', 'item', 'room', 'category', 'date', 'status', 'score')
+    type = 'lost'
+    TABLE = 'lost_items'
+    ARCHIVE = 'lost_archive'
+    FIELDS = "student_name, roll_no, item_name, room_no, category, date, status"
+    COLUMNS = "id, " + FIELDS
+
+    def __init__(self, row: tuple, score: Optional[float] = None):
+        self.id, self.name, self.roll, self.item, self.room, self.category, self.date, self.status = row
+        self.score = score
+
+
+class FoundItem:
+    """One found_items row."""
+
+    __slots__ = ('id', 'finder', 'item', 'room', 'category', 'date', 'status', 'score')
+    type = 'found'
+    TABLE = 'found_items'
+    ARCHIVE = 'found_archive'
+    FIELDS = "finder_name, item_name, room_no, category, date, status"
+    COLUMNS = "id, " + FIELDS
+
+    def __init__(self, row: tuple, score: Optional[float] = None):
+        self.id, self.finder, self.item, self.room, self.category, self.date, self.status = row
+        self.score = score
+
+
+def lost_json(r: tuple) -> dict:
+    return {'type': 'lost', 'id': r[0], 'name': r[1], 'roll': r[2], 'item': r[3],
+            'room': r[4], 'category': r[5], 'date': r[6], 'status': r[7]}
+
+
+def found_json(r: tuple) -> dict:
+    return {'type': 'found', 'id': r[0], 'finder': r[1], 'item': r[2],
+            'room': r[3], 'category': r[4], 'date': r[5], 'status': r[6]}
+
+
+KINDS = {'lost': LostItem, 'found': FoundItem}
+# kind -> (record builder, API dict builder, plain row), all fed a row in
+# COLUMNS order. as_json=ROWS hands back the tuples untouched for the
+# columnar API format, which sends the JSON_KEYS once instead of per row.
+ROWS = 2
+SHAPES = {'lost': (LostItem, lost_json, tuple), 'found': (FoundItem, found_json, tuple)}
+JSON_KEYS = {'lost': ('id', 'name', 'roll', 'item', 'room', 'category', 'date', 'status'),
+             'found': ('id', 'finder', 'item', 'room', 'category', 'date', 'status')}
+
+
+# Closed items move to the ARCHIVE table of their kind (see archive.py),
+# keeping their id. Inside a DELETE trigger this is true for a row that is
+# being archived rather than deleted, so mirrors of the data keep it.
+ARCHIVED = {kind: f"EXISTS (SELECT 1 FROM {cls.ARCHIVE} WHERE id = old.id)" for kind, cls in KINDS.items()}
+
+
+def tables(kind: str, archive: bool = False) -> Tuple[str, ...]:
+    """The table of one kind, followed by its archive when asked for."""
+    cls = KINDS[kind]
+    return (cls.TABLE, cls.ARCHIVE) if archive else (cls.TABLE,)
+
+
+def iso_day(value: object, field: str = 'date') -> str:
+    """A strict YYYY-MM-DD string; raises ValueError for anything else.
+
+    Item dates are compared as text, so forms fromisoformat() also takes
+    (20240102, 2024-W01-1) would filter and sort wrongly.
+    """
+    try:
+        day = date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        day = None
+    if day != value:
+        raise ValueError(f'Invalid {field} (expected YYYY-MM-DD)')
+    return day
+
+
+def fetch(conn: sqlite3.Connection, make, sql: str, params=()) -> list:
+    """All rows of one query, each passed through ``make``."""
+    return [make(r) for r in conn.execute(sql, params).fetchall()]
+
+
+# ==========================================
+# 🔎 QUERIES
+# ==========================================
+# SQL text is built once per query shape and reused, so every call hits
+# sqlite3's per-connection prepared-statement cache instead of compiling.
+FILTERS = (('status', 'status = ?'), ('category', 'category = ?'), ('room', 'room_no = ?'),
+           ('date_from', 'date >= ?'), ('date_to', 'date <= ?'),
+           # Unix epoch seconds, served by the created_at/resolved_at indexes
+           ('created_from', 'created_at >= ?'), ('created_to', 'created_at <= ?'),
+           ('resolved_from', 'resolved_at >= ?'), ('resolved_to', 'resolved_at <= ?'))
+
+
+EPOCH_FILTERS = frozenset({'created_from', 'created_to', 'resolved_from', 'resolved_to'})
+
+
+def item_filters(args: Mapping) -> Tuple[Tuple[str, ...], list]:
+    """(names of the filters set, their values) for the FILTERS args.
+
+    Raises ValueError when an epoch filter is not an integer.
+    """
+    names, params = [], []
+    for name, _ in FILTERS:
+        if args.get(name):
+            names.append(name)
+            params.append(int(args[name]) if name in EPOCH_FILTERS else args[name])
+    return tuple(names), params
+
+
+# An epoch filter names its index outright; otherwise the planner walks
+# the index that matches the ORDER BY and tests every row's created_at.
+# resolved_at is NULL for open items, so it wins when both are given.
+# The archive tables have no epoch indexes and are left to the planner.
+EPOCH_INDEXES = (('resolved_from', 'resolved'), ('resolved_to', 'resolved'),
+                 ('created_from', 'created'), ('created_to', 'created'))
+
+
+def _source(kind: str, table: str, names: Tuple[str, ...]) -> str:
+    """``table`` as a FROM term, pinned to an epoch index when one is filtered on."""
+    if table == KINDS[kind].TABLE:
+        for name, index in EPOCH_INDEXES:
+            if name in names:
+                return f"{table} INDEXED BY idx_{kind}_{index}"
+    return table
+
+
+def _where(names: Tuple[str, ...], extra: Tuple[str, ...] = ()) -> str:
+    clauses = [sql for name, sql in FILTERS if name in names] + list(extra)
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+@lru_cache(maxsize=None)
+def _page_sql(kind: str, names: Tuple[str, ...], after: bool, archive: bool = False) -> str:
+    cls = KINDS[kind]
+    where = _where(names, ("id < ?",) if after else ())
+    parts = [f"SELECT {cls.COLUMNS} FROM {_source(kind, table, names)} {where} ORDER BY id DESC LIMIT ?"
+             for table in tables(kind, archive)]
+    if len(parts) == 1:
+        return parts[0]
+    # Archived rows keep their ids, so the two pages merge on id alone
+    return " UNION ALL ".join(f"SELECT * FROM ({p})" for p in parts) + " ORDER BY id DESC LIMIT ?"
+
+
+def list_all(conn: sqlite3.Connection, kind: str, as_json: int = False, archive: bool = False) -> list:
+    """Every row of one table (and its archive), newest first."""
+    cls = KINDS[kind]
+    selects = [f"SELECT {cls.COLUMNS} FROM {table}" for table in tables(kind, archive)]
+    return fetch(conn, SHAPES[kind][as_json], " UNION ALL ".join(selects) + " ORDER BY id DESC")
+
+
+def list_page(conn: sqlite3.Connection, kind: str, args: Mapping, limit: int,
+              after: Optional[int] = None, as_json: int = False,
+              archive: bool = False) -> Tuple[list, Optional[int]]:
+    """Keyset page of one table, newest first: (rows, next cursor id)."""
+    names, params = item_filters(args)
+    if after is not None:
+        params.append(after)
+    # Fetch one extra row to learn whether another page exists
+    params = (params + [limit + 1]) * len(tables(kind, archive)) + ([limit + 1] if archive else [])
+    rows = conn.execute(_page_sql(kind, names, after is not None, archive), params).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    make = SHAPES[kind][as_json]
+    return [make(r) for r in rows], (rows[-1][0] if has_more else None)
+
+
+# Both tables in one date-ordered stream; lost rows come first on ties.
+# Each table (archives included) is a LIMITed walk of its date (or
+# status, date) index and SQLite merges them, so a page never reads more
+# than limit + 1 rows per table whatever the table sizes.
+MIXED_SELECTS = {
+    'lost': f"SELECT 'lost' AS type, {LostItem.COLUMNS}, NULL AS finder_name FROM {{table}}",
+    'found': "SELECT 'found' AS type, id, NULL, NULL, item_name, room_no, category, date, status, finder_name "
+             "FROM {table}",
+}
+ITEM_SORTS = {'newest': ('DESC', '<'), 'oldest': ('ASC', '>')}
+# Keys of a mixed row, which is also what items_page() returns as ROWS
+MIXED_KEYS = ('type', 'id', 'name', 'roll', 'item', 'room', 'category', 'date', 'status', 'finder')
+
+
+@lru_cache(maxsize=None)
+def _items_sql(kinds: Tuple[str, ...], sort: str, names: Tuple[str, ...], after_kind: Optional[str],
+               archive: bool = False) -> str:
+    direction, op = ITEM_SORTS[sort]
+    parts = []
+    for kind in kinds:
+        # The first page reads a date range too, as later pages do through
+        # the cursor; rows without a date never sort into a keyset page
+        extra = ("date IS NOT NULL",)
+        if after_kind is not None:
+            # Rows tied with the cursor on (date, id) still follow it when
+            # this type sorts after the cursor's type
+            tie = '=' if kind == 'found' and after_kind == 'lost' else ''
+            extra = (f"(date, id) {op}{tie} (?, ?)",)
+        for table in tables(kind, archive):
+            parts.append(f"SELECT * FROM ({MIXED_SELECTS[kind].format(table=_source(kind, table, names))} {_where(names, extra)} "
+                         f"ORDER BY date {direction}, id {direction} LIMIT ?)")
+    return " UNION ALL ".join(parts) + f" ORDER BY date {direction}, id {direction}, type DESC LIMIT ?"
+
+
+def items_page(conn: sqlite3.Connection, kind: str, sort: str, args: Mapping, limit: int,
+               cursor: str = '', as_json: int = False, archive: bool = False) -> Tuple[list, Optional[str]]:
+    """One page of lost and/or found rows ordered by (date, id).
+
+    cursor is the "type:id:date" of the last row of the previous page;
+    raises ValueError when it is malformed.
+    """
+    after = None
+    if cursor:
+        after_kind, after_id, after_date = cursor.split(':', 2)
+        if after_kind not in KINDS:
+            raise ValueError(f"Bad cursor: {cursor}")
+        after = (after_kind, int(after_id), after_date)
+
+    kinds = tuple(k for k in KINDS if kind in ('all', k))
+    names, filter_params = item_filters(args)
+    params = []
+    for k in kinds:
+        for _ in tables(k, archive):
+            params += filter_params
+            if after is not None:
+                params += [after[2], after[1]]
+            params.append(limit + 1)
+    sql = _items_sql(kinds, sort, names, after[0] if after else None, archive)
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    make_lost, make_found = SHAPES['lost'][as_json], SHAPES['found'][as_json]
+    # (type, id, name, roll, item, room, category, date, status, finder)
+    if as_json == ROWS:
+        items = rows
+    else:
+        items = [make_lost(r[1:9]) if r[0] == 'lost' else make_found((r[1], r[9]) + r[4:9]) for r in rows]
+    last = rows[-1] if rows else None
+    return items, (f"{last[0]}:{last[1]}:{last[7]}" if has_more else None)
+
+
+def items_by_id(conn: sqlite3.Connection, kind: str, ids: Iterable[int], as_json: bool = False) -> dict:
+    """Current rows for the given ids, keyed by id; deleted ids are absent."""
+    ids = list(ids)
+    cls = KINDS[kind]
+    marks = ','.join('?' * len(ids))
+    make = SHAPES[kind][as_json]
+    rows = conn.execute(f"SELECT {cls.COLUMNS} FROM {cls.TABLE} WHERE id IN ({marks})", ids).fetchall()
+    return {r[0]: make(r) for r in rows}
+
+
+# ==========================================
+# ✏️ WRITES
+# ==========================================
+# created_at / resolved_at (added by migration 1) are stamped here, in the
+# statement itself, so every writer records them the same way.
+NOW_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+INSERT_SQL = {
+    'lost': f"""
+        INSERT INTO lost_items (student_name, roll_no, item_name, room_no, category, date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, {NOW_SQL})
+    """,
+    'found': f"""
+        INSERT INTO found_items (finder_name, item_name, room_no, category, date, created_at)
+        VALUES (?, ?, ?, ?, ?, {NOW_SQL})
+    """,
+}
+CLOSED_STATUS = {'lost': 'Resolved', 'found': 'Claimed'}
+CLOSE_SET = f"status = ?, resolved_at = {NOW_SQL}"  # SET clause closing an item
+
+
+def insert_lost(conn: sqlite3.Connection, name: str, roll: str, item: str, room: str,
+                category: str, date: str) -> int:
+    """Add a lost report; returns its id."""
+    return conn.execute(INSERT_SQL['lost'], (name, roll, item, room, category, date)).lastrowid
+
+
+def insert_found(conn: sqlite3.Connection, finder: str, item: str, room: str,
+                 category: str, date: str) -> int:
+    """Log a found item; returns its id."""
+    return conn.execute(INSERT_SQL['found'], (finder, item, room, category, date)).lastrowid
+
+
+def close_item(conn: sqlite3.Connection, kind: str, item_id: int) -> int:
+    """Mark an item Resolved/Claimed; returns rows changed."""
+    return conn.execute(f"UPDATE {KINDS[kind].TABLE} SET {CLOSE_SET} WHERE id=?",
+                        (CLOSED_STATUS[kind], item_id)).rowcount
+
+
+def delete_item(conn: sqlite3.Connection, kind: str, item_id: int) -> int:
+    """Delete an item; returns rows removed."""
+    return conn.execute(f"DELETE FROM {KINDS[kind].TABLE} WHERE id=?", (item_id,)).rowcount
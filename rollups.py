@@ -0,0 +1,244 @@
+# rollups.py
+# SBMP College Lost and Found System
+# Trigger-maintained analytics rollups and the queries behind /api/analytics
+
+import sqlite3
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from repository import ARCHIVED, CLOSED_STATUS, KINDS, tables
+
+# ==========================================
+# 📈 ROLLUP TABLES
+# ==========================================
+# item_rollup holds one row per (type, day, category, room, status) with
+# the number of items in it; resolve_rollup is a histogram of whole days
+# from report to resolve/claim per (type, day, category, room). Triggers
+# keep both current on every insert, edit and delete from either client,
+# so analytics read rows per day in the range instead of every item.
+# Archived items stay counted: moving them out of the hot table is not
+# a delete as far as the rollups are concerned.
+# NULL dimensions are stored as '' (room, status) or 'Other' (category).
+ROLLUP_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS item_rollup (
+        kind TEXT NOT NULL,
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        room TEXT NOT NULL,
+        status TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (kind, day, category, room, status)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resolve_rollup (
+        kind TEXT NOT NULL,
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        room TEXT NOT NULL,
+        days INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (kind, day, category, room, days)
+    ) WITHOUT ROWID
+    """,
+)
+
+KEY = "kind, day, category, room, status"
+
+
+def _key(kind: str, row: str) -> str:
+    """SQL values of the rollup key for the trigger row alias ``row``."""
+    return (f"'{kind}', coalesce({row}.date, ''), coalesce({row}.category, 'Other'), "
+            f"coalesce({row}.room_no, ''), coalesce({row}.status, '')")
+
+
+def _add(kind: str, row: str) -> str:
+    return (f"INSERT INTO item_rollup ({KEY}, n) VALUES ({_key(kind, row)}, 1) "
+            f"ON CONFLICT ({KEY}) DO UPDATE SET n = n + 1;")
+
+
+def _remove(kind: str, row: str) -> str:
+    match = f"({KEY}) = ({_key(kind, row)})"
+    return (f"UPDATE item_rollup SET n = n - 1 WHERE {match}; "
+            f"DELETE FROM item_rollup WHERE {match} AND n <= 0;")
+
+
+def _triggers() -> Dict[str, str]:
+    triggers = {}
+    for kind, cls in KINDS.items():
+        table, closed = cls.TABLE, CLOSED_STATUS[kind]
+        triggers[f'rollup_{kind}_ai'] = f"""
+            CREATE TRIGGER rollup_{kind}_ai AFTER INSERT ON {table} BEGIN
+                {_add(kind, 'new')}
+            END
+        """
+        triggers[f'rollup_{kind}_au'] = f"""
+            CREATE TRIGGER rollup_{kind}_au AFTER UPDATE OF date, category, room_no, status ON {table}
+            WHEN old.date IS NOT new.date OR old.category IS NOT new.category
+              OR old.room_no IS NOT new.room_no OR old.status IS NOT new.status BEGIN
+                {_remove(kind, 'old')}
+                {_add(kind, 'new')}
+            END
+        """
+        triggers[f'rollup_{kind}_ad'] = f"""
+            CREATE TRIGGER rollup_{kind}_ad AFTER DELETE ON {table} WHEN NOT {ARCHIVED[kind]} BEGIN
+                {_remove(kind, 'old')}
+            END
+        """
+        # Time to resolve is counted the moment the status flips; reports
+        # with an unparseable date have no age and are left out
+        triggers[f'rollup_{kind}_resolve'] = f"""
+            CREATE TRIGGER rollup_{kind}_resolve AFTER UPDATE OF status ON {table}
+            WHEN new.status = '{closed}' AND old.status IS NOT '{closed}'
+              AND julianday(new.date) IS NOT NULL BEGIN
+                INSERT INTO resolve_rollup (kind, day, category, room, days, n)
+                VALUES ('{kind}', new.date, coalesce(new.category, 'Other'), coalesce(new.room_no, ''),
+                        max(0, CAST(julianday('now', 'localtime') - julianday(new.date) AS INTEGER)), 1)
+                ON CONFLICT (kind, day, category, room, days) DO UPDATE SET n = n + 1;
+            END
+        """
+    return triggers
+
+
+ROLLUP_TRIGGERS = _triggers()
+
+
+def ensure_rollups(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables and triggers, counting existing rows once."""
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='item_rollup'").fetchone() is None
+    for sql in ROLLUP_SCHEMA:
+        conn.execute(sql)
+    for name, sql in ROLLUP_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    if created:
+        rebuild_rollups(conn)
+    conn.commit()
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """Recount item_rollup from the item and archive tables; returns its row count.
+
+    resolve_rollup cannot be rebuilt: nothing records when an item that
+    is already closed was closed, so its history starts with the triggers.
+    """
+    conn.execute("DELETE FROM item_rollup")
+    rows = 0
+    for kind in KINDS:
+        source = " UNION ALL ".join(f"SELECT date, category, room_no, status FROM {t}"
+                                    for t in tables(kind, archive=True))
+        rows += conn.execute(f"""
+            INSERT INTO item_rollup ({KEY}, n)
+            SELECT '{kind}', coalesce(date, ''), coalesce(category, 'Other'),
+                   coalesce(room_no, ''), coalesce(status, ''), COUNT(*)
+            FROM ({source}) GROUP BY 2, 3, 4, 5
+        """).rowcount
+    return rows
+
+
+# ==========================================
+# 🔎 ANALYTICS QUERIES
+# ==========================================
+# Every query is a primary-key range scan on (kind, day); category and
+# room narrow it further. Weeks start on Monday and are bucketed here
+# rather than in SQL so no date function runs per rollup row.
+CLOSED_SQL = ', '.join(f"'{s}'" for s in CLOSED_STATUS.values())
+ANALYTICS_WEEKS = 12   # default range of /api/analytics
+MAX_ANALYTICS_WEEKS = 520   # longest range one request may ask for (10 years)
+HOTSPOT_LIMIT = 10
+MAX_HOTSPOT_LIMIT = 50
+
+
+def _range(kinds: Sequence[str], category: str, room: str) -> str:
+    """WHERE clause of a day-range rollup read; _params() fills it."""
+    where = f"kind IN ({','.join('?' * len(kinds))}) AND day BETWEEN ? AND ?"
+    if category:
+        where += " AND category = ?"
+    if room:
+        where += " AND room = ?"
+    return where
+
+
+def _params(kinds: Sequence[str], day_from: str, day_to: str, category: str, room: str) -> list:
+    return list(kinds) + [day_from, day_to] + [v for v in (category, room) if v]
+
+
+@lru_cache(maxsize=4096)
+def week_of(day: str) -> Optional[str]:
+    """Monday of the week ``day`` falls in; None when day is not a date."""
+    try:
+        d = date.fromisoformat(day)
+    except ValueError:
+        return None
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+def weekly_recovery(conn: sqlite3.Connection, kinds: Sequence[str], day_from: str, day_to: str,
+                    category: str = '', room: str = '') -> List[dict]:
+    """Items reported per week and how many of them are closed by now.
+
+    day_from and day_to must be ISO dates; the first and last weeks only
+    count the days inside the range.
+    """
+    where = _range(kinds, category, room)
+    rows = conn.execute(f"""
+        SELECT day, SUM(n), SUM(CASE WHEN status IN ({CLOSED_SQL}) THEN n ELSE 0 END)
+        FROM item_rollup WHERE {where} GROUP BY day ORDER BY day
+    """, _params(kinds, day_from, day_to, category, room)).fetchall()
+    # Every week of the range is listed, quiet ones with zero reports
+    weeks: Dict[str, List[int]] = {}
+    week, last = date.fromisoformat(week_of(day_from)), week_of(day_to)
+    while week.isoformat() <= last:
+        weeks[week.isoformat()] = [0, 0]
+        week += timedelta(weeks=1)
+    for day, reported, recovered in rows:
+        week = week_of(day)
+        if week is None:
+            continue
+        totals = weeks.setdefault(week, [0, 0])
+        totals[0] += reported
+        totals[1] += recovered
+    return [{'week': week, 'reported': reported, 'recovered': recovered,
+             'rate': round(recovered / reported, 4) if reported else None}
+            for week, (reported, recovered) in weeks.items()]
+
+
+def _percentile(histogram: List[Tuple[int, int]], total: int, fraction: float) -> Optional[int]:
+    """Value at ``fraction`` of a sorted (value, count) histogram."""
+    if not total:
+        return None
+    rank = fraction * (total - 1)
+    seen = 0
+    for value, count in histogram:
+        seen += count
+        if seen > rank:
+            return value
+    return histogram[-1][0]
+
+
+def resolve_times(conn: sqlite3.Connection, kinds: Sequence[str], day_from: str, day_to: str,
+                  category: str = '', room: str = '') -> dict:
+    """Days from report to resolve/claim for items reported in the range."""
+    where = _range(kinds, category, room)
+    histogram = conn.execute(f"""
+        SELECT days, SUM(n) FROM resolve_rollup WHERE {where} GROUP BY days ORDER BY days
+    """, _params(kinds, day_from, day_to, category, room)).fetchall()
+    total = sum(count for _, count in histogram)
+    return {'resolved': total,
+            'median_days': _percentile(histogram, total, 0.5),
+            'p90_days': _percentile(histogram, total, 0.9)}
+
+
+def hotspots(conn: sqlite3.Connection, kinds: Sequence[str], day_from: str, day_to: str,
+             category: str = '', limit: int = HOTSPOT_LIMIT) -> List[dict]:
+    """Rooms with the most reports in the range, busiest first."""
+    where = _range(kinds, category, '')
+    rows = conn.execute(f"""
+        SELECT room, SUM(n) AS reported, SUM(CASE WHEN status IN ({CLOSED_SQL}) THEN n ELSE 0 END)
+        FROM item_rollup WHERE {where} AND room != ''
+        GROUP BY room ORDER BY reported DESC, room LIMIT ?
+    """, _params(kinds, day_from, day_to, category, '') + [limit]).fetchall()
+    return [{'room': room, 'reported': reported, 'recovered': recovered, 'open': reported - recovered}
+            for room, reported, recovered in rows]
@@ -0,0 +1,156 @@
+# search.py
+# SBMP College Lost and Found System
+# Full-text search over lost/found items (SQLite FTS5)
+
+import re
+import sqlite3
+from repository import SHAPES
+
+# ==========================================
+# 🔎 FTS5 SHADOW TABLES
+# ==========================================
+# External-content tables: the text lives in lost_items/found_items and
+# the FTS index is kept in sync by triggers, so no write path changes.
+SEARCH_SCHEMA = {
+    'lost_fts': """
+        CREATE VIRTUAL TABLE IF NOT EXISTS lost_fts USING fts5(
+            item_name, student_name, roll_no, room_no,
+            content='lost_items', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """,
+    'found_fts': """
+        CREATE VIRTUAL TABLE IF NOT EXISTS found_fts USING fts5(
+            item_name, finder_name, room_no,
+            content='found_items', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """,
+}
+
+SEARCH_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS lost_fts_ai AFTER INSERT ON lost_items BEGIN
+        INSERT INTO lost_fts(rowid, item_name, student_name, roll_no, room_no)
+        VALUES (new.id, new.item_name, new.student_name, new.roll_no, new.room_no);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lost_fts_ad AFTER DELETE ON lost_items BEGIN
+        INSERT INTO lost_fts(lost_fts, rowid, item_name, student_name, roll_no, room_no)
+        VALUES ('delete', old.id, old.item_name, old.student_name, old.roll_no, old.room_no);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lost_fts_au
+    AFTER UPDATE OF item_name, student_name, roll_no, room_no ON lost_items BEGIN
+        INSERT INTO lost_fts(lost_fts, rowid, item_name, student_name, roll_no, room_no)
+        VALUES ('delete', old.id, old.item_name, old.student_name, old.roll_no, old.room_no);
+        INSERT INTO lost_fts(rowid, item_name, student_name, roll_no, room_no)
+        VALUES (new.id, new.item_name, new.student_name, new.roll_no, new.room_no);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS found_fts_ai AFTER INSERT ON found_items BEGIN
+        INSERT INTO found_fts(rowid, item_name, finder_name, room_no)
+        VALUES (new.id, new.item_name, new.finder_name, new.room_no);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS found_fts_ad AFTER DELETE ON found_items BEGIN
+        INSERT INTO found_fts(found_fts, rowid, item_name, finder_name, room_no)
+        VALUES ('delete', old.id, old.item_name, old.finder_name, old.room_no);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS found_fts_au
+    AFTER UPDATE OF item_name, finder_name, room_no ON found_items BEGIN
+        INSERT INTO found_fts(found_fts, rowid, item_name, finder_name, room_no)
+        VALUES ('delete', old.id, old.item_name, old.finder_name, old.room_no);
+        INSERT INTO found_fts(rowid, item_name, finder_name, room_no)
+        VALUES (new.id, new.item_name, new.finder_name, new.room_no);
+    END
+    """,
+)
+
+
+def ensure_search(conn: sqlite3.Connection) -> None:
+    """Create the FTS tables and triggers, indexing existing rows once."""
+    existing = {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('lost_fts', 'found_fts')")}
+    for name, sql in SEARCH_SCHEMA.items():
+        conn.execute(sql)
+        if name not in existing:
+            # Databases created before search existed: backfill from content table
+            conn.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+    for sql in SEARCH_TRIGGERS:
+        conn.execute(sql)
+    conn.commit()
+
+
+# ==========================================
+# 🏆 RANKED SEARCH
+# ==========================================
+SEARCH_PAGE_SIZE = 25
+MAX_SEARCH_PAGE_SIZE = 200
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# bm25 column weights: the item name matters most, then who, then where
+LOST_SEARCH = """
+    SELECT 'lost', l.id, l.student_name, l.roll_no, l.item_name, l.room_no,
+           l.category, l.date, l.status, bm25(lost_fts, 10.0, 4.0, 4.0, 2.0) AS rank
+    FROM lost_fts JOIN lost_items l ON l.id = lost_fts.rowid
+    WHERE lost_fts MATCH :q {status}
+"""
+FOUND_SEARCH = """
+    SELECT 'found', f.id, f.finder_name, NULL, f.item_name, f.room_no,
+           f.category, f.date, f.status, bm25(found_fts, 10.0, 4.0, 2.0) AS rank
+    FROM found_fts JOIN found_items f ON f.id = found_fts.rowid
+    WHERE found_fts MATCH :q {status}
+"""
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every word, prefix-matched."""
+    return ' '.join(f'"{t}"*' for t in TOKEN.findall(text))
+
+
+def search_items(conn: sqlite3.Connection, text: str, kind: str = 'all',
+                 status: str = '', limit: int = SEARCH_PAGE_SIZE, offset: int = 0,
+                 as_json: bool = False) -> list:
+    """Best-ranked lost/found items matching ``text``.
+
+    kind is 'all', 'lost' or 'found'; status optionally narrows results.
+    Hits are LostItem/FoundItem records carrying their score, or API
+    dicts with a 'score' key when as_json is set.
+    """
+    q = fts_query(text)
+    if not q:
+        return []
+
+    parts = []
+    if kind in ('all', 'lost'):
+        parts.append(LOST_SEARCH.format(status="AND l.status = :status" if status else ""))
+    if kind in ('all', 'found'):
+        parts.append(FOUND_SEARCH.format(status="AND f.status = :status" if status else ""))
+    if not parts:
+        raise ValueError(f"Unknown item type: {kind}")
+
+    sql = " UNION ALL ".join(parts) + " ORDER BY rank LIMIT :limit OFFSET :offset"
+    rows = conn.execute(sql, {'q': q, 'status': status, 'limit': limit, 'offset': offset}).fetchall()
+    make_lost, make_found = SHAPES['lost'][as_json], SHAPES['found'][as_json]
+    hits = []
+    for r in rows:
+        # (type, id, name or finder, roll, item, room, category, date, status, rank)
+        score = round(-r[9], 4)
+        if r[0] == 'lost':
+            hit = make_lost(r[1:9])
+        else:
+            hit = make_found(r[1:3] + r[4:9])
+        if as_json:
+            hit['score'] = score
+        else:
+            hit.score = score
+        hits.append(hit)
+    return hits
+
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# seed_data.py
+# SBMP College Lost and Found System
+# Reproducible synthetic dataset for benchmarks and plan checks
+
+"""
+Usage: python3 seed_data.py [database] --size 100k [--seed 42] [--end 2025-06-30] [--reset]
+
+Same seed, size, end date and years always produce the same rows; the
+end date defaults to a fixed day, not today.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+SEED_BATCH = 50000  # rows per transaction
+LOST_SHARE = 0.55   # lost reports outnumber found ones
+DEFAULT_END = date(2025, 6, 30)  # newest report date unless --end says otherwise
+
+FIRST_NAMES = ["Aarav", "Aditi", "Aryan", "Diya", "Harsh", "Isha", "Karan", "Kavya", "Manav", "Meera",
+               "Neha", "Om", "Pooja", "Pranav", "Riya", "Rohan", "Sakshi", "Sanket", "Shreya", "Siddhi",
+               "Tanvi", "Tejas", "Vaishnavi", "Varun", "Yash"]
+LAST_NAMES = ["Yadav", "Patil", "Shinde", "Jadhav", "Pawar", "Kulkarni", "Deshmukh", "Joshi", "More",
+              "Gaikwad", "Chavan", "Sawant", "Kadam", "Bhosale", "Shaikh", "Mehta"]
+DEPARTMENTS = ["CO", "IT", "ME", "EE", "CE", "EJ"]
+FINDER_DESKS = ["Security Desk", "Porter", "Library Counter", "Canteen Staff", "Lab Assistant"]
+
+# category -> (weight, base item names)
+CATEGORIES = {
+    'Electronics': (24, ["Phone", "Charger", "Earphones", "Calculator", "USB Drive", "Power Bank",
+                         "Smart Watch", "Mouse", "Headphones"]),
+    'Bottle': (18, ["Water Bottle", "Steel Bottle", "Sipper", "Flask", "Tiffin Box"]),
+    'Documents': (16, ["ID Card", "Hall Ticket", "Notebook", "Journal", "Lab Manual", "Library Card",
+                       "Marksheet Copy"]),
+    'Keys': (12, ["Bike Key", "Locker Key", "Room Key", "Key Chain"]),
+    'Wallet': (10, ["Wallet", "Purse", "Card Holder"]),
+    'Other': (20, ["Umbrella", "Jacket", "Spectacles", "Bag", "Pencil Box", "Drawing Kit", "Cap",
+                   "Lab Coat", "Apron"]),
+}
+COLOURS = ["Black", "Blue", "Red", "Grey", "White", "Green", "Pink", "Brown", "Silver"]
+BRANDS = ["Milton", "Casio", "boAt", "Samsung", "Redmi", "Cello", "Sandisk", "Titan", "Wildcraft"]
+
+# Hot spots first: they get the head of the Zipf curve
+PLACES = ["Canteen", "Library", "Lab 1", "Lab 2", "Auditorium", "Gym", "Parking", "Workshop"]
+CLASSROOMS = [f"{floor}{room:02d}" for floor in range(1, 5) for room in range(1, 21)]
+ROOM_SKEW = 0.9          # Zipf exponent over rooms
+NO_ROOM_SHARE = 0.03     # reports that leave the room blank
+
+# (max age in days, open probability for lost, for found); found items
+# linger unclaimed far more often than lost ones stay pending
+OPEN_BY_AGE = [(14, 0.50, 0.60), (60, 0.15, 0.30), (None, 0.002, 0.01)]
+
+
+def parse_size(text: str) -> int:
+    """'10k' / '100k' / '1M' / plain integers."""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+# ==========================================
+# 🎲 GENERATION
+# ==========================================
+class Generator:
+    """Seeded row source; every choice goes through one Random instance."""
+
+    def __init__(self, seed: int, end: date, years: int):
+        self.rng = random.Random(seed)
+        self.end = end
+
+        rooms = PLACES + self.rng.sample(CLASSROOMS, len(CLASSROOMS))
+        self.rooms = rooms
+        self.room_weights = [1 / (rank + 1) ** ROOM_SKEW for rank in range(len(rooms))]
+        self.categories = list(CATEGORIES)
+        self.category_weights = [CATEGORIES[c][0] for c in self.categories]
+
+        # Weekdays carry the traffic; vacations (May, June, December) are quiet
+        start = end - timedelta(days=365 * years)
+        self.days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+        self.day_weights = []
+        for d in self.days:
+            weight = [1.0, 1.0, 1.0, 1.0, 0.9, 0.4, 0.15][d.weekday()]
+            if d.month in (5, 6, 12):
+                weight *= 0.35
+            self.day_weights.append(weight)
+
+    def dates(self, n: int) -> List[date]:
+        """n report dates, oldest first so ids grow with time as in real use."""
+        return sorted(self.rng.choices(self.days, self.day_weights, k=n))
+
+    def room(self) -> str:
+        if self.rng.random() < NO_ROOM_SHARE:
+            return ''
+        return self.rng.choices(self.rooms, self.room_weights)[0]
+
+    def item(self) -> Tuple[str, str]:
+        """(item name, category) with the near-duplicates real reports have."""
+        rng = self.rng
+        category = rng.choices(self.categories, self.category_weights)[0]
+        name = rng.choice(CATEGORIES[category][1])
+        roll = rng.random()
+        if roll < 0.45:
+            name = f"{rng.choice(COLOURS)} {name}"
+        elif roll < 0.60:
+            name = f"{rng.choice(BRANDS)} {name}"
+        if rng.random() < 0.15:
+            name = name.lower()
+        if rng.random() < 0.04 and len(name) > 4:
+            i = rng.randrange(1, len(name) - 2)  # swapped letters, the classic typo
+            name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+        return name, category
+
+    def person(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def roll_no(self, day: date) -> str:
+        year = day.year - self.rng.randint(0, 2)
+        return f"{self.rng.choice(DEPARTMENTS)}{year % 100:02d}{self.rng.randint(1, 120):03d}"
+
+    def is_open(self, day: date, kind: str) -> bool:
+        age = (self.end - day).days
+        for max_age, lost_p, found_p in OPEN_BY_AGE:
+            if max_age is None or age <= max_age:
+                return self.rng.random() < (lost_p if kind == 'lost' else found_p)
+        return False
+
+    def lost_rows(self, n: int) -> Iterator[tuple]:
+        for day in self.dates(n):
+            item, category = self.item()
+            status = 'Pending' if self.is_open(day, 'lost') else 'Resolved'
+            yield (self.person(), self.roll_no(day), item, self.room(), category, day.isoformat(), status)
+
+    def found_rows(self, n: int) -> Iterator[tuple]:
+        for day in self.dates(n):
+            item, category = self.item()
+            finder = self.rng.choice(FINDER_DESKS) if self.rng.random() < 0.3 else self.person()
+            status = 'Available' if self.is_open(day, 'found') else 'Claimed'
+            yield (finder, item, self.room(), category, day.isoformat(), status)
+
+
+# ==========================================
+# 💾 LOADING
+# ==========================================
+# created_at is local midnight of the report date, as migration 1 backfills
+LOST_INSERT = """
+    INSERT INTO lost_items (student_name, roll_no, item_name, room_no, category, date, status, created_at)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, CAST(strftime('%s', ?6, 'utc') AS INTEGER))
+"""
+FOUND_INSERT = """
+    INSERT INTO found_items (finder_name, item_name, room_no, category, date, status, created_at)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, CAST(strftime('%s', ?5, 'utc') AS INTEGER))
+"""
+
+
+# Emptied by --reset; search, matches, counters and item_rollup are
+# rebuilt after every load anyway
+RESET_TABLES = ('lost_items', 'found_items', 'lost_archive', 'found_archive', 'changes', 'resolve_rollup')
+
+
+def bulk_load(conn, sql: str, rows: Iterator[tuple], batch_size: int = SEED_BATCH) -> int:
+    """executemany in fixed-size transactions; returns rows written."""
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        conn.execute("BEGIN")
+        conn.executemany(sql, batch)
+        conn.commit()
+        total += len(batch)
+
+
+def seed(db_path: str, size: int, seed_value: int = 42, end: date = DEFAULT_END,
+         years: int = 3, reset: bool = False) -> dict:
+    """Generate ``size`` reports into ``db_path``; returns load statistics.
+
+    Per-row triggers and secondary indexes are dropped for the load and
+    restored afterwards, with search, matches, counters and analytics
+    rollups rebuilt in one pass each.
+    """
+    os.environ['SBMP_DB'] = db_path
+    import app as webapp
+    from counters import bump_version
+    from db import INDEXES, connect, ensure_indexes
+    from matching import rebuild_matches
+    from rollups import rebuild_rollups
+
+    webapp.init_db()
+    conn = connect(db_path)
+    start = time.perf_counter()
+    gen = Generator(seed_value, end, years)
+    n_lost = int(size * LOST_SHARE)
+
+    triggers = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'trigger' AND tbl_name IN ('lost_items', 'found_items')
+    """).fetchall()
+    for name, _ in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    for name in INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    try:
+        if reset:
+            # Ids restart at 1, so everything that remembers old ids goes
+            # too: archived rows would collide with new ones, and the change
+            # log and resolve history would describe items that are gone
+            for table in RESET_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('lost_items', 'found_items')")
+            conn.commit()
+        lost = bulk_load(conn, LOST_INSERT, gen.lost_rows(n_lost))
+        found = bulk_load(conn, FOUND_INSERT, gen.found_rows(size - n_lost))
+        loaded = time.perf_counter()
+    finally:
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for _, sql in triggers:
+            conn.execute(sql)
+        conn.commit()
+
+    ensure_indexes(conn)
+    for table in ('lost_fts', 'found_fts'):
+        conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    rooms = rebuild_matches(conn)
+    rebuild_rollups(conn)
+    conn.execute("""
+        UPDATE counters SET value = CASE name
+            WHEN 'lost_open' THEN (SELECT COUNT(*) FROM lost_items WHERE status = 'Pending')
+            ELSE (SELECT COUNT(*) FROM found_items WHERE status = 'Available') END
+        WHERE name IN ('lost_open', 'found_open')
+    """)
+    bump_version(conn)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    return {
+        'lost_rows': lost,
+        'found_rows': found,
+        'match_rooms': rooms,
+        'insert_seconds': round(loaded - start, 2),
+        'total_seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic lost & found dataset")
+    parser.add_argument('database', nargs='?', default='college_data.db')
+    parser.add_argument('--size', default='10k', help="total reports: 10k, 100k, 1M, ... (default %(default)s)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end', type=date.fromisoformat, default=DEFAULT_END,
+                        help="newest report date, YYYY-MM-DD (default %(default)s)")
+    parser.add_argument('--years', type=int, default=3, help="span of report dates (default %(default)s)")
+    parser.add_argument('--reset', action='store_true', help="delete existing reports first")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    print("=" * 70)
+    print(f"🌱 SEEDING {size:,} reports into {args.database} "
+          f"(seed {args.seed}, end {args.end}, {args.years} years)")
+    print("=" * 70)
+    try:
+        result = seed(args.database, size, args.seed, args.end, args.years, args.reset)
+    except Exception as e:
+        print(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+    for key, value in result.items():
+        print(f"   {key}: {value:,}" if isinstance(value, int) else f"   {key}: {value}")
+    print("💡 Fuzzy suggestions are not part of the load; run `python3 matching.py "
+          f"{args.database}` to add them.")
+
+
+if __name__ == "__main__":
+    main()
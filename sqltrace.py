@@ -0,0 +1,147 @@
+# sqltrace.py
+# SBMP College Lost and Found System
+# Per-statement SQL statistics and slow-query log
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+# ==========================================
+# ⚙️ SETTINGS
+# ==========================================
+# A statement's time runs from execute() until its last row is fetched.
+# Slower ones are written to the log with their EXPLAIN QUERY PLAN; set
+# the threshold to 0 to turn the log off.
+SLOW_QUERY_MS = float(os.environ.get("SBMP_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.environ.get("SBMP_SLOW_QUERY_LOG", "slow_queries.log")
+MAX_STATEMENTS = 2000    # distinct statement texts tracked
+PARAMS_SHOWN = 200       # characters of bound parameters written to the log
+
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+log = logging.getLogger("sbmp.sql")
+
+
+class StatementStats:
+    """Running totals for one SQL text."""
+
+    __slots__ = ('count', 'seconds', 'max_seconds', 'rows', 'slow')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.slow = 0
+
+
+_lock = threading.Lock()
+_stats: Dict[str, StatementStats] = {}
+_keys: Dict[str, str] = {}        # raw SQL -> whitespace-normalized key
+_plans: Dict[str, List[str]] = {}  # explained once per statement text
+_log_ready = False
+
+
+def configure(threshold_ms: Optional[float] = None, log_path: Optional[str] = None) -> None:
+    """Change the slow-query threshold or log file at runtime."""
+    global SLOW_QUERY_MS, SLOW_QUERY_LOG, _log_ready
+    if threshold_ms is not None:
+        SLOW_QUERY_MS = threshold_ms
+    if log_path is not None and log_path != SLOW_QUERY_LOG:
+        SLOW_QUERY_LOG = log_path
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            handler.close()
+        _log_ready = False
+
+
+def normalize(sql: str) -> str:
+    key = _keys.get(sql)
+    if key is None:
+        key = ' '.join(sql.split())
+        if len(_keys) < MAX_STATEMENTS:
+            _keys[sql] = key
+    return key
+
+
+def record(conn: sqlite3.Connection, sql: str, params, seconds: float, rows: int) -> None:
+    """Fold one finished statement into the stats; log it if slow."""
+    key = normalize(sql)
+    slow = SLOW_QUERY_MS > 0 and seconds * 1000 >= SLOW_QUERY_MS
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            if len(_stats) >= MAX_STATEMENTS:
+                return
+            stats = _stats[key] = StatementStats()
+        stats.count += 1
+        stats.seconds += seconds
+        stats.rows += rows
+        if seconds > stats.max_seconds:
+            stats.max_seconds = seconds
+        if slow:
+            stats.slow += 1
+    if slow:
+        log_slow(conn, key, sql, params, seconds, rows)
+
+
+def explain(conn: sqlite3.Connection, sql: str, params) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines, or [] when the statement cannot be explained."""
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    if not isinstance(params, (tuple, list)):
+        params = [None] * sql.count('?')  # executemany: plan does not depend on values
+    try:
+        # Base-class execute so the plan lookup is not itself traced
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except sqlite3.Error:
+        return []
+    return [row[3] for row in rows]
+
+
+def log_slow(conn: sqlite3.Connection, key: str, sql: str, params, seconds: float, rows: int) -> None:
+    global _log_ready
+    if not _log_ready:
+        with _lock:
+            if not _log_ready:
+                handler = logging.FileHandler(SLOW_QUERY_LOG, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                log.addHandler(handler)
+                log.setLevel(logging.INFO)
+                log.propagate = False
+                _log_ready = True
+
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = explain(conn, sql, params)
+    shown = repr(params) if isinstance(params, (tuple, list)) else "(executemany)"
+    if len(shown) > PARAMS_SHOWN:
+        shown = shown[:PARAMS_SHOWN] + "..."
+    lines = [f"slow query {seconds * 1000:.1f} ms, {rows} rows", f"  sql: {key}", f"  params: {shown}"]
+    lines += [f"  plan: {line}" for line in plan] or ["  plan: (not available)"]
+    log.info("\n".join(lines))
+
+
+def statement_stats(order: str = 'seconds', limit: int = 20) -> List[dict]:
+    """Tracked statements, heaviest first by total time, max time or count."""
+    sort_key = {'seconds': lambda s: s[1].seconds, 'max': lambda s: s[1].max_seconds,
+                'count': lambda s: s[1].count}[order]
+    with _lock:
+        top = sorted(_stats.items(), key=sort_key, reverse=True)[:limit]
+        return [{
+            'sql': sql,
+            'count': s.count,
+            'total_ms': round(s.seconds * 1000, 3),
+            'avg_ms': round(s.seconds * 1000 / s.count, 3),
+            'max_ms': round(s.max_seconds * 1000, 3),
+            'rows': s.rows,
+            'slow': s.slow,
+        } for sql, s in top]
+
+
+def reset() -> None:
+    """Forget all collected statistics."""
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,211 @@
+# writer.py
+# SBMP College Lost and Found System
+# Group-commit write queue
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+from db import add_db_time, db_time
+from metrics import Histogram
+
+# ==========================================
+# ⚙️ WRITER SETTINGS
+# ==========================================
+# Every single-row write from the web app runs on one writer thread.
+# Whatever is queued when the writer wakes goes into one transaction,
+# one commit; when a burst is under way the writer lingers a couple of
+# milliseconds to let stragglers join the batch. A lone write is
+# committed straight away.
+WRITE_QUEUE_SIZE = 1000     # waiting writes before callers are turned away
+WRITE_MAX_BATCH = 200       # writes per transaction
+WRITE_LINGER = 0.002        # seconds to wait for more writes during a burst
+WRITE_TIMEOUT = 10.0        # seconds a caller waits for its write to start
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class WriterBusy(Exception):
+    """Raised when the write queue is full or a write did not start in time.
+
+    Either way the write was not applied, so the caller may retry it.
+    """
+
+
+QUEUED, RUNNING, CANCELLED = range(3)
+
+
+class _Job:
+    __slots__ = ('fn', 'done', 'result', 'error', 'state', 'db_seconds')
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.state = QUEUED
+        self.db_seconds = 0.0   # SQL time spent on the job's behalf, commit included
+
+
+class WriteQueue:
+    """Bounded queue drained by one writer thread in group commits.
+
+    ``submit(fn)`` runs ``fn(conn)`` inside the writer's transaction and
+    blocks until it has been committed, returning fn's result or raising
+    its exception. Each job runs under its own SAVEPOINT, so one failing
+    write does not take the rest of the batch down with it. A job still
+    queued after ``timeout`` is withdrawn and WriterBusy raised; one the
+    writer has already started is waited for, since it may yet commit and
+    a retry would apply it twice. The SQL time the writer spent on a job
+    is added to the caller's DB-time clock. The writer
+    borrows from ``pool`` per batch, so callers must not hold a pooled
+    connection of their own while they wait.
+    """
+
+    def __init__(self, pool, maxsize: int = WRITE_QUEUE_SIZE, max_batch: int = WRITE_MAX_BATCH,
+                 linger: float = WRITE_LINGER, timeout: float = WRITE_TIMEOUT):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.linger = linger
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = Histogram(BATCH_BUCKETS)
+        self._jobs = 0
+        self._failed = 0
+        self._rejected = 0
+        self._expired = 0
+        self._state_lock = threading.Lock()
+        self._commit_time = 0.0
+        self._max_depth = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="sbmp-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, fn: Callable[[sqlite3.Connection], object]):
+        """Run fn(conn) in the next group commit and wait for the outcome."""
+        self._ensure_started()
+        job = _Job(fn)
+        try:
+            self._queue.put(job, timeout=self.timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            raise WriterBusy("Too many pending writes, please retry")
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+        if not job.done.wait(self.timeout):
+            with self._state_lock:
+                expired = job.state == QUEUED
+                if expired:
+                    job.state = CANCELLED
+            if expired:
+                with self._stats_lock:
+                    self._expired += 1
+                raise WriterBusy("Write did not start in time, please retry")
+            job.done.wait()
+        add_db_time(job.db_seconds)
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stop = False
+            deadline = None
+            while len(batch) < self.max_batch:
+                try:
+                    if deadline is None:
+                        nxt = self._queue.get_nowait()
+                    else:
+                        nxt = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    # More than one write waiting means a burst: give it a moment
+                    if deadline is None and len(batch) > 1 and self.linger > 0:
+                        deadline = time.perf_counter() + self.linger
+                        continue
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: List[_Job]) -> None:
+        with self._state_lock:
+            # Callers that gave up waiting have withdrawn their jobs
+            batch = [job for job in batch if job.state == QUEUED]
+            for job in batch:
+                job.state = RUNNING
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for job in batch:
+                    before = db_time()
+                    conn.execute("SAVEPOINT write_job")
+                    try:
+                        job.result = job.fn(conn)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_job")
+                        job.error = e
+                    conn.execute("RELEASE write_job")
+                    job.db_seconds = db_time() - before
+                before = db_time()
+                conn.commit()
+                # Every caller in the batch waited for the one commit
+                for job in batch:
+                    job.db_seconds += db_time() - before
+        except Exception as e:
+            # Nothing in the batch was committed
+            for job in batch:
+                job.result = None
+                if job.error is None:
+                    job.error = e
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.batch_sizes.observe(len(batch))
+                self._jobs += len(batch)
+                self._failed += sum(1 for job in batch if job.error is not None)
+                self._commit_time += elapsed
+            for job in batch:
+                job.done.set()
+
+    def stats(self) -> dict:
+        """Queue depth and group-commit counters."""
+        with self._stats_lock:
+            batches = sum(self.batch_sizes.counts)
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_depth,
+                'batches': batches,
+                'writes': self._jobs,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'expired': self._expired,
+                'avg_batch': round(self._jobs / batches, 2) if batches else 0.0,
+                'commit_time_ms': round(self._commit_time * 1000, 3),
+            }
+
+    def close(self) -> None:
+        """Finish queued writes and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None